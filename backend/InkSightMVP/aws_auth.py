@@ -1,21 +1,115 @@
 import boto3
+import botocore.session
+from botocore.config import Config
+from botocore.credentials import RefreshableCredentials
 from warrant import Cognito
 import os
+import threading
+
+"""
+AWS Credentials
+Uploads use temporary credentials for the Cognito identity pool's unauthenticated role.
+1. The identity ID is looked up once per process (`get_id`).
+2. Credentials (`get_credentials_for_identity`) are cached and refreshed under a lock
+   shortly before they expire, by botocore's RefreshableCredentials.
+3. Every upload reuses one S3 client per process, with a connection pool sized by
+   AWS_S3_MAX_POOL_CONNECTIONS. boto3 clients are thread-safe.
+Set AWS_S3_ENDPOINT_URL to point the client at an S3-compatible stand-in (MinIO, localstack, moto server).
+"""
+
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("AWS_S3_MAX_POOL_CONNECTIONS", 20))
+S3_ENDPOINT_URL = os.getenv("AWS_S3_ENDPOINT_URL") or None
+
 
 def get_unauthenticated_credentials():
     COGNITO_IDENTITY_POOL_ID = os.getenv("AWS_COGNITO_IDENTITY_POOL_ARN")
     COGNITO_REGION = os.getenv("AWS_COGNITO_REGION")
 
     cognito_identity = boto3.client("cognito-identity", region_name=COGNITO_REGION)
-    
+
     # Get Identity ID for unauthenticated user
     identity_response = cognito_identity.get_id(
         IdentityPoolId=COGNITO_IDENTITY_POOL_ID
     )
     identity_id = identity_response["IdentityId"]
-    
+
     # Get temporary AWS credentials for the unauthenticated user
     credentials_response = cognito_identity.get_credentials_for_identity(
         IdentityId=identity_id
     )
     return credentials_response["Credentials"]
+
+
+class CognitoCredentialProvider:
+    """Caches the unauthenticated Cognito identity and refreshes its temporary credentials before they expire"""
+
+    def __init__(self, identity_pool_id=None, region=None):
+        self.identity_pool_id = identity_pool_id or os.getenv("AWS_COGNITO_IDENTITY_POOL_ARN")
+        self.region = region or os.getenv("AWS_COGNITO_REGION")
+        self._client = None
+        self._identity_id = None
+        self._credentials = None
+        self._lock = threading.Lock()
+
+    def _fetch_metadata(self):
+        """Fetch fresh temporary credentials in the format RefreshableCredentials expects."""
+        if self._client is None:
+            self._client = boto3.client("cognito-identity", region_name=self.region)
+        if self._identity_id is None:
+            self._identity_id = self._client.get_id(IdentityPoolId=self.identity_pool_id)["IdentityId"]
+
+        credentials = self._client.get_credentials_for_identity(IdentityId=self._identity_id)["Credentials"]
+        return {
+            "access_key": credentials["AccessKeyId"],
+            "secret_key": credentials["SecretKey"],
+            "token": credentials["SessionToken"],
+            "expiry_time": credentials["Expiration"].isoformat(),
+        }
+
+    def get_credentials(self):
+        """
+        Return the process-wide RefreshableCredentials, fetching them on first use.
+        botocore refreshes them (under its own lock) shortly before they expire.
+        """
+        with self._lock:
+            if self._credentials is None:
+                self._credentials = RefreshableCredentials.create_from_metadata(
+                    metadata=self._fetch_metadata(),
+                    refresh_using=self._fetch_metadata,
+                    method="cognito-identity",
+                )
+            return self._credentials
+
+
+credential_provider = CognitoCredentialProvider()
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+
+def get_s3_client():
+    """Return this process's S3 client, signed with the cached Cognito credentials."""
+    global _s3_client
+    with _s3_client_lock:
+        if _s3_client is None:
+            botocore_session = botocore.session.get_session()
+            botocore_session._credentials = credential_provider.get_credentials()
+            session = boto3.Session(botocore_session=botocore_session)
+            _s3_client = session.client("s3", endpoint_url=S3_ENDPOINT_URL,
+                                        config=Config(max_pool_connections=S3_MAX_POOL_CONNECTIONS))
+        return _s3_client
+
+
+def s3_object_url(bucket, key):
+    """Return the public URL of an object, on the configured endpoint if one is set."""
+    if S3_ENDPOINT_URL:
+        return f"{S3_ENDPOINT_URL.rstrip('/')}/{bucket}/{key}"
+    return f"https://{bucket}.s3.{os.getenv('AWS_COGNITO_REGION')}.amazonaws.com/{key}"
+
+
+def reset_aws_clients():
+    """Forget the cached credentials and S3 client (e.g. between tests)."""
+    global _s3_client, credential_provider
+    with _s3_client_lock:
+        _s3_client = None
+        credential_provider = CognitoCredentialProvider()
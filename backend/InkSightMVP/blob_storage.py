@@ -0,0 +1,384 @@
+import io
+import json
+import os
+import shutil
+import uuid
+from collections import namedtuple
+from pathlib import Path
+from urllib.parse import unquote
+
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+
+from .aws_auth import s3_object_url
+
+"""
+Blob Storage
+Media files (slides, recordings, and derived artifacts such as frames and transcripts) are stored
+through a BlobStorage backend instead of calling S3 directly:
+1. get_blob_storage(name) returns the backend for a logical store ("slides", "recordings", "artifacts").
+   settings.BLOB_STORAGE_BUCKETS maps each store to a bucket; settings.BLOB_STORAGE picks the backend:
+   - "s3": S3BlobStorage, using the process-wide S3 client;
+   - "local": LocalBlobStorage, one directory per bucket under settings.BLOB_STORAGE_ROOT
+     (for tests and offline benchmarks).
+2. Every backend supports streaming writes and reads, half-open [start, end) range reads, content types,
+   moves, batched deletes and multipart uploads. Presigned URLs are only available on S3.
+3. Backend errors are raised as BlobNotFound or BlobStorageError (with the operation and error code),
+   so views never see botocore exceptions.
+"""
+
+COPY_BUFFER_SIZE = 1024 * 1024
+S3_DELETE_BATCH_SIZE = 1000
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+
+BlobInfo = namedtuple("BlobInfo", ["key", "size", "content_type", "etag"])
+
+
+class BlobStorageError(Exception):
+    """Raised when a storage operation fails"""
+
+    def __init__(self, message, details=None):
+        super().__init__(message)
+        self.details = details or {}
+
+
+class BlobNotFound(BlobStorageError):
+    """The blob (or multipart upload) does not exist"""
+
+
+class UnsupportedOperation(BlobStorageError):
+    """The backend cannot perform this operation (e.g. presigned URLs on local storage)"""
+
+
+class BlobStorage:
+    """Interface shared by the storage backends"""
+
+    name = None
+
+    def write(self, key, data, content_type=DEFAULT_CONTENT_TYPE):
+        """Store `data` (bytes or a readable file object, streamed) under `key`, replacing any existing blob."""
+        raise NotImplementedError
+
+    def open(self, key, start=None, end=None, chunk_size=COPY_BUFFER_SIZE):
+        """Stream the blob, or its [start, end) byte range, as an iterator of byte strings."""
+        raise NotImplementedError
+
+    def read(self, key, start=None, end=None):
+        return b"".join(self.open(key, start, end))
+
+    def stat(self, key):
+        """Return the blob's BlobInfo, or raise BlobNotFound."""
+        raise NotImplementedError
+
+    def exists(self, key):
+        try:
+            self.stat(key)
+        except BlobNotFound:
+            return False
+        return True
+
+    def delete_many(self, keys):
+        """Delete blobs in as few requests as the backend allows; missing keys are ignored."""
+        raise NotImplementedError
+
+    def move(self, source_key, key):
+        """Move a blob to a new key (replacing any blob there), keeping its content type."""
+        raise NotImplementedError
+
+    def url(self, key):
+        """URL stored on rows that reference the blob (e.g. LectureSlides.file_slides)."""
+        raise NotImplementedError
+
+    def key_from_url(self, url):
+        """Return the key of a blob from its url(), or None if the URL belongs elsewhere."""
+        prefix = self.url("")
+        if not url or not url.startswith(prefix):
+            return None
+        return unquote(url[len(prefix):])
+
+    def create_multipart(self, key, content_type=DEFAULT_CONTENT_TYPE):
+        """Start a multipart upload and return its ID."""
+        raise NotImplementedError
+
+    def upload_part(self, key, upload_id, part_number, data):
+        """Store one part (1-based, replacing any earlier copy) and return its ETag."""
+        raise NotImplementedError
+
+    def list_parts(self, key, upload_id):
+        """Return the (part number, ETag) pairs received so far, in order."""
+        raise NotImplementedError
+
+    def complete_multipart(self, key, upload_id, parts):
+        """Join the given (part number, ETag) pairs, in order, into the blob."""
+        raise NotImplementedError
+
+    def abort_multipart(self, key, upload_id):
+        """Discard a multipart upload; aborting an unknown upload is not an error."""
+        raise NotImplementedError
+
+    def presign_put(self, key, content_type, expires):
+        raise UnsupportedOperation(f"{self.name} storage does not support presigned uploads.")
+
+    def presign_part(self, key, upload_id, part_number, expires):
+        raise UnsupportedOperation(f"{self.name} storage does not support presigned uploads.")
+
+
+class S3BlobStorage(BlobStorage):
+    """Blobs are objects in one S3 bucket"""
+
+    name = "s3"
+
+    def __init__(self, bucket):
+        self.bucket = bucket
+
+    def write(self, key, data, content_type=DEFAULT_CONTENT_TYPE):
+        fileobj = io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+        # upload_fileobj streams large files as a multipart upload
+        self._call("upload_fileobj", fileobj, self.bucket, key, ExtraArgs={"ContentType": content_type})
+
+    def open(self, key, start=None, end=None, chunk_size=COPY_BUFFER_SIZE):
+        arguments = {"Bucket": self.bucket, "Key": key}
+        if start is not None or end is not None:
+            # HTTP ranges are inclusive
+            arguments["Range"] = f"bytes={start or 0}-{'' if end is None else end - 1}"
+        # Fetched eagerly, so a missing blob raises BlobNotFound here rather than on the first read
+        body = self._call("get_object", **arguments)["Body"]
+        return self._iterate(body, chunk_size)
+
+    @staticmethod
+    def _iterate(body, chunk_size):
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+
+    def stat(self, key):
+        head = self._call("head_object", Bucket=self.bucket, Key=key)
+        return BlobInfo(key, head["ContentLength"], head.get("ContentType", DEFAULT_CONTENT_TYPE),
+                        head.get("ETag", "").strip('"'))
+
+    def delete_many(self, keys):
+        keys = list(keys)
+        for offset in range(0, len(keys), S3_DELETE_BATCH_SIZE):
+            batch = keys[offset:offset + S3_DELETE_BATCH_SIZE]
+            response = self._call("delete_objects", Bucket=self.bucket,
+                                  Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True})
+            if response.get("Errors"):
+                raise BlobStorageError("Some blobs could not be deleted.", {"errors": response["Errors"]})
+        return len(keys)
+
+    def move(self, source_key, key):
+        # The managed copy switches to a multipart copy for objects over 5 GB
+        self._call("copy", {"Bucket": self.bucket, "Key": source_key}, self.bucket, key)
+        self._call("delete_object", Bucket=self.bucket, Key=source_key)
+
+    def url(self, key):
+        return s3_object_url(self.bucket, key)
+
+    def create_multipart(self, key, content_type=DEFAULT_CONTENT_TYPE):
+        return self._call("create_multipart_upload", Bucket=self.bucket, Key=key, ContentType=content_type)["UploadId"]
+
+    def upload_part(self, key, upload_id, part_number, data):
+        return self._call("upload_part", Bucket=self.bucket, Key=key, UploadId=upload_id,
+                          PartNumber=part_number, Body=data)["ETag"]
+
+    def list_parts(self, key, upload_id):
+        pages = self._call("get_paginator", "list_parts").paginate(Bucket=self.bucket, Key=key, UploadId=upload_id)
+        try:
+            return [(part["PartNumber"], part["ETag"]) for page in pages for part in page.get("Parts", [])]
+        except (BotoCoreError, ClientError) as e:
+            raise self._error("list_parts", key, e) from e
+
+    def complete_multipart(self, key, upload_id, parts):
+        self._call("complete_multipart_upload", Bucket=self.bucket, Key=key, UploadId=upload_id,
+                   MultipartUpload={"Parts": [{"PartNumber": number, "ETag": etag} for number, etag in parts]})
+
+    def abort_multipart(self, key, upload_id):
+        try:
+            self._call("abort_multipart_upload", Bucket=self.bucket, Key=key, UploadId=upload_id)
+        except BlobStorageError:
+            pass  # The bucket's lifecycle rule for incomplete multipart uploads cleans up anything left behind
+
+    def presign_put(self, key, content_type, expires):
+        return self._call("generate_presigned_url", "put_object",
+                          Params={"Bucket": self.bucket, "Key": key, "ContentType": content_type}, ExpiresIn=expires)
+
+    def presign_part(self, key, upload_id, part_number, expires):
+        return self._call("generate_presigned_url", "upload_part",
+                          Params={"Bucket": self.bucket, "Key": key, "UploadId": upload_id, "PartNumber": part_number},
+                          ExpiresIn=expires)
+
+    def _call(self, operation, *args, **kwargs):
+        try:
+            return getattr(settings.GETS3CLIENT(), operation)(*args, **kwargs)
+        except (BotoCoreError, ClientError) as e:
+            raise self._error(operation, kwargs.get("Key", args[2] if len(args) > 2 else None), e) from e
+
+    def _error(self, operation, key, e):
+        code = getattr(e, "response", {}).get("Error", {}).get("Code")
+        details = {"key": key, "operation": operation, "error": str(e), "error_code": code}
+        if code in ("404", "NoSuchKey", "NoSuchUpload"):
+            return BlobNotFound(f"{key} was not found in {self.bucket}.", details)
+        return BlobStorageError(f"Storage operation {operation} failed.", details)
+
+
+class LocalBlobStorage(BlobStorage):
+    """
+    Blobs are files under one directory. Content types are kept in a JSON sidecar under .meta/,
+    and multipart uploads keep their parts under .multipart/<upload ID>/ until they are completed.
+    """
+
+    name = "local"
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def write(self, key, data, content_type=DEFAULT_CONTENT_TYPE):
+        fileobj = io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+        self._replace(key, lambda output: shutil.copyfileobj(fileobj, output, COPY_BUFFER_SIZE), content_type)
+
+    def open(self, key, start=None, end=None, chunk_size=COPY_BUFFER_SIZE):
+        path = self._path(key)
+        try:
+            blob = open(path, "rb")
+        except FileNotFoundError as e:
+            raise BlobNotFound(f"{key} was not found.", {"key": key, "operation": "open"}) from e
+        return self._iterate(blob, start, end, chunk_size)
+
+    @staticmethod
+    def _iterate(blob, start, end, chunk_size):
+        with blob:
+            blob.seek(start or 0)
+            remaining = None if end is None else max(0, end - (start or 0))
+            while remaining is None or remaining > 0:
+                data = blob.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not data:
+                    break
+                if remaining is not None:
+                    remaining -= len(data)
+                yield data
+
+    def stat(self, key):
+        path = self._path(key)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError as e:
+            raise BlobNotFound(f"{key} was not found.", {"key": key, "operation": "stat"}) from e
+        metadata = self._read_json(self._meta_path(key))
+        return BlobInfo(key, size, metadata.get("content_type", DEFAULT_CONTENT_TYPE), metadata.get("etag", ""))
+
+    def delete_many(self, keys):
+        keys = list(keys)
+        for key in keys:
+            self._path(key).unlink(missing_ok=True)
+            self._meta_path(key).unlink(missing_ok=True)
+        return len(keys)
+
+    def move(self, source_key, key):
+        source = self._path(source_key)
+        if not source.exists():
+            raise BlobNotFound(f"{source_key} was not found.", {"key": source_key, "operation": "move"})
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source, path)
+        meta_path = self._meta_path(key)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        if self._meta_path(source_key).exists():
+            os.replace(self._meta_path(source_key), meta_path)
+
+    def url(self, key):
+        return self.root.resolve().as_uri() + "/" + key
+
+    def create_multipart(self, key, content_type=DEFAULT_CONTENT_TYPE):
+        upload_id = uuid.uuid4().hex
+        part_dir = self._part_dir(upload_id)
+        part_dir.mkdir(parents=True)
+        (part_dir / "upload.json").write_text(json.dumps({"key": key, "content_type": content_type}))
+        return upload_id
+
+    def upload_part(self, key, upload_id, part_number, data):
+        part_dir = self._existing_part_dir(key, upload_id)
+        # Write then rename, so a retried part never leaves a half-written file behind
+        partial = part_dir / f"{part_number}.partial"
+        partial.write_bytes(data)
+        os.replace(partial, part_dir / str(part_number))
+        return uuid.uuid4().hex
+
+    def list_parts(self, key, upload_id):
+        part_dir = self._existing_part_dir(key, upload_id)
+        numbers = sorted(int(path.name) for path in part_dir.iterdir() if path.name.isdigit())
+        return [(number, "") for number in numbers]
+
+    def complete_multipart(self, key, upload_id, parts):
+        part_dir = self._existing_part_dir(key, upload_id)
+        content_type = self._read_json(part_dir / "upload.json")["content_type"]
+
+        def concatenate(output):
+            for number, etag in parts:
+                with open(part_dir / str(number), "rb") as part:
+                    shutil.copyfileobj(part, output, COPY_BUFFER_SIZE)
+
+        self._replace(key, concatenate, content_type)
+        shutil.rmtree(part_dir, ignore_errors=True)
+
+    def abort_multipart(self, key, upload_id):
+        shutil.rmtree(self._part_dir(upload_id), ignore_errors=True)
+
+    def _replace(self, key, write, content_type):
+        """Write a blob to a temporary file and rename it into place, so readers never see a partial blob."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f".{path.name}.{uuid.uuid4().hex}.partial")
+        try:
+            with open(partial, "wb") as output:
+                write(output)
+            os.replace(partial, path)
+        finally:
+            partial.unlink(missing_ok=True)
+        meta_path = self._meta_path(key)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        meta_path.write_text(json.dumps({"content_type": content_type, "etag": uuid.uuid4().hex}))
+
+    def _path(self, key):
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()) or key.startswith("."):
+            raise BlobStorageError(f"Invalid key: {key}", {"key": key})
+        return path
+
+    def _meta_path(self, key):
+        return self.root / ".meta" / f"{key}.json"
+
+    def _part_dir(self, upload_id):
+        return self.root / ".multipart" / upload_id
+
+    def _existing_part_dir(self, key, upload_id):
+        part_dir = self._part_dir(upload_id)
+        if not part_dir.is_dir():
+            raise BlobNotFound(f"Multipart upload {upload_id} was not found.",
+                               {"key": key, "operation": "upload_part", "error_code": "NoSuchUpload"})
+        return part_dir
+
+    @staticmethod
+    def _read_json(path):
+        try:
+            return json.loads(path.read_text())
+        except FileNotFoundError:
+            return {}
+
+
+def get_blob_storage(name, backend=None):
+    """
+    Return the storage for a logical store.
+    Args:
+        name (str): "slides", "recordings" or "artifacts" (a key of settings.BLOB_STORAGE_BUCKETS).
+        backend (str): "s3" or "local"; defaults to settings.BLOB_STORAGE.
+    Returns:
+        BlobStorage: The backend, bound to the store's bucket.
+    """
+    bucket = settings.BLOB_STORAGE_BUCKETS[name]
+    backend = backend or settings.BLOB_STORAGE
+    if backend == "s3":
+        return S3BlobStorage(bucket)
+    if backend == "local":
+        return LocalBlobStorage(Path(settings.BLOB_STORAGE_ROOT) / bucket)
+    raise ValueError(f"Unknown blob storage backend: {backend}")
@@ -0,0 +1,65 @@
+import threading
+
+"""
+Cache Hit/Miss Counters
+Caches in front of hot queries register a named counter here, e.g.
+
+    token_cache_stats = register_cache_stats("auth_token")
+
+and call `hit()` / `miss()` on every lookup. Admins can read every counter from the
+instrumentation caches endpoint. Like the endpoint stats, the counters live in process
+memory, so each gunicorn worker reports its own numbers.
+"""
+
+
+class CacheStats:
+    """Thread-safe hit/miss counters for one cache"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def clear(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def summary(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else None,
+        }
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def register_cache_stats(name):
+    """Return the counters registered under `name`, creating them on first use."""
+    with _registry_lock:
+        return _registry.setdefault(name, CacheStats())
+
+
+def cache_stats_summary():
+    """
+    Summarize every registered cache.
+    Returns:
+        dict: cache name -> hits, misses and hit rate.
+    """
+    with _registry_lock:
+        registered = dict(_registry)
+    return {name: stats.summary() for name, stats in registered.items()}
@@ -0,0 +1,49 @@
+import math
+
+from .uploads import UPLOAD_PART_SIZE, S3_MAX_PARTS
+
+"""
+Resumable Chunked Uploads
+Long recordings are uploaded as numbered, fixed-size chunks that can be sent (and re-sent) in any order,
+so a dropped connection only costs the chunk that was in flight:
+1. Every chunk except the last is exactly `chunk_size` bytes, so chunk N covers bytes
+   [N * chunk_size, (N + 1) * chunk_size) and the received byte ranges follow from the chunk numbers.
+2. Chunk N is stored as part N + 1 of a multipart upload on the recordings blob storage,
+   and completing the multipart upload assembles the file.
+"""
+
+
+def chunk_size_for(total_size):
+    """Smallest allowed chunk size that keeps the upload within S3's part limit."""
+    return max(UPLOAD_PART_SIZE, math.ceil(total_size / S3_MAX_PARTS))
+
+
+def chunk_count_for(total_size, chunk_size):
+    # An empty file is still sent as one (empty) chunk
+    return max(1, math.ceil(total_size / chunk_size))
+
+
+def expected_chunk_size(index, total_size, chunk_size):
+    """Size in bytes of chunk `index` (the last chunk holds the remainder)."""
+    if index < chunk_count_for(total_size, chunk_size) - 1:
+        return chunk_size
+    return total_size - index * chunk_size
+
+
+def received_ranges(chunks, chunk_size):
+    """
+    Merge received chunks into byte ranges.
+    Args:
+        chunks (iterable): (index, size) pairs, ordered by index.
+        chunk_size (int): The upload's chunk size.
+    Returns:
+        list: Half-open [start, end) byte ranges.
+    """
+    ranges = []
+    for index, size in chunks:
+        start = index * chunk_size
+        if ranges and ranges[-1][1] == start:
+            ranges[-1][1] = start + size
+        else:
+            ranges.append([start, start + size])
+    return ranges
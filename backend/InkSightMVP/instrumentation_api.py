@@ -0,0 +1,40 @@
+from rest_framework.response import Response
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from .middleware import endpoint_stats
+from .cache_stats import cache_stats_summary
+from jobqueuemanagement.metrics import queue_stats
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def get_instrumentation_summary(request):
+    """
+    Retrieve the rolling per-endpoint query and latency summary for this worker process.
+    Only available to staff users.
+    Returns:
+        JSON response mapping each endpoint name to its request count, query counts and timings (ms).
+    """
+    return Response(endpoint_stats.summary())
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def get_cache_stats(request):
+    """
+    Retrieve the hit/miss counters of every registered cache for this worker process.
+    Only available to staff users.
+    Returns:
+        JSON response mapping each cache name to its hits, misses and hit rate.
+    """
+    return Response(cache_stats_summary())
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def get_job_queue_stats(request):
+    """
+    Retrieve the depth and latency of each background job queue.
+    Only available to staff users.
+    Returns:
+        JSON response mapping each queue to its queued, scheduled, running and failed counts,
+        the age of its oldest due job (s), and wait/run latency percentiles (ms) over the last hour.
+    """
+    return Response(queue_stats())
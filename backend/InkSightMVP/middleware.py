@@ -0,0 +1,144 @@
+import threading
+import time
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.db import connection
+
+"""
+Query Instrumentation Middleware
+Measures every request that reaches a view and reports:
+1. The number of ORM queries and the time spent inside the database.
+2. The time spent serializing (view time outside the database plus response rendering).
+3. The total time spent handling the request.
+The numbers are returned as response headers and kept in a rolling per-endpoint window
+that admins can read from the instrumentation summary endpoint.
+"""
+
+
+class RequestStats:
+    """Counters collected while handling a single request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.view_started = None
+        self.render_started = None
+
+    def record_query(self, execute, sql, params, many, context):
+        """Database execute wrapper that counts queries and the time spent running them."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+    def serialization_time(self, finished):
+        """Time spent in the view outside the database, plus the time spent rendering."""
+        if self.view_started is None:
+            return 0.0
+        view_finished = self.render_started or finished
+        view_time = max(view_finished - self.view_started - self.db_time, 0.0)
+        render_time = finished - self.render_started if self.render_started else 0.0
+        return view_time + render_time
+
+
+class EndpointStatsStore:
+    """Rolling window of request measurements, grouped by endpoint (URL name)"""
+
+    def __init__(self, window):
+        self._window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self._window))
+        self._lock = threading.Lock()
+
+    def add(self, endpoint, queries, db_ms, serialize_ms, total_ms):
+        with self._lock:
+            self._samples[endpoint].append((queries, db_ms, serialize_ms, total_ms))
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self):
+        """
+        Summarize the rolling window for every endpoint.
+        Returns:
+            dict: endpoint name -> request count, average/max query count and average/p95 timings (ms).
+        """
+        with self._lock:
+            snapshot = {endpoint: list(samples) for endpoint, samples in self._samples.items()}
+
+        summary = {}
+        for endpoint, samples in snapshot.items():
+            queries, db_ms, serialize_ms, total_ms = zip(*samples)
+            summary[endpoint] = {
+                "requests": len(samples),
+                "avg_queries": round(sum(queries) / len(samples), 2),
+                "max_queries": max(queries),
+                "avg_db_ms": round(sum(db_ms) / len(samples), 2),
+                "avg_serialize_ms": round(sum(serialize_ms) / len(samples), 2),
+                "avg_total_ms": round(sum(total_ms) / len(samples), 2),
+                "p95_total_ms": round(_percentile(total_ms, 95), 2),
+            }
+        return summary
+
+
+def _percentile(values, percent):
+    """Nearest-rank percentile of a non-empty sequence."""
+    ordered = sorted(values)
+    index = max(int(round(percent / 100 * len(ordered))) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+endpoint_stats = EndpointStatsStore(getattr(settings, "QUERY_INSTRUMENTATION_WINDOW", 500))
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Counts ORM queries and measures DB, serialization and total time for every request.
+    The rolling summary lives in process memory, so each gunicorn worker reports its own window.
+    Streaming responses only account for the work done before the first byte is sent.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = RequestStats()
+        request._request_stats = stats
+
+        with connection.execute_wrapper(stats.record_query):
+            response = self.get_response(request)
+
+        finished = time.perf_counter()
+
+        db_ms = stats.db_time * 1000
+        serialize_ms = stats.serialization_time(finished) * 1000
+        total_ms = (finished - stats.started) * 1000
+
+        response["X-DB-Query-Count"] = str(stats.queries)
+        response["X-DB-Time-Ms"] = f"{db_ms:.2f}"
+        response["X-Serialize-Time-Ms"] = f"{serialize_ms:.2f}"
+        response["X-Total-Time-Ms"] = f"{total_ms:.2f}"
+
+        match = getattr(request, "resolver_match", None)
+        if match is not None and stats.view_started is not None:
+            endpoint = match.view_name or match.route
+            endpoint_stats.add(endpoint, stats.queries, db_ms, serialize_ms, total_ms)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        stats = getattr(request, "_request_stats", None)
+        if stats is not None:
+            stats.view_started = time.perf_counter()
+        return None
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after this hook, so rendering counts as serialization time
+        stats = getattr(request, "_request_stats", None)
+        if stats is not None:
+            stats.render_started = time.perf_counter()
+        return response
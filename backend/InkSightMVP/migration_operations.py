@@ -0,0 +1,77 @@
+from django.contrib.postgres.operations import AddIndexConcurrently as PostgresAddIndexConcurrently
+from django.contrib.postgres.operations import NotInTransactionMixin
+from django.contrib.postgres.operations import RemoveIndexConcurrently as PostgresRemoveIndexConcurrently
+from django.db.migrations import AddConstraint, AddIndex, RemoveIndex
+
+"""
+Online Migration Operations
+Migrations run at container start against live tables, and a plain AddIndex/AddConstraint/RemoveIndex
+holds a lock that blocks every write to the table while the index is built or dropped. These operations
+build (or drop) the index CONCURRENTLY on PostgreSQL, so writes continue meanwhile; other databases
+(e.g. SQLite in local test runs) fall back to the plain operation.
+Like PostgreSQL's own concurrent operations they cannot run inside a transaction: the migration
+using them must set `atomic = False`. If a concurrent build fails it leaves an INVALID index behind,
+which has to be dropped before re-running the migration.
+"""
+
+
+def _is_postgresql(schema_editor):
+    return schema_editor.connection.vendor == "postgresql"
+
+
+class AddIndexConcurrently(PostgresAddIndexConcurrently):
+    """AddIndex built with CREATE INDEX CONCURRENTLY on PostgreSQL"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if not _is_postgresql(schema_editor):
+            return AddIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+        return super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if not _is_postgresql(schema_editor):
+            return AddIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
+        return super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class RemoveIndexConcurrently(PostgresRemoveIndexConcurrently):
+    """RemoveIndex dropped with DROP INDEX CONCURRENTLY on PostgreSQL"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if not _is_postgresql(schema_editor):
+            return RemoveIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+        return super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if not _is_postgresql(schema_editor):
+            return RemoveIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
+        return super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class AddUniqueConstraintConcurrently(NotInTransactionMixin, AddConstraint):
+    """
+    AddConstraint for a plain UniqueConstraint (fields only). On PostgreSQL the unique index is built
+    with CREATE UNIQUE INDEX CONCURRENTLY and then attached as the constraint, which only needs a
+    brief lock.
+    """
+
+    atomic = False
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if not _is_postgresql(schema_editor):
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        self._ensure_not_in_transaction(schema_editor)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+
+        quote = schema_editor.quote_name
+        name = quote(self.constraint.name)
+        columns = ", ".join(quote(model._meta.get_field(field).column) for field in self.constraint.fields)
+        table = quote(model._meta.db_table)
+        # Drop an INVALID index left behind by a failed earlier attempt
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        schema_editor.execute(f"CREATE UNIQUE INDEX CONCURRENTLY {name} ON {table} ({columns})")
+        schema_editor.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}")
+
+    def describe(self):
+        return f"Concurrently create unique constraint {self.constraint.name} on model {self.model_name}"
@@ -0,0 +1,84 @@
+from urllib.parse import parse_qs, urlparse
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from .streaming import stream_json_response, wants_stream
+from .values_serializers import ValuesSerializer
+
+"""
+Keyset (Cursor) Pagination for List Endpoints
+Pagination is opt-in so existing callers keep receiving a plain JSON list:
+1. Without `?limit=` the full list is returned, exactly as before.
+2. With `?limit=N` the response contains at most N rows (N is capped at 1000) plus a `next_cursor`
+   token. A `limit` that is not a positive integer is rejected with a 400.
+3. Passing `?cursor=<next_cursor>&limit=N` continues after the last row of the previous page.
+4. With `?stream=true` the whole list is streamed in chunks instead (see InkSightMVP.streaming).
+Pages are found with an indexed `WHERE key > last_key` filter instead of OFFSET,
+so every page costs the same no matter how deep into the table it is.
+"""
+
+class KeysetPagination(CursorPagination):
+    """Cursor pagination that is only enabled when the caller passes `?limit=`"""
+    page_size = None
+    page_size_query_param = "limit"
+    max_page_size = 1000
+    cursor_query_param = "cursor"
+    # Used when a cursor is passed without a limit
+    default_page_size = 100
+    ordering = "pk"
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = ordering
+
+    def get_page_size(self, request):
+        limit = request.query_params.get(self.page_size_query_param)
+        if limit is None:
+            if self.cursor_query_param in request.query_params:
+                return self.default_page_size
+            return None
+        if not limit.isdigit() or int(limit) == 0:
+            raise ValidationError({self.page_size_query_param: "Must be a positive integer."})
+        return min(int(limit), self.max_page_size)
+
+    def get_paginated_response(self, data):
+        next_link = self.get_next_link()
+        return Response({
+            "next_cursor": self.get_cursor_token(next_link),
+            "next": next_link,
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_cursor_token(self, link):
+        """Extract the opaque cursor token from a next/previous link."""
+        if link is None:
+            return None
+        return parse_qs(urlparse(link).query).get(self.cursor_query_param, [None])[0]
+
+
+def list_response(request, queryset, serializer_class, ordering="pk"):
+    """
+    Serialize a list endpoint, paginating it with a keyset cursor when `?limit=` is given
+    or streaming the whole list when `?stream=true` is given.
+    Args:
+        request (Request): The DRF request (its query parameters select pagination).
+        queryset (QuerySet): The unbounded queryset to list.
+        serializer_class: The serializer used for every row. A ValuesSerializer reads
+            `.values()` rows instead of model instances.
+        ordering (str or tuple): Fields that give the list a stable order, e.g. "pk" or ("-date", "-id").
+    Returns:
+        Response: A JSON list, or a page with `next_cursor` and `results` when paginated.
+    """
+    if issubclass(serializer_class, ValuesSerializer):
+        ordering_fields = [ordering] if isinstance(ordering, str) else ordering
+        queryset = serializer_class.values(queryset, [field.lstrip("-") for field in ordering_fields])
+
+    if wants_stream(request):
+        return stream_json_response(queryset, serializer_class)
+
+    paginator = KeysetPagination(ordering)
+    page = paginator.paginate_queryset(queryset, request)
+    if page is None:
+        return Response(serializer_class(queryset, many=True).data)
+    return paginator.get_paginated_response(serializer_class(page, many=True).data)
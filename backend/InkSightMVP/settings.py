@@ -42,14 +42,47 @@ ALLOWED_HOSTS = [
 
 # AWS Credentials (must be capital for settings)
 def GETS3CLIENT():
-    credentials = get_unauthenticated_credentials()
-    S3CLIENT = boto3.client(
-        "s3",
-        aws_access_key_id=credentials["AccessKeyId"],
-        aws_secret_access_key=credentials["SecretKey"],
-        aws_session_token=credentials["SessionToken"],
-    )
-    return S3CLIENT
+    # One pooled client per process, signed with cached, auto-refreshing Cognito credentials
+    return get_s3_client()
+
+# Bucket that lecture slides are uploaded to
+SLIDES_BUCKET = os.getenv("AWS_SLIDES_BUCKET", "inksightslidestorage")
+
+# Bucket that lecture recordings are uploaded to
+RECORDINGS_BUCKET = os.getenv("AWS_RECORDINGS_BUCKET", SLIDES_BUCKET)
+
+# Bucket for derived artifacts (frames, transcripts)
+ARTIFACTS_BUCKET = os.getenv("AWS_ARTIFACTS_BUCKET", SLIDES_BUCKET)
+
+# Blob storage for media files: "s3", or "local" to keep one directory per bucket under BLOB_STORAGE_ROOT
+BLOB_STORAGE = os.getenv("BLOB_STORAGE", "s3")
+BLOB_STORAGE_ROOT = os.getenv("BLOB_STORAGE_ROOT", BASE_DIR / "blobs")
+BLOB_STORAGE_BUCKETS = {
+    "slides": SLIDES_BUCKET,
+    "recordings": RECORDINGS_BUCKET,
+    "artifacts": ARTIFACTS_BUCKET,
+}
+
+# Background job queue (jobqueuemanagement), run by `manage.py run_job_worker`
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", 2))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 1))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 5))
+# Failed jobs are retried after JOB_RETRY_BASE_DELAY * 2^(attempt - 1) seconds, at most JOB_RETRY_MAX_DELAY
+JOB_RETRY_BASE_DELAY = float(os.getenv("JOB_RETRY_BASE_DELAY", 10))
+JOB_RETRY_MAX_DELAY = float(os.getenv("JOB_RETRY_MAX_DELAY", 60 * 60))
+# Running jobs whose worker has not heartbeated for this many seconds are requeued
+JOB_LEASE_TIMEOUT = int(os.getenv("JOB_LEASE_TIMEOUT", 5 * 60))
+JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", 7))
+
+# Processes used to render the pages of an uploaded slide deck
+SLIDE_PROCESSING_WORKERS = int(os.getenv("SLIDE_PROCESSING_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Size of each part when streaming uploads to S3 (S3 requires at least 5 MiB)
+UPLOAD_PART_SIZE = int(os.getenv("UPLOAD_PART_SIZE", 8 * 1024 * 1024))
+
+# Presigned direct-to-bucket uploads: URL lifetime in seconds, and the size above which multipart is used
+PRESIGNED_UPLOAD_EXPIRES = int(os.getenv("PRESIGNED_UPLOAD_EXPIRES", 60 * 60))
+PRESIGNED_MULTIPART_THRESHOLD = int(os.getenv("PRESIGNED_MULTIPART_THRESHOLD", 100 * 1024 * 1024))
 
 # Application definition
 
@@ -69,6 +102,7 @@ INSTALLED_APPS = [
     'notepacketsmanagement',
     'permissionsmanagement',
     'aimodelmanagement',
+    'jobqueuemanagement',
 
     'rest_framework',
     'rest_framework.authtoken',
@@ -76,6 +110,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'InkSightMVP.middleware.QueryInstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -92,6 +127,10 @@ MIDDLEWARE = [
 ROOT_URLCONF = 'InkSightMVP.urls'
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
+CORS_EXPOSE_HEADERS = ["X-DB-Query-Count", "X-DB-Time-Ms", "X-Serialize-Time-Ms", "X-Total-Time-Ms"]
+
+# Number of recent requests kept per endpoint by the query instrumentation middleware
+QUERY_INSTRUMENTATION_WINDOW = 500
 
 SECURE_REFERRER_POLICY = 'no-referrer-when-downgrade'
 SECURE_CROSS_ORIGIN_OPENER_POLICY = "same-origin-allow-popups"
@@ -100,6 +139,16 @@ GOOGLE_OAUTH2_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_OAUTH2_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
 GOOGLE_OAUTH2_PROJECT_ID = os.getenv("GOOGLE_PROJECT_ID")
 
+# OpenID Connect discovery document of the OAuth provider, and how long it and the signing keys are
+# cached when Google sends no Cache-Control max-age (see usermanagement/google_oauth.py)
+GOOGLE_OIDC_DISCOVERY_URL = os.getenv("GOOGLE_OIDC_DISCOVERY_URL",
+                                      "https://accounts.google.com/.well-known/openid-configuration")
+GOOGLE_OIDC_CACHE_TIMEOUT = int(os.getenv("GOOGLE_OIDC_CACHE_TIMEOUT", 60 * 60))
+# Keep-alive connections per host kept open to Google by each process
+GOOGLE_OAUTH_POOL_SIZE = int(os.getenv("GOOGLE_OAUTH_POOL_SIZE", 10))
+# Seconds a user has to finish the Google consent screen; the signed OAuth state expires after that
+OAUTH_STATE_MAX_AGE = int(os.getenv("OAUTH_STATE_MAX_AGE", 10 * 60))
+
 BASE_BACKEND_URL = "http://127.0.0.1:8000" 
 
 TEMPLATES = [
@@ -150,7 +199,7 @@ else:
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'usermanagement.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -158,6 +207,29 @@ REST_FRAMEWORK = {
 }
 FRONTEND_URL = os.environ.get("FRONTEND_URL")
 
+# Set CACHE_URL (e.g. redis://host:6379/0) to share the cache, and its invalidations, between workers.
+# Without it every process keeps its own in-memory cache.
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+}
+# Whether every worker and instance sees the same cache, so deleting an entry reaches all of them.
+# The token and permission caches hold revocable grants, so they are only used with a shared cache;
+# with a per-process cache every lookup goes to the database. Upload progress polling (see uploads.py)
+# is only available with a shared cache, since the poll and the upload run in different workers.
+CACHE_IS_SHARED = CACHES["default"]["BACKEND"] in {
+    "django.core.cache.backends.db.DatabaseCache",
+    "django.core.cache.backends.memcached.PyMemcacheCache",
+    "django.core.cache.backends.memcached.PyLibMCCache",
+    "django.core.cache.backends.memcached.MemcachedCache",
+    "django.core.cache.backends.redis.RedisCache",
+}
+
+# Seconds an authentication token lookup is cached for, with a shared cache (see CachedTokenAuthentication)
+TOKEN_AUTH_CACHE_TIMEOUT = int(os.getenv("TOKEN_AUTH_CACHE_TIMEOUT", 300))
+
+# Seconds a user's compiled permission mask is cached for, with a shared cache (see permissionsmanagement/access.py)
+PERMISSION_CACHE_TIMEOUT = int(os.getenv("PERMISSION_CACHE_TIMEOUT", 60 * 60))
+
 AUTH_USER_MODEL = 'usermanagement.User'
 
 # Password validation
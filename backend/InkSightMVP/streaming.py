@@ -0,0 +1,119 @@
+import json
+import re
+from itertools import islice
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+"""
+Streaming JSON Responses
+For admin and export callers that want a whole table in one response:
+1. The queryset is read with a server-side cursor (`.iterator(chunk_size=...)`).
+2. Each chunk of rows is serialized and written out before the next chunk is fetched.
+3. The response is a single JSON list, identical to the non-streaming response body.
+Only one chunk of model instances is held in memory at a time, so worker memory stays flat
+regardless of the table size.
+
+Blob downloads (stream_blob_response) are streamed the same way, one storage read at a time,
+and honour a single-range `Range: bytes=...` header so media players can seek.
+"""
+
+STREAM_CHUNK_SIZE = 2000
+RANGE_HEADER_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def wants_stream(request):
+    """Whether the caller asked for a streamed response with `?stream=true`."""
+    return request.query_params.get("stream", "").lower() in ("1", "true", "yes")
+
+
+def iter_json_list(queryset, serializer_class, chunk_size=STREAM_CHUNK_SIZE):
+    """Yield a JSON list of the serialized queryset, one chunk of rows at a time."""
+    rows = queryset.iterator(chunk_size=chunk_size)
+    separator = ""
+    yield "["
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        data = serializer_class(chunk, many=True).data
+        yield separator + ",".join(
+            json.dumps(item, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")) for item in data
+        )
+        separator = ","
+    yield "]"
+
+
+def stream_json_response(queryset, serializer_class, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Stream a serialized queryset as a JSON list.
+    Args:
+        queryset (QuerySet): Rows to serialize, read in chunks with a server-side cursor.
+        serializer_class: The serializer used for every row.
+        chunk_size (int): Number of rows fetched and serialized at a time.
+    Returns:
+        StreamingHttpResponse: The JSON list, written incrementally.
+    """
+    return StreamingHttpResponse(
+        iter_json_list(queryset, serializer_class, chunk_size),
+        content_type="application/json",
+    )
+
+
+def parse_range_header(header, size):
+    """
+    Parse a single-range `Range` header.
+    Args:
+        header (str): The header value, e.g. "bytes=0-1023", "bytes=1024-" or "bytes=-500".
+        size (int): Size of the blob in bytes.
+    Returns:
+        tuple: Half-open (start, end) byte range, or None to send the whole blob
+            (no header, or a form this parser does not handle, such as multiple ranges).
+    Raises:
+        ValueError: The range cannot be satisfied.
+    """
+    match = RANGE_HEADER_PATTERN.match(header or "")
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        start, end = max(0, size - int(last)), size
+    else:
+        start = int(first)
+        end = min(size, int(last) + 1) if last else size
+    if start >= size or start >= end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+def stream_blob_response(request, storage, key):
+    """
+    Stream a blob from storage, honouring the request's Range header.
+    Args:
+        request: The HTTP request.
+        storage (BlobStorage): The storage holding the blob.
+        key (str): The blob's key.
+    Returns:
+        StreamingHttpResponse: 200 with the whole blob or 206 with the requested range;
+            an HttpResponse with status 416 if the range cannot be satisfied.
+    Raises:
+        BlobNotFound, BlobStorageError
+    """
+    info = storage.stat(key)
+    try:
+        byte_range = parse_range_header(request.META.get("HTTP_RANGE"), info.size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{info.size}"
+        return response
+
+    start, end = byte_range or (0, info.size)
+    response = StreamingHttpResponse(storage.open(key, *(byte_range or ())), content_type=info.content_type)
+    response["Content-Length"] = str(end - start)
+    response["Accept-Ranges"] = "bytes"
+    if byte_range:
+        response.status_code = 206
+        response["Content-Range"] = f"bytes {start}-{end - 1}/{info.size}"
+    return response
@@ -0,0 +1,330 @@
+import functools
+import hashlib
+import math
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers
+
+from .blob_storage import BlobNotFound, BlobStorageError, get_blob_storage
+
+"""
+Streaming Uploads to Blob Storage
+Django normally spools every uploaded file to memory or a temporary file before the view runs.
+MultipartUploadHandler instead pipes the chunks of one form field straight into a multipart upload
+on a blob storage backend (see blob_storage.py):
+1. Chunks are buffered until a part is full (UPLOAD_PART_SIZE, at least S3's 5 MiB minimum),
+   so memory use is bounded by one part per upload.
+2. When the field ends, the last part is sent and the multipart upload is completed;
+   the view finds a StoredUploadedFile (storage, key, size, parts, sha256) in request.FILES.
+   The SHA-256 of the content is computed on the way through, e.g. to store the file by content hash.
+3. If anything fails, or the client disconnects, the multipart upload is aborted so no
+   orphaned parts are left behind, and UploadFailed describes what went wrong.
+4. If the client passes ?upload_id=<id>, progress is written to the cache and can be polled
+   with get_upload_progress(user_id, upload_id) while the request is still running. The progress is
+   kept per user, and only with a cache shared by every worker (settings.CACHE_IS_SHARED, e.g. Redis):
+   the poll is served by another worker process than the upload, so a per-process cache would never
+   see it. Polling also needs more than one worker (or a threaded worker) to answer during the upload.
+Install it with the @stream_upload_to_storage decorator, placed above @api_view.
+
+Presigned Uploads
+Large files can bypass the Django workers entirely:
+1. create_presigned_upload (S3 storage only) returns a presigned PUT URL (or, above PRESIGNED_MULTIPART_THRESHOLD,
+   one presigned URL per multipart part) plus a signed upload token describing the target.
+2. The client PUTs the bytes straight to the bucket.
+3. complete_presigned_upload verifies the token, completes the multipart upload and checks the
+   object exists with the expected size; only then does the view create its database row.
+"""
+
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+UPLOAD_PART_SIZE = max(getattr(settings, "UPLOAD_PART_SIZE", 8 * 1024 * 1024), S3_MIN_PART_SIZE)
+UPLOAD_PROGRESS_TIMEOUT = 60 * 60
+S3_MAX_PARTS = 10000
+
+PRESIGNED_UPLOAD_EXPIRES = getattr(settings, "PRESIGNED_UPLOAD_EXPIRES", 60 * 60)
+PRESIGNED_MULTIPART_THRESHOLD = getattr(settings, "PRESIGNED_MULTIPART_THRESHOLD", 100 * 1024 * 1024)
+UPLOAD_TOKEN_SALT = "InkSightMVP.uploads.presigned-upload"
+
+
+class UploadFailed(Exception):
+    """Raised when an upload cannot be written to storage"""
+
+    def __init__(self, message, details):
+        super().__init__(message)
+        self.details = details
+
+
+class InvalidUploadToken(UploadFailed):
+    """The upload token is malformed, tampered with or expired"""
+
+
+class UploadNotFinished(UploadFailed):
+    """The object is missing from the bucket or does not have the announced size"""
+
+
+class StoredUploadedFile(UploadedFile):
+    """An upload that was streamed to blob storage; it has no local content"""
+
+    def __init__(self, name, content_type, size, charset, storage, key, parts, sha256):
+        super().__init__(file=None, name=name, content_type=content_type, size=size, charset=charset)
+        self.storage = storage
+        self.key = key
+        self.parts = parts
+        self.sha256 = sha256
+
+    @property
+    def url(self):
+        return self.storage.url(self.key)
+
+
+def upload_progress_cache_key(user_id, upload_id):
+    return f"upload-progress:{user_id}:{upload_id}"
+
+
+def get_upload_progress(user_id, upload_id):
+    """Return the last reported progress of a user's streamed upload, or None if unknown."""
+    return cache.get(upload_progress_cache_key(user_id, upload_id))
+
+
+class MultipartUploadHandler(FileUploadHandler):
+    """Streams one multipart form field into a blob storage multipart upload"""
+
+    def __init__(self, request, *, storage, field_name, key_template, key_arguments,
+                 upload_id=None, part_size=UPLOAD_PART_SIZE):
+        super().__init__(request)
+        self.storage = storage
+        self.target_field = field_name
+        self.key_template = key_template
+        self.key_arguments = key_arguments
+        self.progress_id = upload_id
+        self.part_size = part_size
+        self.content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+
+        self.key = None
+        self.multipart_id = None
+        self.buffer = bytearray()
+        self.parts = []
+        self.hasher = hashlib.sha256()
+        self.bytes_received = 0
+        self.completed = False
+        self.failed = False
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        if field_name != self.target_field or self.multipart_id is not None:
+            # Other file fields (and repeats of this one) are left to Django's default handlers
+            return
+
+        self.key = self.key_template.format(file_name=self.file_name, token=uuid.uuid4().hex, **self.key_arguments)
+        self.multipart_id = self._call_storage("create_multipart", self.key,
+                                               self.content_type or "application/octet-stream")
+        self._report("uploading")
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self._is_active():
+            return raw_data
+
+        self.buffer += raw_data
+        self.hasher.update(raw_data)
+        self.bytes_received += len(raw_data)
+        while len(self.buffer) >= self.part_size:
+            self._upload_part(bytes(self.buffer[:self.part_size]))
+            del self.buffer[:self.part_size]
+        return None
+
+    def file_complete(self, file_size):
+        if not self._is_active():
+            return None
+
+        if self.buffer or not self.parts:
+            # The last part may be smaller than the minimum (an empty file is a single empty part)
+            self._upload_part(bytes(self.buffer))
+            self.buffer = bytearray()
+        self._call_storage("complete_multipart", self.key, self.multipart_id, self.parts)
+        self.completed = True
+        self._report("complete")
+        return StoredUploadedFile(self.file_name, self.content_type, file_size, self.charset,
+                                  self.storage, self.key, len(self.parts), self.hasher.hexdigest())
+
+    def upload_interrupted(self):
+        self.abort("The upload was interrupted before the file was received.")
+
+    def abort(self, reason):
+        """Abort the multipart upload if it was started but not completed (only the first reason is kept)."""
+        if self.key is None or self.completed or self.failed:
+            return
+        self.failed = True
+        self.buffer = bytearray()
+        if self.multipart_id is not None:
+            self.storage.abort_multipart(self.key, self.multipart_id)
+        self._report("failed", error=reason)
+
+    def details(self):
+        """Progress of this upload, as returned to the client and stored for polling."""
+        return {
+            "key": self.key,
+            "bytes_received": self.bytes_received,
+            "content_length": self.content_length,
+            "parts_uploaded": len(self.parts),
+        }
+
+    def _is_active(self):
+        return self.multipart_id is not None and not self.completed and not self.failed
+
+    def _upload_part(self, body):
+        part_number = len(self.parts) + 1
+        etag = self._call_storage("upload_part", self.key, self.multipart_id, part_number, body)
+        self.parts.append((part_number, etag))
+        self._report("uploading")
+
+    def _call_storage(self, operation, *args):
+        try:
+            return getattr(self.storage, operation)(*args)
+        except BlobStorageError as e:
+            self.abort(str(e))
+            raise UploadFailed(
+                f"Uploading {self.file_name} to storage failed.",
+                {**self.details(), "operation": operation, "error": str(e), "error_code": e.details.get("error_code")},
+            ) from e
+
+    def _report(self, status, error=None):
+        if self.progress_id is None or not settings.CACHE_IS_SHARED:
+            return
+        # Read at report time: DRF has authenticated the request by the time the body is parsed
+        cache.set(upload_progress_cache_key(self.request.user.pk, self.progress_id),
+                  {**self.details(), "status": status, "error": error}, UPLOAD_PROGRESS_TIMEOUT)
+
+
+def stream_upload_to_storage(field_name, key_template, storage="slides"):
+    """
+    Decorator that streams the `field_name` file of a multipart request straight to blob storage.
+    Place it above @api_view so the handler is installed before DRF parses the request.
+    The view reads the StoredUploadedFile from request.FILES[field_name] (and request.upload_handler
+    for progress details) and should catch UploadFailed.
+    Args:
+        field_name (str): The form field holding the file, e.g. "file".
+        key_template (str): Blob key, formatted with the view's URL kwargs, `file_name` and a random `token`,
+            e.g. "uploads/{course_id}/{file_name}".
+        storage (str): The blob store to upload to (see get_blob_storage).
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapped(request, *args, **kwargs):
+            handler = MultipartUploadHandler(
+                request,
+                storage=get_blob_storage(storage),
+                field_name=field_name,
+                key_template=key_template,
+                key_arguments=kwargs,
+                upload_id=request.GET.get("upload_id"),
+            )
+            request.upload_handlers = [handler, *request.upload_handlers]
+            request.upload_handler = handler
+            try:
+                return view(request, *args, **kwargs)
+            finally:
+                # Covers client disconnects and view errors: never leave a multipart upload open
+                handler.abort("The request ended before the upload was completed.")
+        return wrapped
+    return decorator
+
+
+def create_presigned_upload(storage_name, key, content_type, size=None, target=None):
+    """
+    Prepare a direct-to-bucket upload.
+    Args:
+        storage_name (str): The blob store to upload to (see get_blob_storage); it must support presigned URLs.
+        key (str): Target blob key.
+        content_type (str): Content type the client must send.
+        size (int): Announced size in bytes; above PRESIGNED_MULTIPART_THRESHOLD a multipart upload is used.
+        target (dict): Extra data the completion step needs (e.g. the course or lecture session ID).
+    Returns:
+        dict: The key, method, URL(s), headers, expiry and the signed `upload_token` to complete with.
+    Raises:
+        UnsupportedOperation if the storage cannot presign URLs; BlobStorageError
+    """
+    storage = get_blob_storage(storage_name)
+    expires = PRESIGNED_UPLOAD_EXPIRES
+    token = {**(target or {}), "storage": storage_name, "backend": storage.name, "key": key,
+             "content_type": content_type, "size": size}
+    response = {"key": key, "method": "PUT", "headers": {"Content-Type": content_type}, "expires_in": expires}
+
+    if size is not None and size > PRESIGNED_MULTIPART_THRESHOLD:
+        part_size = max(UPLOAD_PART_SIZE, math.ceil(size / S3_MAX_PARTS))
+        # Fail before starting a multipart upload on a backend that cannot presign its parts
+        storage.presign_put(key, content_type, expires)
+        multipart_id = storage.create_multipart(key, content_type)
+        token["multipart_upload_id"] = multipart_id
+        # Parts carry no Content-Type; it was fixed when the multipart upload was created
+        response["headers"] = {}
+        response["part_size"] = part_size
+        response["parts"] = [
+            {"part_number": part_number, "url": storage.presign_part(key, multipart_id, part_number, expires)}
+            for part_number in range(1, math.ceil(size / part_size) + 1)
+        ]
+    else:
+        response["url"] = storage.presign_put(key, content_type, expires)
+
+    response["upload_token"] = signing.dumps(token, salt=UPLOAD_TOKEN_SALT)
+    return response
+
+
+def load_upload_token(upload_token):
+    """
+    Verify an upload token and return the data it describes (key, storage and the caller's target).
+    Raises:
+        InvalidUploadToken
+    """
+    try:
+        # Clients may start a part just before the URLs expire, so completion is accepted for twice as long
+        return signing.loads(upload_token, salt=UPLOAD_TOKEN_SALT, max_age=2 * PRESIGNED_UPLOAD_EXPIRES)
+    except signing.BadSignature as e:
+        raise InvalidUploadToken("Invalid or expired upload token.", {"error": str(e)}) from e
+
+
+def complete_presigned_upload(upload_token):
+    """
+    Finish a direct-to-bucket upload and confirm the blob is in place.
+    Args:
+        upload_token (str): The token returned by create_presigned_upload.
+    Returns:
+        tuple: (token data, storage, BlobInfo).
+    Raises:
+        InvalidUploadToken, UploadNotFinished, UploadFailed
+    """
+    token = load_upload_token(upload_token)
+    storage = get_blob_storage(token["storage"], backend=token["backend"])
+    key = token["key"]
+    try:
+        if token.get("multipart_upload_id"):
+            _complete_multipart_upload(storage, key, token["multipart_upload_id"])
+        info = storage.stat(key)
+    except BlobNotFound as e:
+        raise UploadNotFinished("The file has not been uploaded yet.", e.details) from e
+    except BlobStorageError as e:
+        if e.details.get("error_code") == "InvalidPart":
+            raise UploadNotFinished("The file has not been uploaded yet.", e.details) from e
+        raise UploadFailed("Completing the upload failed.", e.details) from e
+
+    if token["size"] is not None and info.size != token["size"]:
+        raise UploadNotFinished(
+            "The uploaded file does not have the announced size.",
+            {"key": key, "expected_size": token["size"], "size": info.size},
+        )
+    return token, storage, info
+
+
+def _complete_multipart_upload(storage, key, multipart_id):
+    """Complete a multipart upload from the parts storage received (the client does not need to send ETags)."""
+    try:
+        parts = storage.list_parts(key, multipart_id)
+    except BlobNotFound:
+        # A repeated completion call finds the upload already completed; stat decides
+        return
+    if not parts:
+        raise UploadNotFinished("The file has not been uploaded yet.", {"key": key, "parts_uploaded": 0})
+    storage.complete_multipart(key, multipart_id, parts)
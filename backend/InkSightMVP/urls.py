@@ -17,6 +17,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from .run_migrations import run_migrations
+from .instrumentation_api import get_instrumentation_summary, get_cache_stats, get_job_queue_stats
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -29,6 +30,9 @@ urlpatterns = [
     path('usermanagement/', include('usermanagement.urls')),
     path('aimodelmanagement/', include('aimodelmanagement.urls')),
     path("run-migrations/", run_migrations, name="run_migrations"),
+    path("instrumentation/summary/", get_instrumentation_summary, name="get_instrumentation_summary"),
+    path("instrumentation/caches/", get_cache_stats, name="get_cache_stats"),
+    path("instrumentation/jobs/", get_job_queue_stats, name="get_job_queue_stats"),
 ]
 
 
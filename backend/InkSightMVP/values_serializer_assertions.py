@@ -0,0 +1,17 @@
+"""
+Test helpers for the ValuesSerializers (InkSightMVP.values_serializers)
+Mixed into each app's equivalence tests, which check that a ValuesSerializer and the ModelSerializer it
+replaces produce exactly the same JSON.
+"""
+
+
+class ValuesSerializerAssertionsMixin:
+    """TestCase mixin comparing a ValuesSerializer against its ModelSerializer"""
+
+    def assertSameOutput(self, model_serializer, values_serializer, queryset):
+        """Assert both serializers render the queryset identically, as a list and as a single row."""
+        queryset = queryset.order_by("pk")
+        expected = model_serializer(queryset, many=True).data
+        self.assertTrue(expected, "The queryset must not be empty")
+        self.assertEqual(values_serializer(queryset, many=True).data, expected)
+        self.assertEqual(values_serializer(values_serializer.values(queryset).first()).data, expected[0])
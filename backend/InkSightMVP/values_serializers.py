@@ -0,0 +1,112 @@
+from django.db import models
+from django.db.models.query import QuerySet
+from django.utils import timezone
+
+"""
+Values Serializers
+Read-only counterparts of the ModelSerializers used by list endpoints.
+A ModelSerializer builds a model instance and runs every field's `to_representation` for each row;
+a ValuesSerializer reads plain `.values()` rows and converts only the columns that need it
+(dates, times and datetimes), producing exactly the same JSON shape.
+Declared like a ModelSerializer:
+
+    class CourseValuesSerializer(ValuesSerializer):
+        class Meta:
+            model = Course
+            fields = CourseSerializer.Meta.fields
+
+`Meta.lookups` can map an output field to a different ORM lookup (e.g. a related model's column).
+A `prefix` reads the same fields through a relation, e.g. students joined onto a course queryset
+with `prefix="studentcourse__student__"`.
+"""
+
+
+def _format_datetime(value):
+    # Matches rest_framework.fields.DateTimeField with the default ISO 8601 format
+    if timezone.is_aware(value):
+        value = value.astimezone(timezone.get_current_timezone())
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def _format_iso(value):
+    # Matches rest_framework.fields.DateField / TimeField with the default ISO 8601 format
+    return value.isoformat()
+
+
+class ValuesSerializer:
+    """Serialize `.values()` rows (or a queryset) into the same JSON as the matching ModelSerializer"""
+
+    class Meta:
+        model = None
+        fields = ()
+        lookups = {}
+
+    def __init__(self, instance=None, many=False, prefix=""):
+        self.instance = instance
+        self.many = many
+        self.prefix = prefix
+
+    @classmethod
+    def get_lookups(cls):
+        """Return (output name, ORM lookup) pairs for every serialized field."""
+        lookups = getattr(cls.Meta, "lookups", {})
+        return [(name, lookups.get(name, name)) for name in cls.Meta.fields]
+
+    @classmethod
+    def get_converters(cls):
+        """Return (output name, lookup, converter or None) for every field, computed once per class."""
+        if "_converters" not in cls.__dict__:
+            converters = []
+            for name, lookup in cls.get_lookups():
+                field = cls._resolve_field(lookup)
+                if isinstance(field, models.DateTimeField):
+                    converter = _format_datetime
+                elif isinstance(field, (models.DateField, models.TimeField)):
+                    converter = _format_iso
+                else:
+                    converter = None
+                converters.append((name, lookup, converter))
+            cls._converters = converters
+        return cls._converters
+
+    @classmethod
+    def _resolve_field(cls, lookup):
+        """Follow a (possibly related) lookup like `user_content_type__model` to its model field."""
+        model = cls.Meta.model
+        field = None
+        for part in lookup.split("__"):
+            field = model._meta.pk if part == "pk" else model._meta.get_field(part)
+            if field.is_relation and field.related_model is not None:
+                model = field.related_model
+        return field
+
+    @classmethod
+    def values(cls, queryset, extra=(), prefix=""):
+        """
+        Turn a model queryset into a `.values()` queryset with every serialized lookup.
+        Args:
+            queryset (QuerySet): A queryset of `Meta.model`, or of a model related to it through `prefix`.
+            extra (iterable): Additional lookups to select, e.g. the pagination ordering fields.
+            prefix (str): Relation path from the queryset's model to `Meta.model`, ending in "__".
+        """
+        lookups = [prefix + lookup for _, lookup in cls.get_lookups()]
+        return queryset.values(*lookups, *[name for name in extra if name not in lookups])
+
+    def to_representation(self, row):
+        data = {}
+        for name, lookup, converter in self.get_converters():
+            value = row[self.prefix + lookup]
+            data[name] = converter(value) if converter is not None and value is not None else value
+        return data
+
+    @property
+    def data(self):
+        rows = self.instance
+        if isinstance(rows, QuerySet) and rows._fields is None:
+            rows = self.values(rows, prefix=self.prefix)
+        if self.many:
+            return [self.to_representation(row) for row in rows]
+        return self.to_representation(rows)
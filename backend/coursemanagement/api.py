@@ -2,11 +2,14 @@ from rest_framework.response import Response
 from rest_framework.decorators import api_view
 from .models import Course, StudentCourse, ProfessorCourse
 from .serializers import CourseSerializer, StudentCourseSerializer, ProfessorCourseSerializer
+from .serializers import CourseValuesSerializer, StudentCourseValuesSerializer, ProfessorCourseValuesSerializer
 from usermanagement.models import Professor, Student, SDSCoordinator, TeacherAssistant
 from usermanagement.serializers import StudentSerializer, ProfessorSerializer, SDSCoordinatorSerializer, TeacherAssistantSerializer
+from usermanagement.serializers import StudentValuesSerializer
 from django.shortcuts import render, get_object_or_404
 from rest_framework import status
 from django.db import IntegrityError
+from InkSightMVP.pagination import list_response
 
 """
 GET (Course) Methods
@@ -23,10 +26,10 @@ def get_courses(request):
     """
     Retrieve all courses.
     Fetches all courses in the database and returns them as a JSON response.
+    Pass ?limit= (and the returned ?cursor=) to page through the results.
     """
     courses = Course.objects.all()
-    serializer = CourseSerializer(courses, many=True)
-    return Response(serializer.data)
+    return list_response(request, courses, CourseValuesSerializer)
 
 @api_view(["GET"])
 def get_course(request, course_id):
@@ -49,10 +52,10 @@ def get_student_courses(request):
     """
     Retrieve all student-course relationships.
     Returns all records linking students to their courses.
+    Pass ?limit= (and the returned ?cursor=) to page through the results.
     """
     student_courses = StudentCourse.objects.all()
-    serializer = StudentCourseSerializer(student_courses, many=True)
-    return Response(serializer.data)
+    return list_response(request, student_courses, StudentCourseValuesSerializer)
 
 @api_view(["GET"])
 def get_student_course(request, student_id, course_id):
@@ -88,10 +91,10 @@ def get_professor_courses(request):
     """
     Retrieve all professor-course relationships.
     Returns all records linking professors to their courses.
+    Pass ?limit= (and the returned ?cursor=) to page through the results.
     """
     professor_courses = ProfessorCourse.objects.all()
-    serializer = ProfessorCourseSerializer(professor_courses, many=True)
-    return Response(serializer.data)
+    return list_response(request, professor_courses, ProfessorCourseValuesSerializer)
 
 @api_view(["GET"])
 def get_professor_course(request, professor_id, course_id):
@@ -120,7 +123,7 @@ def get_all_courses_for_student(request, student_id):
     student_courses = StudentCourse.objects.filter(student_id=student_id)
     course_ids = student_courses.values_list("course_id", flat=True).distinct()
     courses = Course.objects.filter(id__in=course_ids)
-    serializer = CourseSerializer(courses, many=True)
+    serializer = CourseValuesSerializer(courses, many=True)
     return Response(serializer.data)
 
 @api_view(["GET"])
@@ -135,7 +138,7 @@ def get_all_courses_for_professor(request, professor_id):
     professor_courses = ProfessorCourse.objects.filter(professor_id=professor_id)
     course_ids = professor_courses.values_list("course_id", flat=True).distinct()
     courses = Course.objects.filter(id__in=course_ids)
-    serializer = CourseSerializer(courses, many=True)
+    serializer = CourseValuesSerializer(courses, many=True)
     return Response(serializer.data)
 
 @api_view(["GET"])
@@ -187,25 +190,34 @@ def get_all_tas_for_courses(request, professor_id, course_id):
 def get_all_students_for_professor(request, professor_id):
     """
     Retrieve all students enrolled in a professor's courses.
+    Pass ?course_ids=1,2,3 to only include some of the professor's courses.
     Args:
         professor_id (int): The ID of the professor.
     Returns:
-        JSON response containing a dictionary with course names as keys and lists of students as values.
+        JSON response containing a dictionary with course IDs as keys and lists of students as values.
     """
-    professor_courses = ProfessorCourse.objects.filter(professor_id=professor_id)
-    course_ids = professor_courses.values_list("course_id", flat=True).distinct()
-    courses = Course.objects.filter(id__in=course_ids)
+    courses = Course.objects.filter(
+        id__in=ProfessorCourse.objects.filter(professor_id=professor_id).values("course_id")
+    )
 
-    course_students_dict = {}
+    course_ids = request.query_params.get("course_ids")
+    if course_ids:
+        try:
+            courses = courses.filter(id__in=[int(course_id) for course_id in course_ids.split(",")])
+        except ValueError:
+            return Response({"error": "course_ids must be a comma-separated list of integers"}, status=status.HTTP_400_BAD_REQUEST)
+
+    # One LEFT JOIN over courses -> enrollments -> students; courses without students still get a row
+    prefix = "studentcourse__student__"
+    rows = StudentValuesSerializer.values(courses, extra=["id"], prefix=prefix).order_by("id", prefix + "user_ptr_id")
+    serializer = StudentValuesSerializer(prefix=prefix)
 
-    for course in courses:
-        student_courses = StudentCourse.objects.filter(course_id = course.id)
-        student_ids = student_courses.values_list("student_id", flat=True).distinct()
-        students = Student.objects.filter(user_ptr_id__in = student_ids)
+    course_students_dict = {}
+    for row in rows:
+        students = course_students_dict.setdefault(row["id"], [])
+        if row[prefix + "user_ptr_id"] is not None:
+            students.append(serializer.to_representation(row))
 
-        serializer = StudentSerializer(students, many=True)
-        course_students_dict[course.id] = serializer.data
-    
     return Response(course_students_dict)
 
 @api_view(["GET"])
@@ -220,7 +232,7 @@ def get_all_students_for_professor_for_course(request, course_id):
     student_courses = StudentCourse.objects.filter(course_id = course_id)
     student_ids = student_courses.values_list("student_id", flat=True).distinct()
     students = Student.objects.filter(user_ptr_id__in = student_ids)
-    serializer = StudentSerializer(students, many=True)
+    serializer = StudentValuesSerializer(students, many=True)
     return Response(serializer.data)
 
 
@@ -234,7 +246,7 @@ def get_all_students_for_sds_coordinator(request, sds_coordinator_id):
         JSON response with student data or a 404 error if none found.
     """
     students = Student.objects.filter(sds_coordinator_id=sds_coordinator_id)
-    serializer = StudentSerializer(students, many=True)
+    serializer = StudentValuesSerializer(students, many=True)
     return Response(serializer.data)
 
 @api_view(["GET"])
@@ -0,0 +1,258 @@
+import json
+import re
+import shlex
+import statistics
+import time
+from datetime import datetime, timezone
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.urls.resolvers import RoutePattern
+from rest_framework.authtoken.models import Token
+
+from usermanagement.models import Student, Professor, SDSCoordinator, TeacherAssistant
+from schoolmanagement.models import School
+from coursemanagement.models import Course, StudentCourse, ProfessorCourse
+from lecturesessionsmanagement.models import LectureSession, RecordingSession, LectureSlides
+from notepacketsmanagement.models import NotesPacket, StudentNotePacket
+from notetakingrequestmanagement.models import NoteTakingRequest
+from permissionsmanagement.models import Permissions
+
+# Endpoints that call external services (Google, Stream) or need an admin user
+DEFAULT_EXCLUDES = [
+    "signup-redirect",
+    "login-redirect",
+    "signup/callback",
+    "login/callback",
+    "add_stream_permissions",
+    "get_instrumentation_summary",
+    "get_cache_stats",
+    "get_job_queue_stats",
+]
+
+# URL names whose `user_id` argument refers to a specific role
+USER_ID_ROLES = {
+    "get_professor": "professor_id",
+    "get_ta": "ta_id",
+    "get_sdscoordinator": "sds_coordinator_id",
+}
+
+ROUTE_ARGUMENT = re.compile(r"<(?:\w+:)?(\w+)>")
+
+
+def percentile(values, percent):
+    """Nearest-rank percentile of a non-empty sequence."""
+    ordered = sorted(values)
+    index = max(int(round(percent / 100 * len(ordered))) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def iter_get_routes(patterns, prefix=""):
+    """Yield (url name, route) for every GET view reachable from the given URL patterns."""
+    for pattern in patterns:
+        if not isinstance(pattern.pattern, RoutePattern):
+            continue
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from iter_get_routes(pattern.url_patterns, route)
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, "cls", None)
+            if view_class is not None and hasattr(view_class, "get"):
+                yield pattern.name or route, route
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every GET endpoint in InkSightMVP/urls.py through the Django test client. "
+        "Records p50/p95 latency, query counts and response sizes to a JSON file and optionally "
+        "compares the run against a stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed-data", default=None,
+                            help='Arguments passed to create_fake_data before benchmarking, e.g. "--students 100000".')
+        parser.add_argument("--iterations", type=int, default=20, help="Measured requests per endpoint.")
+        parser.add_argument("--warmup", type=int, default=2, help="Unmeasured requests per endpoint.")
+        parser.add_argument("--output", default="benchmark_results.json", help="Where to write the results.")
+        parser.add_argument("--baseline", default=None, help="Results file to compare this run against.")
+        parser.add_argument("--threshold", type=float, default=0.2,
+                            help="Allowed relative p95 slowdown before flagging a regression.")
+        parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                            help="Ignore p95 slowdowns smaller than this many milliseconds.")
+        parser.add_argument("--only", nargs="*", default=None, help="Only benchmark these URL names.")
+        parser.add_argument("--exclude", nargs="*", default=[], help="Additional URL names to skip.")
+        parser.add_argument("--fail-on-regression", action="store_true",
+                            help="Exit with an error if any regression is found.")
+
+    def handle(self, *args, **options):
+        if options["seed_data"] is not None:
+            call_command("create_fake_data", *shlex.split(options["seed_data"]), stdout=self.stdout)
+
+        sample_ids = self.sample_ids()
+        if sample_ids.get("student_id") is None:
+            raise CommandError("No students found. Seed a dataset first (see --seed-data).")
+
+        token, _ = Token.objects.get_or_create(user_id=sample_ids["student_id"])
+        client = Client(raise_request_exception=False, HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        excludes = set(DEFAULT_EXCLUDES) | set(options["exclude"])
+        results = {}
+        for name, route in iter_get_routes(get_resolver().url_patterns):
+            if name in excludes or (options["only"] is not None and name not in options["only"]):
+                continue
+            # URL names are only unique per app, so results are keyed by "<url prefix>:<name>"
+            key = f"{route.split('/')[0]}:{name}"
+            url = self.build_url(name, route, sample_ids)
+            if url is None:
+                self.stdout.write(self.style.WARNING(f"Skipping {key}: no sample data for {route}"))
+                continue
+            result = results[key] = self.measure(client, url, options["warmup"], options["iterations"])
+            self.stdout.write(
+                f"{key:<80} {result['p50_ms']:>9.2f}ms p50 {result['p95_ms']:>9.2f}ms p95 "
+                f"{result['queries']:>5} queries {result['response_bytes']:>10} bytes"
+            )
+
+        report = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "iterations": options["iterations"],
+            "dataset": self.dataset_size(),
+            "endpoints": results,
+        }
+        with open(options["output"], "w") as output:
+            json.dump(report, output, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        if options["baseline"]:
+            regressions = self.compare(report, options["baseline"], options["threshold"], options["min_delta_ms"])
+            if regressions and options["fail_on_regression"]:
+                raise CommandError(f"{len(regressions)} endpoint(s) regressed against {options['baseline']}.")
+
+    def sample_ids(self):
+        """
+        Pick realistic IDs for URL arguments, centered on the professor who teaches the most courses.
+        Returns:
+            dict: URL argument name -> ID (None when the dataset has no matching row).
+        """
+        busiest = (
+            ProfessorCourse.objects.values("professor_id")
+            .annotate(courses=Count("id"))
+            .order_by("-courses")
+            .first()
+        )
+        professor_id = busiest["professor_id"] if busiest else Professor.objects.values_list("pk", flat=True).first()
+        professor_course = ProfessorCourse.objects.filter(professor_id=professor_id).first()
+        course = Course.objects.filter(pk=professor_course.course_id).first() if professor_course else Course.objects.first()
+        student_course = StudentCourse.objects.filter(course=course).first() if course else None
+        lecture_session = LectureSession.objects.filter(course=course).first() if course else None
+
+        return {
+            "professor_id": professor_id,
+            "course_id": course.pk if course else None,
+            "school_id": course.school_id if course else School.objects.values_list("pk", flat=True).first(),
+            "sds_coordinator_id": course.sds_coordinator_id if course else SDSCoordinator.objects.values_list("pk", flat=True).first(),
+            "student_id": student_course.student_id if student_course else Student.objects.values_list("pk", flat=True).first(),
+            "studentcourse_id": student_course.pk if student_course else None,
+            "ta_id": TeacherAssistant.objects.values_list("pk", flat=True).first(),
+            "lecture_session_id": lecture_session.pk if lecture_session else LectureSession.objects.values_list("pk", flat=True).first(),
+            "recording_session_id": RecordingSession.objects.values_list("pk", flat=True).first(),
+            "slides_id": LectureSlides.objects.values_list("pk", flat=True).first(),
+            "note_packet_id": NotesPacket.objects.values_list("pk", flat=True).first(),
+            "student_note_packet_id": StudentNotePacket.objects.values_list("pk", flat=True).first(),
+            "note_taking_request_id": NoteTakingRequest.objects.values_list("pk", flat=True).first(),
+            "permission_id": Permissions.objects.values_list("pk", flat=True).first(),
+        }
+
+    def build_url(self, name, route, sample_ids):
+        """Fill the route's arguments with sample IDs, or return None if one is missing."""
+        values = {}
+        for argument in ROUTE_ARGUMENT.findall(route):
+            if argument == "user_id":
+                key = USER_ID_ROLES.get(name, "student_id")
+            elif argument == "notetaking_request_id":
+                key = "note_taking_request_id"
+            else:
+                key = argument
+            if sample_ids.get(key) is None:
+                return None
+            values[argument] = sample_ids[key]
+        return "/" + ROUTE_ARGUMENT.sub(lambda match: str(values[match.group(1)]), route)
+
+    def measure(self, client, url, warmup, iterations):
+        """Request `url` repeatedly and summarize latency, query count and response size."""
+        for _ in range(warmup):
+            self.read_body(client.get(url))
+
+        timings, queries = [], []
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = client.get(url)
+                body = self.read_body(response)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(captured.captured_queries))
+
+        return {
+            "url": url,
+            "status": response.status_code,
+            "p50_ms": round(percentile(timings, 50), 3),
+            "p95_ms": round(percentile(timings, 95), 3),
+            "mean_ms": round(statistics.fmean(timings), 3),
+            "queries": max(queries),
+            "response_bytes": len(body),
+        }
+
+    def read_body(self, response):
+        if response.streaming:
+            return b"".join(response.streaming_content)
+        return response.content
+
+    def dataset_size(self):
+        """Row counts of the main tables, so results can be matched to the dataset they ran on."""
+        models = [School, Student, Professor, Course, StudentCourse, ProfessorCourse,
+                  LectureSession, NotesPacket, NoteTakingRequest, Permissions]
+        return {model._meta.label: model.objects.count() for model in models}
+
+    def compare(self, report, baseline_path, threshold, min_delta_ms):
+        """
+        Compare this run against a baseline results file and print the differences.
+        Returns:
+            list: Names of endpoints whose p95 latency or query count regressed.
+        """
+        try:
+            with open(baseline_path) as baseline_file:
+                baseline = json.load(baseline_file)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read baseline {baseline_path}: {e}")
+
+        if baseline.get("dataset") != report["dataset"]:
+            self.stdout.write(self.style.WARNING("Baseline was recorded on a different dataset size."))
+
+        regressions = []
+        self.stdout.write(f"\nComparison against {baseline_path}:")
+        for name, current in report["endpoints"].items():
+            previous = baseline.get("endpoints", {}).get(name)
+            if previous is None:
+                self.stdout.write(f"  {name}: new endpoint")
+                continue
+
+            delta_ms = current["p95_ms"] - previous["p95_ms"]
+            slower = delta_ms > min_delta_ms and current["p95_ms"] > previous["p95_ms"] * (1 + threshold)
+            more_queries = current["queries"] > previous["queries"]
+            line = (
+                f"  {name}: p95 {previous['p95_ms']:.2f} -> {current['p95_ms']:.2f}ms, "
+                f"queries {previous['queries']} -> {current['queries']}, "
+                f"bytes {previous['response_bytes']} -> {current['response_bytes']}"
+            )
+            if slower or more_queries:
+                regressions.append(name)
+                self.stdout.write(self.style.ERROR(line + "  REGRESSION"))
+            elif delta_ms < -min_delta_ms or current["queries"] < previous["queries"]:
+                self.stdout.write(self.style.SUCCESS(line + "  improved"))
+            else:
+                self.stdout.write(line)
+        return regressions
@@ -1,113 +1,320 @@
-import os
-import django
+import csv
+import io
 import random
-from django.core.management.base import BaseCommand
+import uuid
+from datetime import datetime, time, timedelta, timezone
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
 from faker import Faker
 
-from usermanagement.models import Student, Professor, SDSCoordinator, TeacherAssistant
+from usermanagement.models import User, Student, Professor, SDSCoordinator, TeacherAssistant
 from schoolmanagement.models import School
 from coursemanagement.models import Course, StudentCourse, ProfessorCourse
+from lecturesessionsmanagement.models import LectureSession
+from notepacketsmanagement.models import NotesPacket
+from notetakingrequestmanagement.models import NoteTakingRequest
 
 fake = Faker()
 
+DISABILITIES = ["Hearing Impaired", "Vision Impaired", "Dyslexia", "ADHD", "Mobility Impaired"]
+TERMS = ["Fall 2024", "Spring 2025", "Fall 2025"]
+CAMPUSES = ["Main", "North", "Downtown"]
+COURSE_TYPES = ["Lecture", "Seminar", "Lab"]
+PACKET_STATUSES = ["draft", "edits", "approved", "published"]
+
+# Faker is slow at millions of rows, so names and text are drawn from pre-generated pools
+NAME_POOL_SIZE = 2000
+TEXT_POOL_SIZE = 200
+
+
+def chunked(iterable, size):
+    """Yield lists of at most `size` items from any iterable."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
 class Command(BaseCommand):
-    help = "Generate fake data for schools, students, professors, SDS coordinators, TAs, and courses."
+    help = (
+        "Generate fake data for schools, users, courses, enrollments, lecture sessions, notes packets "
+        "and notetaking requests. Rows are written in bulk batches so university-scale datasets "
+        "(millions of rows) can be generated locally."
+    )
 
-    def handle(self, *args, **kwargs):
-        self.create_fake_data()
+    def add_arguments(self, parser):
+        parser.add_argument("--schools", type=int, default=1, help="Number of schools to create.")
+        parser.add_argument("--sds-coordinators", type=int, default=5, help="Number of SDS coordinators.")
+        parser.add_argument("--professors", type=int, default=10, help="Number of professors.")
+        parser.add_argument("--tas", type=int, default=10, help="Number of teacher assistants.")
+        parser.add_argument("--students", type=int, default=50, help="Number of students.")
+        parser.add_argument("--courses", type=int, default=20, help="Number of courses.")
+        parser.add_argument("--courses-per-student", type=int, default=3,
+                            help="Each student is enrolled in 1 to N courses.")
+        parser.add_argument("--courses-per-professor", type=int, default=3,
+                            help="Each professor teaches 1 to N courses.")
+        parser.add_argument("--lectures-per-course", type=int, default=0,
+                            help="Number of lecture sessions created for every course.")
+        parser.add_argument("--notes-packets-per-lecture", type=int, default=0,
+                            help="Number of notes packets created for every lecture session.")
+        parser.add_argument("--request-ratio", type=float, default=0.0,
+                            help="Fraction (0-1) of enrollments that get a notetaking request.")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows written per bulk insert.")
+        parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible datasets.")
 
-    def create_fake_school(self, num_schools=1):
-        """Create fake schools."""
-        schools = []
-        for _ in range(num_schools):
-            school = School.objects.create(
-                name=f"{fake.company()} University",
-                
+    def handle(self, *args, **options):
+        if options["schools"] < 1 or options["sds_coordinators"] < 1 or options["courses"] < 1:
+            raise CommandError("At least one school, SDS coordinator and course are required.")
+        if options["professors"] < 1 and options["tas"] > 0:
+            raise CommandError("Teacher assistants need at least one professor.")
+        if not 0 <= options["request_ratio"] <= 1:
+            raise CommandError("--request-ratio must be between 0 and 1.")
+
+        if options["seed"] is not None:
+            random.seed(options["seed"])
+            Faker.seed(options["seed"])
+
+        self.batch_size = options["batch_size"]
+        self.tag = uuid.uuid4().hex[:8]
+        self.password = make_password(None)
+        self.names = [fake.name() for _ in range(NAME_POOL_SIZE)]
+        self.paragraphs = [fake.paragraph(nb_sentences=5) for _ in range(TEXT_POOL_SIZE)]
+
+        self.create_fake_data(options)
+
+    def log(self, message):
+        self.stdout.write(message)
+        self.stdout.flush()
+
+    # Bulk Insert Helpers
+    # 1. Model rows are written with bulk_create in batches, one transaction per batch
+    # 2. Multi-table-inheritance users are split: the User row is bulk created, then the role
+    #    table rows are written with COPY (bulk_create cannot insert inherited models)
+
+    def insert_batches(self, model, objects, label):
+        """Bulk create `objects` in batches, yielding each created batch (with primary keys set)."""
+        total = 0
+        for batch in chunked(objects, self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            total += len(batch)
+            self.log(f"  {label}: {total}")
+            yield batch
+
+    def insert_all(self, model, objects, label):
+        """Bulk create `objects` and return the primary keys of the created rows."""
+        return [obj.pk for batch in self.insert_batches(model, objects, label) for obj in batch]
+
+    def copy_rows(self, model, fields, rows):
+        """Write raw rows into the model's own table using COPY (PostgreSQL) or executemany."""
+        table = connection.ops.quote_name(model._meta.db_table)
+        columns = ", ".join(connection.ops.quote_name(model._meta.get_field(f).column) for f in fields)
+
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(rows)
+                buffer.seek(0)
+                cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+            else:
+                placeholders = ", ".join(["%s"] * len(fields))
+                cursor.executemany(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", rows)
+
+    def create_users(self, model, count, school_ids, role_fields, child_row):
+        """
+        Create `count` users of a multi-table-inheritance role model.
+        Args:
+            model: Student, Professor, TeacherAssistant or SDSCoordinator.
+            role_fields (list): The role table fields written by `child_row` (after user_ptr).
+            child_row (callable): Takes (index, user_id) and returns the role table values.
+        Returns:
+            list: IDs of the created users.
+        """
+        role = model._meta.model_name
+        user_ids = []
+        users = (
+            User(
+                email=f"{role}.{index}.{self.tag}@example.edu",
+                name=random.choice(self.names),
+                school_id=random.choice(school_ids),
+                password=self.password,
+                # Set by User.save for single users; bulk_create skips save
+                role=model.ROLE,
             )
-            schools.append(school)
-        return schools
+            for index in range(count)
+        )
+        for batch in chunked(users, self.batch_size):
+            offset = len(user_ids)
+            with transaction.atomic():
+                User.objects.bulk_create(batch)
+                batch_ids = [user.pk for user in batch]
+                self.copy_rows(
+                    model,
+                    ["user_ptr"] + role_fields,
+                    [[user_id, *child_row(offset + i, user_id)] for i, user_id in enumerate(batch_ids)],
+                )
+            user_ids.extend(batch_ids)
+            self.log(f"  {model._meta.verbose_name_plural}: {len(user_ids)}")
+        return user_ids
+
+    # Fake Data Generators
+    # Each generator creates one kind of row and returns the IDs needed by the next step
 
-    def create_fake_professors(self, schools, num_professors=10):
+    def create_fake_schools(self, num_schools):
+        """Create fake schools."""
+        schools = (School(name=f"{fake.company()} University") for _ in range(num_schools))
+        return self.insert_all(School, schools, "schools")
+
+    def create_fake_sds_coordinators(self, school_ids, num_sds):
+        """Create fake SDS coordinators with unique access codes."""
+        taken = set(SDSCoordinator.objects.values_list("access_code", flat=True))
+        codes = []
+        while len(codes) < num_sds:
+            code = SDSCoordinator.generate_access_code()
+            if code not in taken:
+                taken.add(code)
+                codes.append(code)
+
+        return self.create_users(
+            SDSCoordinator, num_sds, school_ids, ["position", "access_code"],
+            lambda index, user_id: ["SDS Coordinator", codes[index]],
+        )
+
+    def create_fake_professors(self, school_ids, num_professors):
         """Create fake professors associated with schools."""
-        professors = []
-        for _ in range(num_professors):
-            professor = Professor.objects.create(
-                name=fake.name(),
-                school=random.choice(schools),
-                title="Dr."
+        return self.create_users(
+            Professor, num_professors, school_ids, ["title"],
+            lambda index, user_id: ["Dr."],
+        )
+
+    def create_fake_students(self, school_ids, sds_ids, num_students):
+        """Create fake students, returning their IDs and the SDS coordinator of each student."""
+        coordinators = {}
+
+        def student_row(index, user_id):
+            disability = random.choice(DISABILITIES)
+            coordinators[user_id] = random.choice(sds_ids)
+            request = f"I need notetaking accommodations for my classes because of my {disability}"
+            return [random.randint(1, 4), disability, coordinators[user_id], request]
+
+        student_ids = self.create_users(
+            Student, num_students, school_ids,
+            ["year", "disability", "sds_coordinator", "accodomation_request"], student_row,
+        )
+        return student_ids, coordinators
+
+    def create_fake_tas(self, school_ids, professor_course_ids, num_tas):
+        """Create fake TAs assigned to professor courses."""
+        return self.create_users(
+            TeacherAssistant, num_tas, school_ids, ["assigned_professor_course"],
+            lambda index, user_id: [random.choice(professor_course_ids)],
+        )
+
+    def create_fake_courses(self, school_ids, sds_ids, num_courses):
+        """Create fake courses with assigned SDS coordinators."""
+        first_uid = (Course.objects.aggregate(last=Max("course_uid"))["last"] or 0) + 1
+        courses = (
+            Course(
+                name=f"{fake.word().capitalize()} {first_uid + index}",
+                school_id=random.choice(school_ids),
+                sds_coordinator_id=random.choice(sds_ids),
+                term=random.choice(TERMS),
+                course_uid=first_uid + index,
+                type=random.choice(COURSE_TYPES),
+                meeting_time=time(hour=random.randint(8, 19), minute=random.choice([0, 30])),
+                campus=random.choice(CAMPUSES),
             )
-            professors.append(professor)
-        return professors
-
-    def create_fake_sds_coordinators(self, schools, num_sds=5):
-        """Create fake SDS coordinators associated with schools."""
-        sds_coordinators = []
-        for _ in range(num_sds):
-            sds_coordinator = SDSCoordinator.objects.create(
-                name=fake.name(),
-                school=random.choice(schools),
-                position="SDS Coordinator"
+            for index in range(num_courses)
+        )
+        return self.insert_all(Course, courses, "courses")
+
+    def create_fake_professor_courses(self, professor_ids, course_ids, courses_per_professor):
+        """Assign every professor to 1 to N random courses."""
+        professor_courses = (
+            ProfessorCourse(professor_id=professor_id, course_id=course_id)
+            for professor_id in professor_ids
+            for course_id in random.sample(course_ids, k=random.randint(1, min(courses_per_professor, len(course_ids))))
+        )
+        return self.insert_all(ProfessorCourse, professor_courses, "professor courses")
+
+    def create_fake_enrollments(self, student_ids, coordinators, course_ids, courses_per_student, request_ratio):
+        """Enroll every student in 1 to N random courses and file notetaking requests for a fraction of them."""
+        enrollments = (
+            StudentCourse(student_id=student_id, course_id=course_id)
+            for student_id in student_ids
+            for course_id in random.sample(course_ids, k=random.randint(1, min(courses_per_student, len(course_ids))))
+        )
+        requests = (
+            NoteTakingRequest(
+                request=random.choice(self.paragraphs),
+                student_course_id=student_course.pk,
+                sdscoordinator_id=coordinators[student_course.student_id],
+                approved=random.random() < 0.5,
             )
-            sds_coordinators.append(sds_coordinator)
-        return sds_coordinators
-
-    def create_fake_tas(self, schools, professors, num_tas=10):
-        """Create fake TAs assigned to professors in schools."""
-        tas = []
-        for _ in range(num_tas):
-            ta = TeacherAssistant.objects.create(
-                name=fake.name(),
-                school=random.choice(schools),
-                professor=random.choice(professors)
+            for batch in self.insert_batches(StudentCourse, enrollments, "enrollments")
+            for student_course in batch
+            if random.random() < request_ratio
+        )
+        for _ in self.insert_batches(NoteTakingRequest, requests, "notetaking requests"):
+            pass
+
+    def create_fake_lectures(self, course_ids, lectures_per_course, packets_per_lecture):
+        """Create weekly lecture sessions for every course, each with its notes packets."""
+        if lectures_per_course < 1:
+            return
+        term_start = datetime(2024, 8, 26, 9, 0, tzinfo=timezone.utc)
+        lectures = (
+            LectureSession(
+                title=f"Lecture {week + 1}",
+                date=term_start + timedelta(weeks=week, hours=random.randint(0, 8)),
+                course_id=course_id,
+                status="recording" if week == lectures_per_course - 1 and random.random() < 0.2 else "completed",
+                call_id=f"{random.randint(0, 999999):06d}",
             )
-            tas.append(ta)
-        return tas
-
-    def create_fake_students(self, schools, sds_coordinators, num_students=50):
-        """Create fake students associated with schools."""
-        students = []
-        for _ in range(num_students):
-            student = Student.objects.create(
-                name=fake.name(),
-                school=random.choice(schools),
-                year=random.randint(1, 4),
-                disability=random.choice(["Hearing Impaired", "Vision Impaired", "Dyslexia"]),
-                sds_coordinator = random.choice(sds_coordinators)
+            for course_id in course_ids
+            for week in range(lectures_per_course)
+        )
+        packets = (
+            NotesPacket(
+                notes={"content": random.choice(self.paragraphs)},
+                course_id=lecture.course_id,
+                lecture_session_id=lecture.pk,
+                status=random.choice(PACKET_STATUSES),
             )
-            students.append(student)
-        return students
+            for batch in self.insert_batches(LectureSession, lectures, "lecture sessions")
+            for lecture in batch
+            for _ in range(packets_per_lecture)
+        )
+        for _ in self.insert_batches(NotesPacket, packets, "notes packets"):
+            pass
 
-    def create_fake_courses(self, schools, sds_coordinators, num_courses=20):
-        """Create fake courses with assigned SDS coordinators."""
-        courses = []
-        for _ in range(num_courses):
-            course = Course.objects.create(
-                name=f"{fake.word().capitalize()} 101",
-                school=random.choice(schools),
-                sds_coordinator=random.choice(sds_coordinators)
-            )
-            courses.append(course)
-        return courses
-
-    def create_fake_data(self):
-        """Combine Functions to Create Full Fake Dataaset"""
-        schools = self.create_fake_school()
-
-        # Create professors, SDS coordinators, TAs, and students
-        professors = self.create_fake_professors(schools)
-        sds_coordinators = self.create_fake_sds_coordinators(schools)
-        tas = self.create_fake_tas(schools, professors)
-        students = self.create_fake_students(schools, sds_coordinators)
-
-        # Create courses and associate with students
-        courses = self.create_fake_courses(schools, sds_coordinators)
-        for student in students:
-            student_courses = random.sample(courses, k=random.randint(1, 3))
-            for course in student_courses:
-                StudentCourse.objects.create(student=student, course=course)
-        for professor in professors:
-            professor_courses = random.sample(courses, k=random.randint(1, 3))
-            for course in professor_courses:
-                ProfessorCourse.objects.create(professor=professor, course=course)
+    def create_fake_data(self, options):
+        """Combine Functions to Create Full Fake Dataset"""
+        school_ids = self.create_fake_schools(options["schools"])
+
+        # Create SDS coordinators, professors and students
+        sds_ids = self.create_fake_sds_coordinators(school_ids, options["sds_coordinators"])
+        professor_ids = self.create_fake_professors(school_ids, options["professors"])
+        student_ids, coordinators = self.create_fake_students(school_ids, sds_ids, options["students"])
+
+        # Create courses and associate them with professors, TAs and students
+        course_ids = self.create_fake_courses(school_ids, sds_ids, options["courses"])
+        professor_course_ids = self.create_fake_professor_courses(
+            professor_ids, course_ids, options["courses_per_professor"]
+        )
+        if options["tas"]:
+            self.create_fake_tas(school_ids, professor_course_ids, options["tas"])
+        self.create_fake_enrollments(
+            student_ids, coordinators, course_ids, options["courses_per_student"], options["request_ratio"]
+        )
+
+        # Create lecture sessions and their notes packets
+        self.create_fake_lectures(course_ids, options["lectures_per_course"], options["notes_packets_per_lecture"])
 
         self.stdout.write(self.style.SUCCESS("Fake data created successfully!"))
@@ -0,0 +1,98 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from coursemanagement.models import StudentCourse, ProfessorCourse
+from lecturesessionsmanagement.models import LectureSession
+from notepacketsmanagement.models import NotesPacket
+from notetakingrequestmanagement.models import NoteTakingRequest
+from permissionsmanagement.models import Permissions
+
+INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+# Below this many rows the planner rightly prefers a sequential scan, so results are only indicative
+MIN_ROWS = 10000
+
+
+def iter_plan_nodes(node):
+    """Yield every node of a JSON EXPLAIN plan."""
+    yield node
+    for child in node.get("Plans", []):
+        yield from iter_plan_nodes(child)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on the hot lookup queries of the API and check that each one is answered "
+        "with an index scan. Run it against a large seeded dataset (see create_fake_data)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--skip-analyze", action="store_true",
+                            help="Do not refresh planner statistics with ANALYZE first.")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print the full plan of every query.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("explain_hot_queries needs PostgreSQL.")
+
+        queries = self.hot_queries()
+        if not options["skip_analyze"]:
+            with connection.cursor() as cursor:
+                for model in {queryset.model for queryset in queries.values()}:
+                    cursor.execute(f'ANALYZE "{model._meta.db_table}"')
+
+        failures = []
+        for name, queryset in queries.items():
+            rows = queryset.model.objects.count()
+            plan = json.loads(queryset.explain(format="json"))[0]["Plan"]
+            nodes = list(iter_plan_nodes(plan))
+            indexes = sorted({node["Index Name"] for node in nodes if node["Node Type"] in INDEX_SCANS})
+            table = queryset.model._meta.db_table
+            seq_scan = any(node["Node Type"] == "Seq Scan" and node.get("Relation Name") == table for node in nodes)
+
+            line = f"{name:<45} {rows:>9} rows  {', '.join(indexes) or 'no index'}"
+            if indexes and not seq_scan:
+                self.stdout.write(self.style.SUCCESS(line))
+            elif rows < MIN_ROWS:
+                self.stdout.write(self.style.WARNING(line + "  (table too small to judge)"))
+            else:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(line + "  SEQUENTIAL SCAN"))
+            if options["verbose_plans"]:
+                self.stdout.write(queryset.explain())
+
+        if failures:
+            raise CommandError(f"{len(failures)} hot query(s) do not use an index: {', '.join(failures)}")
+
+    def hot_queries(self):
+        """
+        Build the hot lookup queries with IDs taken from existing rows.
+        Returns:
+            dict: description -> queryset, as the API views issue them.
+        """
+        student_course = StudentCourse.objects.order_by("-id").first()
+        professor_course = ProfessorCourse.objects.order_by("-id").first()
+        lecture_session = LectureSession.objects.order_by("-id").first()
+        notes_packet = NotesPacket.objects.order_by("-id").first()
+        permission = Permissions.objects.order_by("-id").first()
+        if None in (student_course, professor_course, lecture_session, notes_packet):
+            raise CommandError("No data to explain. Seed a dataset first with create_fake_data.")
+
+        user_id = (permission and permission.user_id) or student_course.student_id
+
+        return {
+            "StudentCourse by student and course": StudentCourse.objects.filter(
+                student_id=student_course.student_id, course_id=student_course.course_id),
+            "StudentCourse by student": StudentCourse.objects.filter(student_id=student_course.student_id),
+            "ProfessorCourse by professor and course": ProfessorCourse.objects.filter(
+                professor_id=professor_course.professor_id, course_id=professor_course.course_id),
+            "Current lecture session for course": LectureSession.objects.filter(
+                course_id=lecture_session.course_id, status="recording").order_by("-date")[:1],
+            "Published notes packets for course": NotesPacket.objects.filter(
+                course_id=notes_packet.course_id, status="published"),
+            "Approved requests for student course": NoteTakingRequest.objects.filter(
+                student_course_id=student_course.id, approved=True),
+            "Permissions for user": Permissions.objects.filter(user_id=user_id),
+        }
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.3 on 2026-10-18 11:57
+
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def merge_duplicate_student_courses(apps, schema_editor):
+    """Keep the oldest row per (student, course) and repoint notetaking requests at it before adding the constraint."""
+    StudentCourse = apps.get_model('coursemanagement', 'StudentCourse')
+    NoteTakingRequest = apps.get_model('notetakingrequestmanagement', 'NoteTakingRequest')
+
+    duplicates = (
+        StudentCourse.objects.values('student_id', 'course_id')
+        .annotate(keep_id=Min('id'), rows=Count('id'))
+        .filter(rows__gt=1)
+    )
+    for duplicate in duplicates.iterator():
+        extra = StudentCourse.objects.filter(
+            student_id=duplicate['student_id'], course_id=duplicate['course_id']
+        ).exclude(id=duplicate['keep_id'])
+        NoteTakingRequest.objects.filter(student_course__in=extra).update(student_course_id=duplicate['keep_id'])
+        extra.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coursemanagement', '0002_course_type'),
+        ('notetakingrequestmanagement', '0001_initial'),
+        ('usermanagement', '0004_rename_assigned_professor_teacherassistant_assigned_professor_course_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_student_courses, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.3 on 2026-10-18 11:57
+
+from django.db import migrations, models
+
+from InkSightMVP.migration_operations import AddIndexConcurrently, AddUniqueConstraintConcurrently
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without blocking writes to the table
+    atomic = False
+
+    dependencies = [
+        ('coursemanagement', '0003_merge_duplicate_student_courses'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='professorcourse',
+            index=models.Index(fields=['professor', 'course'], name='professorcourse_prof_crs_idx'),
+        ),
+        AddUniqueConstraintConcurrently(
+            model_name='studentcourse',
+            constraint=models.UniqueConstraint(fields=('student', 'course'), name='unique_student_course'),
+        ),
+    ]
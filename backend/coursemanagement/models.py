@@ -22,7 +22,12 @@ class StudentCourse(models.Model):
     id = models.AutoField(primary_key=True)
     student = models.ForeignKey(Student, on_delete=models.CASCADE)
     course = models.ForeignKey(Course, on_delete=models.CASCADE)
-    
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["student", "course"], name="unique_student_course"),
+        ]
+
     def __str__(self):
         return f"Student: {self.student.id}, Course: {self.course.id}"
 
@@ -31,6 +36,11 @@ class ProfessorCourse(models.Model):
     id = models.AutoField(primary_key=True)
     professor = models.ForeignKey(Professor, on_delete=models.CASCADE)
     course = models.ForeignKey(Course, on_delete=models.CASCADE)
-    
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["professor", "course"], name="professorcourse_prof_crs_idx"),
+        ]
+
     def __str__(self):
         return f"Professor: {self.professor.id}, Course: {self.course.id}"
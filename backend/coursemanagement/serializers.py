@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from InkSightMVP.values_serializers import ValuesSerializer
 from .models import Course, StudentCourse, ProfessorCourse
 
 class CourseSerializer(serializers.ModelSerializer):
@@ -14,4 +15,22 @@ class StudentCourseSerializer(serializers.ModelSerializer):
 class ProfessorCourseSerializer(serializers.ModelSerializer):
     class Meta:
         model = ProfessorCourse
-        fields = ['id', 'professor_id', 'course_id']
\ No newline at end of file
+        fields = ['id', 'professor_id', 'course_id']
+
+class CourseValuesSerializer(ValuesSerializer):
+    """Read-only CourseSerializer for list endpoints, built from .values() rows"""
+    class Meta:
+        model = Course
+        fields = CourseSerializer.Meta.fields
+
+class StudentCourseValuesSerializer(ValuesSerializer):
+    """Read-only StudentCourseSerializer for list endpoints, built from .values() rows"""
+    class Meta:
+        model = StudentCourse
+        fields = StudentCourseSerializer.Meta.fields
+
+class ProfessorCourseValuesSerializer(ValuesSerializer):
+    """Read-only ProfessorCourseSerializer for list endpoints, built from .values() rows"""
+    class Meta:
+        model = ProfessorCourse
+        fields = ProfessorCourseSerializer.Meta.fields
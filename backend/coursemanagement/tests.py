@@ -1,3 +1,97 @@
+import json
+from datetime import time
+
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from InkSightMVP.values_serializer_assertions import ValuesSerializerAssertionsMixin
+from schoolmanagement.models import School
+from usermanagement.models import Student, Professor, SDSCoordinator
+from usermanagement.serializers import StudentSerializer
+from .models import Course, StudentCourse, ProfessorCourse
+from .serializers import (
+    CourseSerializer, StudentCourseSerializer, ProfessorCourseSerializer,
+    CourseValuesSerializer, StudentCourseValuesSerializer, ProfessorCourseValuesSerializer,
+)
+
+
+class ValuesSerializerEquivalenceTests(ValuesSerializerAssertionsMixin, TestCase):
+    """The .values() serializers must produce exactly the same JSON as the ModelSerializers"""
+
+    @classmethod
+    def setUpTestData(cls):
+        school = School.objects.create(name="Test University")
+        coordinator = SDSCoordinator.objects.create(email="sds@test.edu", name="SDS", school=school, position="Lead")
+        cls.professor = Professor.objects.create(email="prof@test.edu", name="Prof", school=school, title="Dr.")
+        student = Student.objects.create(email="student@test.edu", name="Student", school=school, year=2,
+                                         disability="ADHD", sds_coordinator=coordinator)
+        for index in range(3):
+            course = Course.objects.create(name=f"Course {index}", school=school, sds_coordinator=coordinator,
+                                           term="Fall", course_uid=1000 + index, meeting_time=time(9, 30, 15, 250),
+                                           campus="Main")
+            StudentCourse.objects.create(student=student, course=course)
+            ProfessorCourse.objects.create(professor=cls.professor, course=course)
+
+    def test_course_serializers_match(self):
+        self.assertSameOutput(CourseSerializer, CourseValuesSerializer, Course.objects.all())
+
+    def test_student_course_serializers_match(self):
+        self.assertSameOutput(StudentCourseSerializer, StudentCourseValuesSerializer, StudentCourse.objects.all())
+
+    def test_professor_course_serializers_match(self):
+        self.assertSameOutput(ProfessorCourseSerializer, ProfessorCourseValuesSerializer, ProfessorCourse.objects.all())
+
+    def test_list_endpoint_matches_in_every_mode(self):
+        client = APIClient()
+        client.force_authenticate(self.professor)
+        expected = json.loads(json.dumps(CourseSerializer(Course.objects.order_by("pk"), many=True).data))
+
+        self.assertEqual(client.get("/coursemanagement/courses/").json(), expected)
+        self.assertEqual(client.get("/coursemanagement/courses/?limit=2").json()["results"], expected[:2])
+        streamed = client.get("/coursemanagement/courses/?stream=1")
+        self.assertEqual(json.loads(b"".join(streamed.streaming_content)), expected)
+
+
+class ProfessorRosterTests(TestCase):
+    """get_all_students_for_professor must use one query however many courses the professor teaches"""
+
+    @classmethod
+    def setUpTestData(cls):
+        school = School.objects.create(name="Test University")
+        coordinator = SDSCoordinator.objects.create(email="sds@test.edu", name="SDS", school=school, position="Lead")
+        cls.professor = Professor.objects.create(email="prof@test.edu", name="Prof", school=school, title="Dr.")
+        cls.courses = []
+        for index in range(4):
+            course = Course.objects.create(name=f"Course {index}", school=school, sds_coordinator=coordinator,
+                                           term="Fall", course_uid=2000 + index, meeting_time=time(9, 30), campus="Main")
+            ProfessorCourse.objects.create(professor=cls.professor, course=course)
+            cls.courses.append(course)
+        # The last course has no students and must still be listed
+        for index in range(6):
+            student = Student.objects.create(email=f"student{index}@test.edu", name=f"Student {index}", school=school,
+                                             year=1, disability="ADHD", sds_coordinator=coordinator)
+            StudentCourse.objects.create(student=student, course=cls.courses[index % 3])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.professor)
+        self.url = f"/coursemanagement/professors/{self.professor.pk}/students/"
+
+    def test_roster_matches_per_course_serialization(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        expected = {}
+        for course in self.courses:
+            students = Student.objects.filter(studentcourse__course=course).order_by("pk")
+            expected[str(course.pk)] = json.loads(json.dumps(StudentSerializer(students, many=True).data))
+        self.assertEqual(response.json(), expected)
+
+    def test_course_ids_filter(self):
+        selected = [self.courses[0].pk, self.courses[3].pk]
+        response = self.client.get(self.url, {"course_ids": ",".join(map(str, selected))})
+        self.assertEqual(sorted(map(int, response.json())), selected)
 
-# Create your tests here.
+    def test_invalid_course_ids(self):
+        response = self.client.get(self.url, {"course_ids": "1,abc"})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,250 @@
+import logging
+import os
+import random
+import socket
+import threading
+import traceback
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import Job
+
+"""
+Job Queue
+Background work is stored as Job rows in the application database, so no broker is needed:
+1. Tasks are plain functions registered with @task("name") in an app's tasks.py.
+2. enqueue("name", **kwargs) inserts a Job in the caller's transaction: the job only becomes
+   visible to workers if that transaction commits, and always sees the rows it created.
+3. Workers (manage.py run_job_worker) claim the highest-priority due job with
+   SELECT ... FOR UPDATE SKIP LOCKED, so any number of workers can poll without blocking each other.
+4. A failed job is retried with exponential backoff until it runs out of attempts. A job whose worker
+   stopped heartbeating (crashed, killed) is requeued once its lease expires.
+Jobs can run more than once (after a crash, or a retry following a partial failure), so tasks must be
+safe to re-run. Task arguments are stored as JSON: pass IDs, not model instances.
+"""
+
+logger = logging.getLogger(__name__)
+
+RegisteredTask = namedtuple("RegisteredTask", ["func", "queue", "priority", "max_attempts"])
+
+_tasks = {}
+
+
+class UnknownTask(LookupError):
+    pass
+
+
+def task(name, *, queue="default", priority=0, max_attempts=None):
+    """
+    Register a function as a task that can be enqueued by name.
+    Args:
+        name (str): The name jobs refer to the task by; keep it stable, since queued jobs store it.
+        queue (str): The default queue for its jobs.
+        priority (int): The default priority for its jobs (higher runs first).
+        max_attempts (int): Attempts before a job is marked failed (default: JOB_MAX_ATTEMPTS).
+    """
+    def register(func):
+        _tasks[name] = RegisteredTask(func, queue, priority, max_attempts)
+        return func
+    return register
+
+
+def enqueue(task_name, *, queue=None, priority=None, delay=None, max_attempts=None, **kwargs):
+    """
+    Queue a job. Runs in the caller's transaction, so the job is dropped if the transaction rolls back.
+    Args:
+        task_name (str): A name registered with @task.
+        queue, priority, max_attempts: Override the task's defaults.
+        delay (timedelta): Do not run the job before this much time has passed.
+        **kwargs: JSON-serializable keyword arguments for the task.
+    Returns:
+        Job: The queued job.
+    Raises:
+        UnknownTask
+    """
+    registered = _tasks.get(task_name)
+    if registered is None:
+        raise UnknownTask(f"No task is registered as {task_name!r}")
+    return Job.objects.create(
+        task=task_name,
+        kwargs=kwargs,
+        queue=queue or registered.queue,
+        priority=registered.priority if priority is None else priority,
+        max_attempts=max_attempts or registered.max_attempts or settings.JOB_MAX_ATTEMPTS,
+        run_at=timezone.now() + (delay or timedelta()),
+    )
+
+
+def retry_delay(attempts):
+    """Seconds to wait before the next attempt: exponential backoff with jitter, so retries spread out."""
+    delay = min(settings.JOB_RETRY_MAX_DELAY, settings.JOB_RETRY_BASE_DELAY * 2 ** (attempts - 1))
+    return random.uniform(delay / 2, delay)
+
+
+def claim_job(worker_name, queues=None):
+    """
+    Claim the highest-priority job that is due, skipping jobs other workers have locked.
+    Returns:
+        Job: The claimed job, now "running", or None if nothing is due.
+    """
+    with transaction.atomic():
+        jobs = Job.objects.select_for_update(skip_locked=True).filter(status="queued", run_at__lte=timezone.now())
+        if queues:
+            jobs = jobs.filter(queue__in=queues)
+        job = jobs.order_by("-priority", "run_at", "id").first()
+        if job is None:
+            return None
+        now = timezone.now()
+        job.status = "running"
+        job.attempts += 1
+        job.started_at = now
+        job.locked_by = worker_name
+        job.locked_at = now
+        job.save(update_fields=["status", "attempts", "started_at", "locked_by", "locked_at"])
+    return job
+
+
+def _owned(job):
+    # A worker only finishes jobs it still holds: an expired lease may have handed the job to another worker
+    return Job.objects.filter(pk=job.pk, status="running", locked_by=job.locked_by)
+
+
+def run_job(job):
+    """Run a claimed job and record whether it succeeded, will be retried, or failed for good."""
+    registered = _tasks.get(job.task)
+    try:
+        if registered is None:
+            raise UnknownTask(f"No task is registered as {job.task!r}")
+        with Heartbeat(job):
+            registered.func(**job.kwargs)
+    except Exception as error:
+        finished_at = timezone.now()
+        last_error = "".join(traceback.format_exception(error))
+        if registered is not None and job.attempts < job.max_attempts:
+            delay = retry_delay(job.attempts)
+            logger.warning("Job %s (%s) failed on attempt %d, retrying in %.0fs",
+                           job.pk, job.task, job.attempts, delay)
+            _owned(job).update(status="queued", run_at=finished_at + timedelta(seconds=delay),
+                               last_error=last_error, locked_by="", locked_at=None)
+            job.status = "queued"
+        else:
+            logger.error("Job %s (%s) failed after %d attempts", job.pk, job.task, job.attempts, exc_info=True)
+            _owned(job).update(status="failed", finished_at=finished_at, last_error=last_error,
+                               locked_by="", locked_at=None)
+            job.status = "failed"
+        return
+
+    _owned(job).update(status="succeeded", finished_at=timezone.now(), locked_by="", locked_at=None)
+    job.status = "succeeded"
+
+
+def requeue_expired_jobs():
+    """
+    Requeue running jobs whose worker has not heartbeated within JOB_LEASE_TIMEOUT, or mark them
+    failed if they are out of attempts.
+    Returns:
+        int: The number of jobs released.
+    """
+    now = timezone.now()
+    expired = Job.objects.filter(status="running", locked_at__lt=now - timedelta(seconds=settings.JOB_LEASE_TIMEOUT))
+    error = "Lease expired: the worker stopped before finishing the job"
+    failed = (expired.filter(attempts__gte=F("max_attempts"))
+              .update(status="failed", finished_at=now, last_error=error, locked_by="", locked_at=None))
+    requeued = expired.update(status="queued", run_at=now, last_error=error, locked_by="", locked_at=None)
+    if failed or requeued:
+        logger.warning("Released %d expired jobs (%d requeued, %d failed)", failed + requeued, requeued, failed)
+    return failed + requeued
+
+
+def purge_succeeded_jobs():
+    """Delete succeeded jobs older than JOB_RETENTION_DAYS; failed jobs are kept for inspection."""
+    cutoff = timezone.now() - timedelta(days=settings.JOB_RETENTION_DAYS)
+    deleted, _ = Job.objects.filter(status="succeeded", finished_at__lt=cutoff).delete()
+    return deleted
+
+
+class Heartbeat:
+    """
+    Refresh a running job's lease every third of JOB_LEASE_TIMEOUT until the job finishes,
+    so long jobs are not mistaken for abandoned ones.
+    """
+
+    def __init__(self, job):
+        self.job = job
+        self.interval = settings.JOB_LEASE_TIMEOUT / 3
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name=f"job-{job.pk}-heartbeat", daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                _owned(self.job).update(locked_at=timezone.now())
+        except Exception:
+            logger.exception("Heartbeat for job %s failed", self.job.pk)
+        finally:
+            # Only this thread's connections
+            connections.close_all()
+
+
+class Worker:
+    """
+    Claims and runs jobs until stopped. Each worker runs one job at a time; run_job_worker starts
+    one per unit of concurrency.
+    Args:
+        name (str): Identifies the worker in Job.locked_by (default: host, process and thread).
+        queues (list): Only claim jobs from these queues (default: all).
+        poll_interval (float): Seconds to sleep when no job is due (default: JOB_POLL_INTERVAL).
+        burst (bool): Return once no job is due instead of polling.
+        max_jobs (int): Return after this many jobs.
+        stop_event (threading.Event): Set to stop after the current job.
+    """
+
+    def __init__(self, name=None, queues=None, poll_interval=None, burst=False, max_jobs=None, stop_event=None):
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+        self.queues = queues
+        self.poll_interval = settings.JOB_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.burst = burst
+        self.max_jobs = max_jobs
+        self.stop_event = stop_event or threading.Event()
+        self.processed = 0
+
+    def run(self):
+        """Returns the number of jobs processed."""
+        self.maintain()
+        while not self.stop_event.is_set():
+            self.close_old_connections()
+            job = claim_job(self.name, self.queues)
+            if job is None:
+                if self.burst:
+                    break
+                self.maintain()
+                self.stop_event.wait(self.poll_interval)
+                continue
+
+            run_job(job)
+            self.processed += 1
+            if self.max_jobs and self.processed >= self.max_jobs:
+                break
+        return self.processed
+
+    def maintain(self):
+        requeue_expired_jobs()
+        purge_succeeded_jobs()
+
+    def close_old_connections(self):
+        # Drop broken or expired connections between jobs, as Django does between requests;
+        # a worker run inside a transaction (e.g. from a test) must keep its connection
+        if not connection.in_atomic_block:
+            close_old_connections()
@@ -0,0 +1,77 @@
+import json
+import os
+import signal
+import socket
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from jobqueuemanagement.jobs import Worker
+from jobqueuemanagement.metrics import queue_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs from the database queue. Starts --concurrency worker threads, each running "
+        "one job at a time; SIGTERM or Ctrl-C stops them once their current jobs finish."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY,
+                            help="Number of jobs to run at once (default: JOB_WORKER_CONCURRENCY).")
+        parser.add_argument("--queue", action="append", dest="queues",
+                            help="Only run jobs from this queue; repeat for several (default: all queues).")
+        parser.add_argument("--poll-interval", type=float, default=settings.JOB_POLL_INTERVAL,
+                            help="Seconds to wait before polling again when no job is due.")
+        parser.add_argument("--burst", action="store_true", help="Exit once no job is due.")
+        parser.add_argument("--max-jobs", type=int, help="Exit after each worker thread has run this many jobs.")
+        parser.add_argument("--stats", action="store_true", help="Print queue depth and latency as JSON and exit.")
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            self.stdout.write(json.dumps(queue_stats(), indent=2))
+            return
+        if options["concurrency"] < 1:
+            raise CommandError("--concurrency must be at least 1")
+
+        stop_event = threading.Event()
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        workers = [
+            Worker(name=f"{prefix}:{number}", queues=options["queues"], poll_interval=options["poll_interval"],
+                   burst=options["burst"], max_jobs=options["max_jobs"], stop_event=stop_event)
+            for number in range(options["concurrency"])
+        ]
+
+        def stop(signum, frame):
+            if not stop_event.is_set():
+                self.stdout.write("Stopping after the current jobs finish...")
+            stop_event.set()
+
+        previous_handlers = {signum: signal.signal(signum, stop) for signum in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            if len(workers) == 1:
+                # Run in this thread, so a single worker shares the caller's connection
+                workers[0].run()
+            else:
+                threads = [threading.Thread(target=self.run_worker, args=(worker,), name=worker.name)
+                           for worker in workers]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    # Join with a timeout so the main thread keeps handling signals
+                    while thread.is_alive():
+                        thread.join(timeout=1)
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+
+        processed = sum(worker.processed for worker in workers)
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} jobs."))
+
+    def run_worker(self, worker):
+        try:
+            worker.run()
+        finally:
+            connections.close_all()
@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+from .models import Job
+
+"""
+Job Queue Metrics
+Queue depth is read from the queued/running rows; latency from the most recently finished jobs:
+- wait: from when a job was due (run_at) until a worker started it, i.e. how far the workers are behind
+- run: from start to finish of the last attempt
+"""
+
+LATENCY_SAMPLE_SIZE = 1000
+
+
+def _percentiles(values):
+    if not values:
+        return None
+    values = sorted(values)
+    def at(fraction):
+        return round(values[min(len(values) - 1, int(fraction * len(values)))], 1)
+    return {"p50": at(0.5), "p95": at(0.95), "max": round(values[-1], 1)}
+
+
+def queue_stats(window=timedelta(hours=1)):
+    """
+    Retrieve the depth and latency of every queue.
+    Args:
+        window (timedelta): How far back to count finished jobs and sample their latency.
+    Returns:
+        dict: Per queue: queued (due now), scheduled (retries and delayed jobs), running and failed
+        counts, the age in seconds of the oldest due job, jobs succeeded and failed within the window,
+        and wait/run latency percentiles in ms.
+    """
+    now = timezone.now()
+    since = now - window
+    stats = {}
+
+    def queue(name):
+        return stats.setdefault(name, {
+            "queued": 0, "scheduled": 0, "running": 0, "failed": 0, "oldest_queued_age": None,
+            "succeeded_in_window": 0, "failed_in_window": 0, "wait_ms": None, "run_ms": None,
+        })
+
+    pending = (Job.objects.filter(status__in=["queued", "running"]).values("queue")
+               .annotate(queued=Count("id", filter=Q(status="queued", run_at__lte=now)),
+                         scheduled=Count("id", filter=Q(status="queued", run_at__gt=now)),
+                         running=Count("id", filter=Q(status="running")),
+                         oldest=Min("run_at", filter=Q(status="queued", run_at__lte=now))))
+    for row in pending:
+        entry = queue(row["queue"])
+        entry.update(queued=row["queued"], scheduled=row["scheduled"], running=row["running"])
+        if row["oldest"] is not None:
+            entry["oldest_queued_age"] = round((now - row["oldest"]).total_seconds(), 1)
+
+    for row in Job.objects.filter(status="failed").values("queue").annotate(count=Count("id")):
+        queue(row["queue"])["failed"] = row["count"]
+
+    finished = (Job.objects.filter(status__in=["succeeded", "failed"], finished_at__gte=since)
+                .values("queue").annotate(succeeded=Count("id", filter=Q(status="succeeded")),
+                                          failed=Count("id", filter=Q(status="failed"))))
+    for row in finished:
+        entry = queue(row["queue"])
+        entry.update(succeeded_in_window=row["succeeded"], failed_in_window=row["failed"])
+
+    waits, runs = {}, {}
+    recent = (Job.objects.filter(status="succeeded", finished_at__gte=since)
+              .order_by("-finished_at").values_list("queue", "run_at", "started_at", "finished_at")
+              [:LATENCY_SAMPLE_SIZE])
+    for name, run_at, started_at, finished_at in recent:
+        waits.setdefault(name, []).append(max(0, (started_at - run_at).total_seconds() * 1000))
+        runs.setdefault(name, []).append((finished_at - started_at).total_seconds() * 1000)
+    for name in waits:
+        entry = queue(name)
+        entry["wait_ms"] = _percentiles(waits[name])
+        entry["run_ms"] = _percentiles(runs[name])
+
+    return stats
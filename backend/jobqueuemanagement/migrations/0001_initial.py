@@ -0,0 +1,38 @@
+# Generated by Django 5.1.3 on 2026-10-18 12:21
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task', models.CharField(max_length=100)),
+                ('kwargs', models.JSONField(blank=True, default=dict)),
+                ('queue', models.CharField(default='default', max_length=50)),
+                ('priority', models.SmallIntegerField(default=0)),
+                ('status', models.CharField(default='queued', max_length=10)),
+                ('attempts', models.IntegerField(default=0)),
+                ('max_attempts', models.IntegerField(default=5)),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('locked_by', models.CharField(blank=True, default='', max_length=100)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('status', 'queued')), fields=['-priority', 'run_at', 'id'], name='job_claim_idx'), models.Index(fields=['status', 'finished_at'], name='job_status_finished_idx')],
+            },
+        ),
+    ]
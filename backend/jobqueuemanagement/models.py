@@ -0,0 +1,36 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """A unit of background work, claimed by run_job_worker with SELECT ... FOR UPDATE SKIP LOCKED"""
+    # Name the task was registered under with @task (see jobs.py)
+    task = models.CharField(max_length=100)
+    kwargs = models.JSONField(default=dict, blank=True)
+    queue = models.CharField(max_length=50, default="default")
+    # Higher priorities are claimed first; jobs of equal priority run in run_at order
+    priority = models.SmallIntegerField(default=0)
+    # "queued", "running", "succeeded" or "failed" (out of attempts)
+    status = models.CharField(max_length=10, default="queued")
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=5)
+    # Not claimed before this time; pushed back after each failed attempt
+    run_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True, default="")
+    # Worker holding a running job, and when it claimed it; expired claims are requeued
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    locked_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            # Matches claim_job's ORDER BY; only queued jobs are polled, so the index stays small
+            models.Index(fields=["-priority", "run_at", "id"], name="job_claim_idx",
+                         condition=models.Q(status="queued")),
+            models.Index(fields=["status", "finished_at"], name="job_status_finished_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
@@ -0,0 +1,92 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from usermanagement.models import User
+from .jobs import Worker, claim_job, enqueue, requeue_expired_jobs, run_job, task
+from .models import Job
+
+calls = []
+
+
+@task("tests.record")
+def record(value):
+    calls.append(value)
+
+
+@task("tests.fail", max_attempts=2)
+def fail():
+    raise RuntimeError("boom")
+
+
+@override_settings(JOB_RETRY_BASE_DELAY=10, JOB_RETRY_MAX_DELAY=60, JOB_LEASE_TIMEOUT=60)
+class JobQueueTests(TestCase):
+    """Jobs run by priority, are retried with backoff, and are released when their worker dies"""
+
+    def setUp(self):
+        calls.clear()
+
+    def test_worker_runs_jobs_by_priority(self):
+        enqueue("tests.record", value="low")
+        enqueue("tests.record", value="high", priority=10)
+        enqueue("tests.record", value="later", delay=timedelta(hours=1))
+        enqueue("tests.record", value="other queue", queue="reports")
+
+        processed = Worker(queues=["default"], burst=True).run()
+
+        self.assertEqual(processed, 2)
+        self.assertEqual(calls, ["high", "low"])
+        self.assertEqual(Job.objects.filter(status="succeeded").count(), 2)
+        self.assertEqual(Job.objects.filter(status="queued").count(), 2)
+
+    def test_failed_jobs_are_retried_with_backoff(self):
+        job = enqueue("tests.fail")
+
+        run_job(claim_job("worker"))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("queued", 1))
+        self.assertIn("RuntimeError: boom", job.last_error)
+        self.assertGreaterEqual(job.run_at, timezone.now() + timedelta(seconds=4))
+        self.assertIsNone(claim_job("worker"))
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        run_job(claim_job("worker"))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("failed", 2))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_jobs_are_dropped_with_their_transaction(self):
+        with self.assertRaises(ValueError), transaction.atomic():
+            enqueue("tests.record", value="rolled back")
+            raise ValueError
+        self.assertFalse(Job.objects.exists())
+
+    def test_expired_leases_are_requeued(self):
+        job = enqueue("tests.record", value="retry me")
+        claim_job("dead-worker")
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(minutes=5))
+
+        self.assertEqual(requeue_expired_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), ("queued", ""))
+        call_command("run_job_worker", burst=True, concurrency=1, stdout=StringIO())
+        self.assertEqual(calls, ["retry me"])
+
+    def test_stats_endpoint(self):
+        enqueue("tests.record", value="waiting")
+        enqueue("tests.record", value="done", queue="reports")
+        Worker(queues=["reports"], burst=True).run()
+
+        client = APIClient()
+        client.force_authenticate(User.objects.create(email="admin@test.edu", name="Admin", is_staff=True))
+        stats = client.get("/instrumentation/jobs/").json()
+
+        self.assertEqual(stats["default"]["queued"], 1)
+        self.assertIsNotNone(stats["default"]["oldest_queued_age"])
+        self.assertEqual(stats["reports"]["succeeded_in_window"], 1)
+        self.assertEqual(set(stats["reports"]["wait_ms"]), {"p50", "p95", "max"})
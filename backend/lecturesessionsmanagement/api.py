@@ -1,12 +1,27 @@
 from rest_framework.response import Response
 from rest_framework.decorators import api_view
-from .models import LectureSession, RecordingSession, LectureSlides
+from .models import LectureSession, RecordingSession, LectureSlides, LectureSlidePage, RecordingUpload, RecordingUploadChunk
 from .serializers import LectureSessionSerializer, RecordingSessionSerializer, LectureSlidesSerializer
+from .serializers import LectureSessionValuesSerializer, RecordingSessionValuesSerializer, RecordingUploadSerializer
+from .serializers import LectureSlidePageValuesSerializer
+from .content_blobs import store_content_blob, find_content_blob, hash_stored_file
+from .slide_processing import queue_slide_processing
 from rest_framework import status
 from django.conf import settings
-from django.core.files.storage import default_storage
-import boto3
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+import hashlib
 import os
+import uuid
+from InkSightMVP.blob_storage import get_blob_storage, BlobNotFound, BlobStorageError, UnsupportedOperation
+from InkSightMVP.chunked_uploads import chunk_size_for, chunk_count_for, expected_chunk_size
+from InkSightMVP.pagination import list_response
+from InkSightMVP.streaming import stream_blob_response
+from InkSightMVP.uploads import stream_upload_to_storage, get_upload_progress, StoredUploadedFile, UploadFailed
+from InkSightMVP.uploads import create_presigned_upload, complete_presigned_upload, load_upload_token
+from InkSightMVP.uploads import InvalidUploadToken, UploadNotFinished
 
 """
 GET (LectureSession Management) Methods
@@ -22,12 +37,12 @@ def get_lecture_sessions(request):
     """
     Retrieve all lecture sessions.
     Fetches all lecture sessions available in the database and returns them in JSON format.
+    Pass ?limit= (and the returned ?cursor=) to page through the results.
     Returns:
         JSON response containing all lecture sessions.
     """
     lecture_sessions = LectureSession.objects.all()
-    serializer = LectureSessionSerializer(lecture_sessions, many=True)
-    return Response(serializer.data)
+    return list_response(request, lecture_sessions, LectureSessionValuesSerializer, ordering=("-date", "-id"))
 
 @api_view(["GET"])
 def get_lecture_session(request, lecture_session_id):
@@ -50,12 +65,12 @@ def get_recording_sessions(request):
     """
     Retrieve all recording sessions.
     Fetches all recording sessions available in the database and returns them in JSON format.
+    Pass ?limit= (and the returned ?cursor=) to page through the results.
     Returns:
         JSON response containing all recording sessions.
     """
     recording_sessions = RecordingSession.objects.all()
-    serializer = RecordingSessionSerializer(recording_sessions, many=True)
-    return Response(serializer.data)
+    return list_response(request, recording_sessions, RecordingSessionValuesSerializer, ordering=("-created_at", "-id"))
 
 @api_view(["GET"])
 def get_recording_session(request, recording_session_id):
@@ -73,6 +88,32 @@ def get_recording_session(request, recording_session_id):
     except RecordingSession.DoesNotExist:
         return Response({"error": "Recording Session does not exist in the database"}, status=404)
 
+@api_view(["GET"])
+def get_recording_session_file(request, recording_session_id):
+    """
+    Stream a recording session's file from blob storage.
+    Send a `Range: bytes=<start>-<end>` header to fetch part of the file (e.g. to seek in a player).
+    Args:
+        recording_session_id (int): The ID of the recording session.
+    Returns:
+        The file (200) or the requested range (206); a 404 error if the recording session or its file
+        does not exist, or if the file is not in the recordings storage; a 416 error for an invalid range.
+    """
+    recording_session = RecordingSession.objects.filter(id=recording_session_id).first()
+    if recording_session is None:
+        return Response({"error": "Recording session not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    storage = get_blob_storage("recordings")
+    key = storage.key_from_url(recording_session.file_path)
+    if key is None:
+        return Response({"error": "The recording is not in blob storage"}, status=status.HTTP_404_NOT_FOUND)
+    try:
+        return stream_blob_response(request, storage, key)
+    except BlobNotFound:
+        return Response({"error": "Recording file not found"}, status=status.HTTP_404_NOT_FOUND)
+    except BlobStorageError as e:
+        return Response({"error": str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+
 @api_view(["GET"])
 def get_current_lecture_session_for_course(request, course_id):
     """
@@ -180,40 +221,460 @@ def update_lecture_session_status(request, lecture_session_id):
     except LectureSession.DoesNotExist:
         return Response({"error": "Lecture Session not found."}, status=status.HTTP_404_NOT_FOUND)
         
+@stream_upload_to_storage("file", key_template="staging/{course_id}/{token}", storage="slides")
 @api_view(['POST'])
 def upload_lecture_session_slides(request, course_id):
     """
-    Updates the slides for the lecture session to AmazonS3
-    Creates A Temporary File Path in Django Storage and S3k3y
+    Uploads the slides for the lecture session to the slides blob storage (S3)
+    The file is streamed into a multipart upload while the request is read, without touching local disk,
+    and stored under the SHA-256 of its content: re-uploading a deck that is already stored reuses it.
+    The deck is then split into pages (text and thumbnails) in the background; see get_slide_pages.
+    Pass ?upload_id=<id> to poll the upload's progress from get_upload_progress_for_slides (with a shared cache).
     Args:
-        course_id (int): the ID of the course for file naming purposes
+        course_id (int): the ID of the course the slides are uploaded for
+    Returns:
+        JSON response with the slides, whether the content was already stored (`deduplicated`)
+        and upload details (bytes received, parts uploaded), or the error and how far the upload got.
     """
-    bucket_name = "inksightslidestorage"
     try:
         if 'file' not in request.FILES:
-                return Response({"error": "No file uploaded."}, status=400)
-
+            return Response({"error": "No file uploaded."}, status=400)
         uploaded_file = request.FILES['file']
-        temp_file_path = default_storage.save(uploaded_file.name, uploaded_file)
+    except UploadFailed as e:
+        return Response({"error": str(e), "upload": e.details}, status=status.HTTP_502_BAD_GATEWAY)
 
-        s3_key = f"uploads/{course_id}/{uploaded_file.name}"
-        s3_client = settings.GETS3CLIENT()
-        s3_client.upload_file(temp_file_path, bucket_name, s3_key)
+    if not isinstance(uploaded_file, StoredUploadedFile):
+        return Response({"error": "The slides must be sent in the 'file' field."}, status=400)
+
+    try:
+        with transaction.atomic():
+            blob, created = store_content_blob("slides", uploaded_file)
+            slides = LectureSlides.objects.create(file_slides=uploaded_file.storage.url(blob.key),
+                                                  file_name=uploaded_file.name, blob=blob)
+            queue_slide_processing(slides)
+    except BlobStorageError as e:
+        return Response({"error": str(e), "upload": e.details}, status=status.HTTP_502_BAD_GATEWAY)
+
+    serializer = LectureSlidesSerializer(slides)
+    return Response({
+        "message": "Slides uploaded successfully!",
+        "slides": serializer.data,
+        "deduplicated": not created,
+        "upload": {**request.upload_handler.details(), "sha256": uploaded_file.sha256},
+    }, status=200)
+
+
+@api_view(['POST'])
+def reuse_lecture_session_slides(request, course_id):
+    """
+    Create slides from a deck that is already stored, without uploading it again.
+    Clients hash the file first and only upload it if this returns a 404 error.
+    Expected JSON fields: sha256, and optionally file_name.
+    Args:
+        course_id (int): the ID of the course the slides are uploaded for
+    Returns:
+        JSON response with the new slides; otherwise, a 404 error if no deck with that hash is stored.
+    """
+    sha256 = request.data.get("sha256")
+    if not sha256:
+        return Response({"error": "sha256 is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+    with transaction.atomic():
+        blob = find_content_blob(sha256)
+        if blob is None or blob.storage != "slides":
+            return Response({"error": "No stored slides with this hash."}, status=status.HTTP_404_NOT_FOUND)
+        slides = LectureSlides.objects.create(file_slides=get_blob_storage("slides").url(blob.key),
+                                              file_name=request.data.get("file_name", ""), blob=blob)
+        # Pages already processed for this deck are copied, not rendered again
+        queue_slide_processing(slides)
+    return Response({"slides": LectureSlidesSerializer(slides).data, "deduplicated": True},
+                    status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET'])
+def get_slide_pages(request, slides_id):
+    """
+    Retrieve the pages of a slide deck (text, size and thumbnail URL), once processing has finished.
+    Pass ?limit= (and the returned ?cursor=) to page through the results.
+    Args:
+        slides_id (int): The ID of the LectureSlides.
+    Returns:
+        JSON response with the pages, and the deck's processing status in the X-Processing-Status header;
+        otherwise, a 404 error.
+    """
+    slides = LectureSlides.objects.filter(pk=slides_id).values("processing_status").first()
+    if slides is None:
+        return Response({"error": "Slides not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    pages = LectureSlidePage.objects.filter(slides_id=slides_id).order_by("page_number")
+    response = list_response(request, pages, LectureSlidePageValuesSerializer, ordering=("page_number",))
+    response["X-Processing-Status"] = slides["processing_status"]
+    return response
+
+
+@api_view(['GET'])
+def get_upload_progress_for_slides(request, upload_id):
+    """
+    Retrieve the progress of a streamed slide upload the user started with ?upload_id=<upload_id>.
+    Progress is only tracked with a cache shared by every worker (settings.CACHE_IS_SHARED).
+    Args:
+        upload_id (str): The client-chosen ID of the upload.
+    Returns:
+        JSON response with the status, bytes received, parts uploaded and any error; a 404 error if the user
+        has no such upload, or a 501 error if progress is not tracked on this deployment.
+    """
+    if not settings.CACHE_IS_SHARED:
+        return Response({"error": "Upload progress is not tracked: it needs a cache shared by every worker "
+                                  "(e.g. Redis)."}, status=status.HTTP_501_NOT_IMPLEMENTED)
+    progress = get_upload_progress(request.user.pk, upload_id)
+    if progress is None:
+        return Response({"error": "Upload not found."}, status=status.HTTP_404_NOT_FOUND)
+    return Response(progress)
+
+
+"""
+Presigned (Direct-to-Bucket) Uploads
+Slides and recordings can be uploaded straight to S3 instead of through the Django workers:
+1. POST the file name, content type and size to a presign endpoint; the response holds a presigned
+   PUT URL (or one URL per part for large files) and an upload token.
+2. PUT the file (or each part) to the URL(s).
+3. POST the upload token to complete_upload; the LectureSlides or RecordingSession row is only
+   created once the object is confirmed to be in the bucket.
+"""
+
+def _presign(request, storage_name, key_prefix, target):
+    """Validate a presign request and create the presigned upload under `key_prefix`."""
+    try:
+        file_name = get_valid_filename(os.path.basename(request.data.get("file_name") or ""))
+    except SuspiciousFileOperation:
+        return Response({"error": "A valid file_name is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+    size = request.data.get("size")
+    if size is not None:
+        try:
+            size = int(size)
+        except (TypeError, ValueError):
+            return Response({"error": "size must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        if size <= 0:
+            return Response({"error": "size must be positive"}, status=status.HTTP_400_BAD_REQUEST)
+
+    content_type = request.data.get("content_type") or "application/octet-stream"
+    try:
+        # A unique directory per upload, so uploads with the same file name do not overwrite each other
+        upload = create_presigned_upload(storage_name, f"{key_prefix}/{uuid.uuid4()}/{file_name}",
+                                         content_type, size=size, target=target)
+    except UnsupportedOperation as e:
+        return Response({"error": str(e)}, status=status.HTTP_501_NOT_IMPLEMENTED)
+    except BlobStorageError as e:
+        return Response({"error": str(e), "upload": e.details}, status=status.HTTP_502_BAD_GATEWAY)
+    return Response(upload, status=status.HTTP_201_CREATED)
+
+
+@api_view(['POST'])
+def presign_slides_upload(request, course_id):
+    """
+    Issue a presigned upload for a course's slides.
+    Expected JSON fields: file_name, and optionally content_type and size (required for multipart uploads).
+    Args:
+        course_id (int): the ID of the course for file naming purposes
+    Returns:
+        JSON response with the presigned URL(s), the headers to send and the upload token.
+    """
+    return _presign(request, "slides", f"uploads/{course_id}", {"kind": "slides"})
+
+
+@api_view(['POST'])
+def presign_recording_upload(request, lecture_session_id):
+    """
+    Issue a presigned upload for a lecture session's recording.
+    Expected JSON fields: file_name, recording_type, and optionally content_type and size.
+    Args:
+        lecture_session_id (int): The ID of the lecture session the recording belongs to.
+    Returns:
+        JSON response with the presigned URL(s), the headers to send and the upload token;
+        otherwise, a 404 error if the lecture session does not exist.
+    """
+    if not LectureSession.objects.filter(pk=lecture_session_id).exists():
+        return Response({"error": "Lecture session not found"}, status=status.HTTP_404_NOT_FOUND)
+    recording_type = request.data.get("recording_type")
+    if not recording_type:
+        return Response({"error": "recording_type is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+    target = {"kind": "recording", "lecture_session_id": lecture_session_id, "recording_type": recording_type}
+    return _presign(request, "recordings", f"recordings/{lecture_session_id}", target)
+
+
+def _complete_slides_upload(target, storage, info):
+    """Store presigned slides by content hash, exactly like uploaded slides, and queue their processing."""
+    key = target["key"]
+    try:
+        sha256 = hash_stored_file(storage, key)
+    except BlobStorageError as e:
+        return Response({"error": str(e), "upload": e.details}, status=status.HTTP_502_BAD_GATEWAY)
+    staged_file = StoredUploadedFile(name=os.path.basename(key), content_type=info.content_type, size=info.size,
+                                     charset=None, storage=storage, key=key, parts=None, sha256=sha256)
+
+    try:
+        with transaction.atomic():
+            blob, created = store_content_blob("slides", staged_file)
+            try:
+                with transaction.atomic():
+                    slides = LectureSlides.objects.create(file_slides=storage.url(blob.key), file_name=staged_file.name,
+                                                          blob=blob, upload_key=key)
+            except IntegrityError:
+                # A concurrent completion of the same upload created the slides first
+                slides = LectureSlides.objects.get(upload_key=key)
+                return Response({"slides": LectureSlidesSerializer(slides).data}, status=status.HTTP_200_OK)
+            queue_slide_processing(slides)
+    except BlobStorageError as e:
+        return Response({"error": str(e), "upload": e.details}, status=status.HTTP_502_BAD_GATEWAY)
+
+    return Response({
+        "slides": LectureSlidesSerializer(slides).data,
+        "deduplicated": not created,
+        "upload": {"key": key, "size": info.size, "sha256": sha256},
+    }, status=status.HTTP_201_CREATED)
+
+
+@api_view(['POST'])
+def complete_upload(request):
+    """
+    Confirm a presigned upload and create its LectureSlides or RecordingSession row.
+    Slides are then stored by content hash and processed like uploaded slides (see upload_lecture_session_slides).
+    Completing the same upload again returns the existing row.
+    Expected JSON fields: upload_token.
+    Returns:
+        JSON response with the slides or recording session; a 400 error for an invalid token,
+        a 409 error if the file has not been (fully) uploaded yet, or a 502 error if S3 fails.
+    """
+    upload_token = request.data.get("upload_token")
+    if not upload_token:
+        return Response({"error": "upload_token is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        target = load_upload_token(upload_token)
+        if target["kind"] == "slides":
+            # The staged file is gone once the slides are created, so look for them first
+            slides = LectureSlides.objects.filter(upload_key=target["key"]).first()
+            if slides is not None:
+                return Response({"slides": LectureSlidesSerializer(slides).data}, status=status.HTTP_200_OK)
+        target, storage, info = complete_presigned_upload(upload_token)
+    except InvalidUploadToken as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except UploadNotFinished as e:
+        return Response({"error": str(e), "upload": e.details}, status=status.HTTP_409_CONFLICT)
+    except UploadFailed as e:
+        return Response({"error": str(e), "upload": e.details}, status=status.HTTP_502_BAD_GATEWAY)
+
+    if target["kind"] == "slides":
+        return _complete_slides_upload(target, storage, info)
+
+    url = storage.url(target["key"])
+    upload = {"key": target["key"], "size": info.size}
+    recording_session, created = RecordingSession.objects.get_or_create(
+        lecture_session_id=target["lecture_session_id"],
+        file_path=url,
+        defaults={"recording_type": target["recording_type"], "created_at": timezone.now()},
+    )
+    return Response({"recording_session": RecordingSessionSerializer(recording_session).data, "upload": upload},
+                    status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
+"""
+Resumable Recording Uploads
+Recordings are uploaded in numbered chunks so a dropped connection only costs the chunk in flight:
+1. POST recording-uploads/ creates the upload and returns its ID, chunk size and chunk count.
+2. PUT each chunk's bytes to recording-uploads/<id>/chunks/<index> with its SHA-256 in the
+   X-Chunk-SHA256 header. Chunks may be sent in any order and re-sent safely.
+3. After a disconnect, GET recording-uploads/<id> lists the received chunks, byte ranges and missing chunks.
+4. POST recording-uploads/<id>/complete assembles the file and creates the RecordingSession.
+"""
+
+CHUNK_CHECKSUM_HEADER = "HTTP_X_CHUNK_SHA256"
+
+
+@api_view(['POST'])
+def create_recording_upload(request):
+    """
+    Start a resumable recording upload.
+    Expected JSON fields: lecture_session_id, recording_type, file_name, total_size, and optionally content_type.
+    Returns:
+        JSON response with the upload (ID, chunk size, chunk count, missing chunks);
+        otherwise, a 400 error if validation fails or a 404 error if the lecture session does not exist.
+    """
+    data = request.data
+    for field in ["lecture_session_id", "recording_type", "file_name", "total_size"]:
+        if field not in data:
+            return Response({"error": f"{field} is required"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        total_size = int(data["total_size"])
+        file_name = get_valid_filename(os.path.basename(data["file_name"]))
+    except (TypeError, ValueError):
+        return Response({"error": "total_size must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+    except SuspiciousFileOperation:
+        return Response({"error": "A valid file_name is required"}, status=status.HTTP_400_BAD_REQUEST)
+    if total_size < 0:
+        return Response({"error": "total_size must not be negative"}, status=status.HTTP_400_BAD_REQUEST)
+
+    lecture_session = LectureSession.objects.filter(pk=data["lecture_session_id"]).first()
+    if lecture_session is None:
+        return Response({"error": "Lecture session not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    upload_id = uuid.uuid4()
+    key = f"recordings/{lecture_session.pk}/{upload_id}/{file_name}"
+    content_type = data.get("content_type") or "application/octet-stream"
+    storage = get_blob_storage("recordings")
+    try:
+        storage_upload_id = storage.create_multipart(key, content_type)
+    except BlobStorageError as e:
+        return Response({"error": str(e), "upload": e.details}, status=status.HTTP_502_BAD_GATEWAY)
+
+    upload = RecordingUpload.objects.create(
+        id=upload_id,
+        lecture_session=lecture_session,
+        recording_type=data["recording_type"],
+        file_name=file_name,
+        content_type=content_type,
+        total_size=total_size,
+        chunk_size=chunk_size_for(total_size),
+        storage=storage.name,
+        storage_upload_id=storage_upload_id,
+        key=key,
+    )
+    return Response(RecordingUploadSerializer(upload).data, status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET', 'DELETE'])
+def recording_upload(request, upload_id):
+    """
+    Retrieve a recording upload's progress (GET), or abort it and discard its chunks (DELETE).
+    Args:
+        upload_id (uuid): The ID of the upload.
+    Returns:
+        JSON response with the received chunks, received byte ranges and missing chunks;
+        a 204 response once aborted; a 404 error if the upload does not exist,
+        or a 409 error when aborting an upload that is already complete.
+    """
+    upload = RecordingUpload.objects.filter(pk=upload_id).first()
+    if upload is None:
+        return Response({"error": "Upload not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    if request.method == 'GET':
+        return Response(RecordingUploadSerializer(upload).data)
+
+    if upload.status == "complete":
+        return Response({"error": "The upload is already complete"}, status=status.HTTP_409_CONFLICT)
+    get_blob_storage("recordings", backend=upload.storage).abort_multipart(upload.key, upload.storage_upload_id)
+    upload.delete()
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@api_view(['PUT'])
+def upload_recording_chunk(request, upload_id, index):
+    """
+    Receive one chunk of a recording upload as the raw request body.
+    Re-sending a chunk replaces it; re-sending identical bytes is a no-op.
+    Args:
+        upload_id (uuid): The ID of the upload.
+        index (int): Zero-based chunk number.
+    Returns:
+        JSON response with the chunk and the upload's bytes received; a 400 error if the chunk has the
+        wrong size or checksum, a 404 error if the upload does not exist, or a 409 error if it is complete.
+    """
+    upload = RecordingUpload.objects.filter(pk=upload_id).first()
+    if upload is None:
+        return Response({"error": "Upload not found"}, status=status.HTTP_404_NOT_FOUND)
+    if upload.status != "uploading":
+        return Response({"error": "The upload is already complete"}, status=status.HTTP_409_CONFLICT)
+    if index >= chunk_count_for(upload.total_size, upload.chunk_size):
+        return Response({"error": "Chunk index out of range"}, status=status.HTTP_400_BAD_REQUEST)
+
+    checksum = request.META.get(CHUNK_CHECKSUM_HEADER, "").lower()
+    if not checksum:
+        return Response({"error": "X-Chunk-SHA256 header is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+    expected_size = expected_chunk_size(index, upload.total_size, upload.chunk_size)
+    if int(request.META.get("CONTENT_LENGTH") or 0) != expected_size:
+        return Response({"error": f"Chunk {index} must be {expected_size} bytes"}, status=status.HTTP_400_BAD_REQUEST)
+    # Read the raw body directly: request.body is capped at DATA_UPLOAD_MAX_MEMORY_SIZE
+    data = request.stream.read() if request.stream is not None else b""
+    if len(data) != expected_size:
+        return Response({"error": "The chunk was not received completely"}, status=status.HTTP_400_BAD_REQUEST)
+
+    sha256 = hashlib.sha256(data).hexdigest()
+    if sha256 != checksum:
+        return Response({"error": "Checksum mismatch", "sha256": sha256}, status=status.HTTP_400_BAD_REQUEST)
+
+    chunk = upload.chunks.filter(index=index).first()
+    if chunk is None or chunk.sha256 != sha256:
+        try:
+            storage = get_blob_storage("recordings", backend=upload.storage)
+            etag = storage.upload_part(upload.key, upload.storage_upload_id, index + 1, data)
+        except BlobStorageError as e:
+            return Response({"error": str(e), "upload": e.details}, status=status.HTTP_502_BAD_GATEWAY)
+        chunk, created = RecordingUploadChunk.objects.update_or_create(
+            upload=upload, index=index, defaults={"size": len(data), "sha256": sha256, "etag": etag}
+        )
+
+    return Response({
+        "index": index,
+        "size": chunk.size,
+        "sha256": chunk.sha256,
+        "bytes_received": sum(upload.chunks.values_list("size", flat=True)),
+    })
+
+
+@api_view(['POST'])
+def complete_recording_upload(request, upload_id):
+    """
+    Assemble a fully received recording upload and create its RecordingSession.
+    Completing an upload again returns the same recording session.
+    Args:
+        upload_id (uuid): The ID of the upload.
+    Returns:
+        JSON response with the recording session (201 if this call assembled the upload, 200 if it was
+        already complete); a 404 error if the upload does not exist,
+        a 409 error listing the missing chunks, or a 502 error if the file could not be assembled.
+    """
+    with transaction.atomic():
+        # Lock the upload so concurrent completions assemble it once
+        upload = RecordingUpload.objects.select_for_update().filter(pk=upload_id).first()
+        if upload is None:
+            return Response({"error": "Upload not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        created = upload.status != "complete"
+        if created:
+            chunks = list(upload.chunks.order_by("index").values_list("index", "etag"))
+            received = {index for index, etag in chunks}
+            missing = [index for index in range(chunk_count_for(upload.total_size, upload.chunk_size))
+                       if index not in received]
+            if missing:
+                return Response({"error": "Some chunks have not been received", "missing_chunks": missing},
+                                status=status.HTTP_409_CONFLICT)
+
+            storage = get_blob_storage("recordings", backend=upload.storage)
+            try:
+                storage.complete_multipart(upload.key, upload.storage_upload_id,
+                                           [(index + 1, etag) for index, etag in chunks])
+            except BlobNotFound as e:
+                # Already assembled by an earlier attempt whose transaction did not commit
+                if not storage.exists(upload.key):
+                    return Response({"error": str(e), "upload": e.details}, status=status.HTTP_502_BAD_GATEWAY)
+            except BlobStorageError as e:
+                return Response({"error": str(e), "upload": e.details}, status=status.HTTP_502_BAD_GATEWAY)
+
+            upload.recording_session = RecordingSession.objects.create(
+                lecture_session_id=upload.lecture_session_id,
+                recording_type=upload.recording_type,
+                file_path=storage.url(upload.key),
+                created_at=timezone.now(),
+            )
+            upload.status = "complete"
+            upload.save(update_fields=["recording_session", "status", "updated_at"])
+
+    return Response(RecordingSessionSerializer(upload.recording_session).data,
+                    status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
-        AWS_REGION = os.getenv("AWS_COGNITO_REGION")
-        
-        url_to_s3 = f"https://{bucket_name}.s3.{AWS_REGION}.amazonaws.com/{s3_key}"
-        os.remove(temp_file_path)
-
-        slides, created = LectureSlides.objects.get_or_create(file_slides=url_to_s3)
-        if(created):
-            serializer = LectureSlidesSerializer(created)
-        else:
-            serializer = LectureSlidesSerializer(slides)
-        return Response({"message": "Slides uploaded successfully!", "slides": serializer.data}, status=200)
-    except Exception as e:
-        return Response({"error": str(e)}, status=500)
-    
 
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class LecturesessionsmanagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'lecturesessionsmanagement'
+
+    def ready(self):
+        import lecturesessionsmanagement.signals
@@ -0,0 +1,125 @@
+import hashlib
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from InkSightMVP.blob_storage import get_blob_storage
+from .models import ContentBlob
+
+"""
+Content-Addressed Blobs
+Uploaded files are stored once per distinct content, under a key derived from their SHA-256:
+1. The upload is streamed to a staging key while its hash is computed (see InkSightMVP/uploads.py).
+2. store_content_blob moves it to blobs/sha256/<hash> if that content is new, and otherwise
+   deletes the staging copy and reuses the existing blob.
+3. Rows that reference a blob (LectureSlides.blob, LectureSlidePage.thumbnail) keep ContentBlob.ref_count
+   up to date through the post_save/post_delete signals in signals.py; bulk_create callers must call
+   add_references themselves.
+4. Blobs nobody references are deleted by the collect_content_blobs command after a grace period.
+store_content_blob locks the blob row, so it must run in the same transaction that creates the
+referencing row: collect_content_blobs locks the rows it deletes, and the two never interleave.
+A new blob's row is inserted before its content is moved into place. Concurrent first uploads of the
+same content then queue on the primary key: the first one stores the content, and the others wait
+for it to commit, reuse its blob and delete their own staging copies.
+"""
+
+
+def content_key(sha256):
+    return f"blobs/sha256/{sha256[:2]}/{sha256}"
+
+
+def store_content_blob(storage, uploaded_file):
+    """
+    Store an uploaded file by content hash, reusing the existing blob if the content is already stored.
+    Must be called inside transaction.atomic(), which should also create the referencing row.
+    Args:
+        storage (str): The logical blob store the file was uploaded to (e.g. "slides").
+        uploaded_file (StoredUploadedFile): The upload, still at its staging key.
+    Returns:
+        tuple: (ContentBlob, created), where created is False if the upload was a duplicate.
+    Raises:
+        BlobStorageError
+    """
+    key = content_key(uploaded_file.sha256)
+    blob, created = _lock_or_create_blob(
+        uploaded_file.sha256,
+        storage=storage,
+        key=key,
+        size=uploaded_file.size,
+        content_type=uploaded_file.content_type or "application/octet-stream",
+    )
+    if created:
+        uploaded_file.storage.move(uploaded_file.key, key)
+    else:
+        uploaded_file.storage.delete_many([uploaded_file.key])
+    return blob, created
+
+
+def store_content_bytes(storage, data, content_type):
+    """
+    Store generated content (e.g. a thumbnail) by hash, unless the same bytes are already stored.
+    Must be called inside transaction.atomic(), which should also create the referencing row.
+    Returns:
+        ContentBlob: The new or existing blob.
+    """
+    sha256 = hashlib.sha256(data).hexdigest()
+    key = content_key(sha256)
+    blob, created = _lock_or_create_blob(sha256, storage=storage, key=key, size=len(data),
+                                         content_type=content_type)
+    if created:
+        get_blob_storage(storage).write(key, data, content_type=content_type)
+    return blob
+
+
+def _lock_or_create_blob(sha256, **fields):
+    """
+    Lock the blob with this hash, or insert it (the caller then stores its content).
+    An insert that conflicts with a concurrent one waits for it; once that commits its blob is locked instead.
+    Returns:
+        tuple: (ContentBlob, created)
+    """
+    while True:
+        blob = ContentBlob.objects.select_for_update().filter(sha256=sha256).first()
+        if blob is not None:
+            return blob, False
+        try:
+            with transaction.atomic():
+                return ContentBlob.objects.create(sha256=sha256, **fields), True
+        except IntegrityError:
+            continue
+
+
+def hash_stored_file(storage, key):
+    """
+    Compute the SHA-256 of a stored file by streaming it (e.g. a presigned upload, which never passes
+    through Django).
+    Raises:
+        BlobStorageError
+    """
+    sha256 = hashlib.sha256()
+    for chunk in storage.open(key):
+        sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def find_content_blob(sha256):
+    """Lock and return the blob with this hash, or None; call inside transaction.atomic()."""
+    return ContentBlob.objects.select_for_update().filter(sha256=sha256.lower()).first()
+
+
+def add_reference(blob_id):
+    ContentBlob.objects.filter(pk=blob_id).update(ref_count=F("ref_count") + 1, unreferenced_since=None)
+
+
+def add_references(blob_ids):
+    """Add one reference per occurrence of each blob ID (e.g. after bulk_create, which sends no signals)."""
+    counts = {}
+    for blob_id in blob_ids:
+        counts[blob_id] = counts.get(blob_id, 0) + 1
+    for blob_id, count in counts.items():
+        ContentBlob.objects.filter(pk=blob_id).update(ref_count=F("ref_count") + count, unreferenced_since=None)
+
+
+def remove_reference(blob_id):
+    ContentBlob.objects.filter(pk=blob_id).update(ref_count=F("ref_count") - 1)
+    ContentBlob.objects.filter(pk=blob_id, ref_count__lte=0).update(unreferenced_since=timezone.now())
@@ -0,0 +1,71 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from InkSightMVP.blob_storage import get_blob_storage
+from lecturesessionsmanagement.models import ContentBlob
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete content-addressed blobs that no row has referenced for the grace period, "
+        "from blob storage and the database. Blobs locked by an upload in progress are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--grace-hours", type=float, default=24,
+                            help="Only collect blobs unreferenced for at least this long (default: 24).")
+        parser.add_argument("--recount", action="store_true",
+                            help="Recompute every reference count from the referencing rows first.")
+        parser.add_argument("--dry-run", action="store_true", help="List the blobs that would be deleted.")
+
+    def handle(self, *args, **options):
+        if options["recount"]:
+            self.recount()
+
+        cutoff = timezone.now() - timedelta(hours=options["grace_hours"])
+        unreferenced = ContentBlob.objects.filter(ref_count__lte=0, unreferenced_since__lt=cutoff).order_by("pk")
+
+        if options["dry_run"]:
+            for blob in unreferenced:
+                self.stdout.write(f"{blob.storage}/{blob.key}  {blob.size} bytes")
+            return
+
+        deleted = freed = 0
+        while True:
+            with transaction.atomic():
+                # Locked rows cannot be reused by an upload until the blobs are gone
+                batch = list(unreferenced.select_for_update(skip_locked=True)[:BATCH_SIZE])
+                if not batch:
+                    break
+                keys = defaultdict(list)
+                for blob in batch:
+                    keys[blob.storage].append(blob.key)
+                for storage, storage_keys in keys.items():
+                    get_blob_storage(storage).delete_many(storage_keys)
+                ContentBlob.objects.filter(pk__in=[blob.pk for blob in batch]).delete()
+            deleted += len(batch)
+            freed += sum(blob.size for blob in batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} unreferenced blobs ({freed} bytes)."))
+
+    def recount(self):
+        now = timezone.now()
+        fixed = 0
+        references = Count("slides", distinct=True) + Count("thumbnail_pages", distinct=True)
+        for blob in ContentBlob.objects.annotate(references=references).iterator():
+            if blob.ref_count != blob.references:
+                fields = {"ref_count": blob.references}
+                if blob.references == 0 and blob.unreferenced_since is None:
+                    fields["unreferenced_since"] = now
+                elif blob.references:
+                    fields["unreferenced_since"] = None
+                ContentBlob.objects.filter(pk=blob.pk).update(**fields)
+                fixed += 1
+        self.stdout.write(f"Fixed {fixed} reference counts.")
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.3 on 2026-10-18 11:57
+
+from django.db import migrations, models
+
+from InkSightMVP.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without blocking writes to the table
+    atomic = False
+
+    dependencies = [
+        ('coursemanagement', '0004_professorcourse_professorcourse_prof_crs_idx_and_more'),
+        ('lecturesessionsmanagement', '0007_alter_lectureslides_lecture_session'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='lecturesession',
+            index=models.Index(fields=['course', 'status', '-date'], name='lecture_course_status_date_idx'),
+        ),
+    ]
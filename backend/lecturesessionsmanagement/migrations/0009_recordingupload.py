@@ -0,0 +1,49 @@
+# Generated by Django 5.1.3 on 2026-10-18 12:08
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lecturesessionsmanagement', '0008_lecturesession_lecture_course_status_date_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecordingUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('recording_type', models.TextField()),
+                ('file_name', models.CharField(max_length=255)),
+                ('content_type', models.TextField(default='application/octet-stream')),
+                ('total_size', models.BigIntegerField()),
+                ('chunk_size', models.IntegerField()),
+                ('storage', models.CharField(max_length=10)),
+                ('storage_upload_id', models.CharField(max_length=1024)),
+                ('key', models.CharField(max_length=2000)),
+                ('status', models.TextField(default='uploading')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('lecture_session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='lecturesessionsmanagement.lecturesession')),
+                ('recording_session', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='lecturesessionsmanagement.recordingsession')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RecordingUploadChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.IntegerField()),
+                ('size', models.IntegerField()),
+                ('sha256', models.CharField(max_length=64)),
+                ('etag', models.CharField(blank=True, default='', max_length=255)),
+                ('received_at', models.DateTimeField(auto_now=True)),
+                ('upload', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='lecturesessionsmanagement.recordingupload')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('upload', 'index'), name='unique_recording_upload_chunk')],
+            },
+        ),
+    ]
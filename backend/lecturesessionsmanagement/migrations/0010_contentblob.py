@@ -0,0 +1,40 @@
+# Generated by Django 5.1.3 on 2026-10-18 12:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lecturesessionsmanagement', '0009_recordingupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lectureslides',
+            name='file_name',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.CreateModel(
+            name='ContentBlob',
+            fields=[
+                ('sha256', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('storage', models.CharField(max_length=20)),
+                ('key', models.CharField(max_length=2000)),
+                ('size', models.BigIntegerField()),
+                ('content_type', models.TextField(default='application/octet-stream')),
+                ('ref_count', models.IntegerField(default=0)),
+                ('unreferenced_since', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['ref_count', 'unreferenced_since'], name='contentblob_unreferenced_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='lectureslides',
+            name='blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='slides', to='lecturesessionsmanagement.contentblob'),
+        ),
+    ]
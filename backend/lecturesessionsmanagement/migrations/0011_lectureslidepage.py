@@ -0,0 +1,40 @@
+# Generated by Django 5.1.3 on 2026-10-18 12:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lecturesessionsmanagement', '0010_contentblob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lectureslides',
+            name='page_count',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='lectureslides',
+            name='processing_status',
+            field=models.TextField(default='unprocessed'),
+        ),
+        migrations.CreateModel(
+            name='LectureSlidePage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('page_number', models.IntegerField()),
+                ('text', models.TextField(blank=True, default='')),
+                ('width', models.FloatField()),
+                ('height', models.FloatField()),
+                ('thumbnail_url', models.URLField(max_length=2000)),
+                ('slides', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pages', to='lecturesessionsmanagement.lectureslides')),
+                ('thumbnail', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='thumbnail_pages', to='lecturesessionsmanagement.contentblob')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('slides', 'page_number'), name='unique_slide_page')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.3 on 2026-10-18 12:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lecturesessionsmanagement', '0011_lectureslidepage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lectureslides',
+            name='upload_key',
+            field=models.CharField(blank=True, default='', max_length=2000),
+        ),
+        migrations.AddConstraint(
+            model_name='lectureslides',
+            constraint=models.UniqueConstraint(condition=models.Q(('upload_key', ''), _negated=True), fields=('upload_key',), name='unique_slides_upload_key'),
+        ),
+    ]
@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from coursemanagement.models import Course
 
@@ -10,6 +12,12 @@ class LectureSession(models.Model):
     status = models.TextField(default="recording")
     call_id = models.CharField(max_length=6, default="123456")
 
+    class Meta:
+        indexes = [
+            # Latest session in a given state for a course (get_current_lecture_session_for_course)
+            models.Index(fields=["course", "status", "-date"], name="lecture_course_status_date_idx"),
+        ]
+
 class RecordingSession(models.Model):
     """Model for Recording Session"""
     id = models.AutoField(primary_key=True)
@@ -18,7 +26,85 @@ class RecordingSession(models.Model):
     file_path = models.CharField(max_length=2000)
     created_at = models.DateTimeField()
 
+class RecordingUpload(models.Model):
+    """Resumable chunked upload of a lecture recording; the RecordingSession is created once it is assembled"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    lecture_session = models.ForeignKey(LectureSession, on_delete=models.CASCADE)
+    recording_type = models.TextField()
+    file_name = models.CharField(max_length=255)
+    content_type = models.TextField(default="application/octet-stream")
+    total_size = models.BigIntegerField()
+    chunk_size = models.IntegerField()
+    # Blob storage backend ("s3" or "local") and its multipart upload ID, fixed when the upload is created
+    storage = models.CharField(max_length=10)
+    storage_upload_id = models.CharField(max_length=1024)
+    key = models.CharField(max_length=2000)
+    status = models.TextField(default="uploading")
+    recording_session = models.OneToOneField(RecordingSession, on_delete=models.SET_NULL, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+class RecordingUploadChunk(models.Model):
+    """One received chunk of a RecordingUpload"""
+    upload = models.ForeignKey(RecordingUpload, on_delete=models.CASCADE, related_name="chunks")
+    index = models.IntegerField()
+    size = models.IntegerField()
+    sha256 = models.CharField(max_length=64)
+    etag = models.CharField(max_length=255, blank=True, default="")
+    received_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["upload", "index"], name="unique_recording_upload_chunk"),
+        ]
+
+class ContentBlob(models.Model):
+    """A stored file addressed by the SHA-256 of its content, shared by every row that references it"""
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    # Logical blob store ("slides", "recordings", ...) and key the content is stored under
+    storage = models.CharField(max_length=20)
+    key = models.CharField(max_length=2000)
+    size = models.BigIntegerField()
+    content_type = models.TextField(default="application/octet-stream")
+    # Number of rows referencing the blob; unreferenced blobs are deleted by collect_content_blobs
+    ref_count = models.IntegerField(default=0)
+    unreferenced_since = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["ref_count", "unreferenced_since"], name="contentblob_unreferenced_idx"),
+        ]
+
 class LectureSlides(models.Model):
     id = models.AutoField(primary_key=True)
     file_slides = models.URLField(max_length=2000, default="")
-    lecture_session = models.ForeignKey(LectureSession, on_delete=models.CASCADE, blank=True, null=True)
\ No newline at end of file
+    lecture_session = models.ForeignKey(LectureSession, on_delete=models.CASCADE, blank=True, null=True)
+    file_name = models.CharField(max_length=255, blank=True, default="")
+    blob = models.ForeignKey(ContentBlob, on_delete=models.PROTECT, blank=True, null=True, related_name="slides")
+    # "unprocessed", "queued", "processing", "complete", "failed" or "skipped" (not a PDF)
+    processing_status = models.TextField(default="unprocessed")
+    page_count = models.IntegerField(blank=True, null=True)
+    # Staging key of the presigned upload the slides came from, so completing it again finds them
+    upload_key = models.CharField(max_length=2000, blank=True, default="")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["upload_key"], condition=~models.Q(upload_key=""),
+                                    name="unique_slides_upload_key"),
+        ]
+
+class LectureSlidePage(models.Model):
+    """One page of a slide deck: its text and a thumbnail, so a single slide can be shown without the PDF"""
+    slides = models.ForeignKey(LectureSlides, on_delete=models.CASCADE, related_name="pages")
+    page_number = models.IntegerField()
+    text = models.TextField(blank=True, default="")
+    width = models.FloatField()
+    height = models.FloatField()
+    thumbnail = models.ForeignKey(ContentBlob, on_delete=models.PROTECT, related_name="thumbnail_pages")
+    thumbnail_url = models.URLField(max_length=2000)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["slides", "page_number"], name="unique_slide_page"),
+        ]
\ No newline at end of file
@@ -0,0 +1,62 @@
+import io
+
+import pypdfium2
+
+"""
+PDF Page Rendering
+Runs inside the slide processing pool's worker processes, so it must not import Django:
+1. Each worker opens the deck once (`load_document`, the pool initializer).
+2. `render_page` extracts one page's text and renders a JPEG thumbnail THUMBNAIL_WIDTH pixels wide.
+"""
+
+THUMBNAIL_WIDTH = 320
+THUMBNAIL_QUALITY = 80
+THUMBNAIL_CONTENT_TYPE = "image/jpeg"
+
+_document = None
+
+
+def count_pages(pdf_bytes):
+    document = pypdfium2.PdfDocument(pdf_bytes)
+    try:
+        return len(document)
+    finally:
+        document.close()
+
+
+def load_document(pdf_bytes):
+    """Pool initializer: open the deck once per worker process."""
+    global _document
+    _document = pypdfium2.PdfDocument(pdf_bytes)
+
+
+def render_page(page_number):
+    """
+    Extract the text of a page and render its thumbnail.
+    Args:
+        page_number (int): 1-based page number.
+    Returns:
+        dict: page_number, text, width and height (in PDF points) and the JPEG thumbnail bytes.
+    """
+    page = _document[page_number - 1]
+    try:
+        width, height = page.get_size()
+        text_page = page.get_textpage()
+        try:
+            text = text_page.get_text_range()
+        finally:
+            text_page.close()
+
+        image = page.render(scale=THUMBNAIL_WIDTH / width).to_pil().convert("RGB")
+        thumbnail = io.BytesIO()
+        image.save(thumbnail, format="JPEG", quality=THUMBNAIL_QUALITY)
+    finally:
+        page.close()
+
+    return {
+        "page_number": page_number,
+        "text": text.replace("\r\n", "\n").strip(),
+        "width": width,
+        "height": height,
+        "thumbnail": thumbnail.getvalue(),
+    }
@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from .models import LectureSession, RecordingSession, LectureSlides
+from InkSightMVP.values_serializers import ValuesSerializer
+from InkSightMVP.chunked_uploads import chunk_count_for, received_ranges
+from .models import LectureSession, RecordingSession, LectureSlides, LectureSlidePage, RecordingUpload
 
 class LectureSessionSerializer(serializers.ModelSerializer):
     class Meta:
@@ -14,4 +16,63 @@ class RecordingSessionSerializer(serializers.ModelSerializer):
 class LectureSlidesSerializer(serializers.ModelSerializer):
     class Meta:
         model = LectureSlides
-        fields = ['id', 'file_slides', 'lecture_session_id']
\ No newline at end of file
+        fields = ['id', 'file_slides', 'file_name', 'blob', 'lecture_session_id', 'processing_status', 'page_count']
+
+class LectureSlidePageSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LectureSlidePage
+        fields = ['page_number', 'text', 'width', 'height', 'thumbnail_url']
+
+class LectureSlidePageValuesSerializer(ValuesSerializer):
+    """Read-only LectureSlidePageSerializer for list endpoints, built from .values() rows"""
+    class Meta:
+        model = LectureSlidePage
+        fields = LectureSlidePageSerializer.Meta.fields
+
+class RecordingUploadSerializer(serializers.ModelSerializer):
+    """Upload state for resuming: which chunks (and byte ranges) have been received and which are missing"""
+    chunk_count = serializers.SerializerMethodField()
+    received_chunks = serializers.SerializerMethodField()
+    missing_chunks = serializers.SerializerMethodField()
+    received_ranges = serializers.SerializerMethodField()
+    bytes_received = serializers.SerializerMethodField()
+
+    class Meta:
+        model = RecordingUpload
+        fields = ['id', 'lecture_session', 'recording_type', 'file_name', 'content_type', 'total_size',
+                  'chunk_size', 'chunk_count', 'status', 'recording_session', 'received_chunks', 'missing_chunks',
+                  'received_ranges', 'bytes_received', 'created_at', 'updated_at']
+
+    def _chunks(self, obj):
+        # (index, size) of every received chunk, fetched once per serialized upload
+        if not hasattr(obj, "_received_chunks"):
+            obj._received_chunks = list(obj.chunks.order_by("index").values_list("index", "size"))
+        return obj._received_chunks
+
+    def get_chunk_count(self, obj):
+        return chunk_count_for(obj.total_size, obj.chunk_size)
+
+    def get_received_chunks(self, obj):
+        return [index for index, size in self._chunks(obj)]
+
+    def get_missing_chunks(self, obj):
+        received = set(self.get_received_chunks(obj))
+        return [index for index in range(self.get_chunk_count(obj)) if index not in received]
+
+    def get_received_ranges(self, obj):
+        return received_ranges(self._chunks(obj), obj.chunk_size)
+
+    def get_bytes_received(self, obj):
+        return sum(size for index, size in self._chunks(obj))
+
+class LectureSessionValuesSerializer(ValuesSerializer):
+    """Read-only LectureSessionSerializer for list endpoints, built from .values() rows"""
+    class Meta:
+        model = LectureSession
+        fields = LectureSessionSerializer.Meta.fields
+
+class RecordingSessionValuesSerializer(ValuesSerializer):
+    """Read-only RecordingSessionSerializer for list endpoints, built from .values() rows"""
+    class Meta:
+        model = RecordingSession
+        fields = RecordingSessionSerializer.Meta.fields
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .content_blobs import add_reference, remove_reference
+from .models import LectureSlides, LectureSlidePage
+
+@receiver(post_save, sender=LectureSlides)
+def reference_slides_blob(sender, instance=None, created=False, **kwargs):
+    if created and instance.blob_id:
+        add_reference(instance.blob_id)
+
+@receiver(post_delete, sender=LectureSlides)
+def release_slides_blob(sender, instance=None, **kwargs):
+    if instance.blob_id:
+        remove_reference(instance.blob_id)
+
+@receiver(post_save, sender=LectureSlidePage)
+def reference_page_thumbnail(sender, instance=None, created=False, **kwargs):
+    if created:
+        add_reference(instance.thumbnail_id)
+
+@receiver(post_delete, sender=LectureSlidePage)
+def release_page_thumbnail(sender, instance=None, **kwargs):
+    remove_reference(instance.thumbnail_id)
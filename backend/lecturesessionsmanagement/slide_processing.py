@@ -0,0 +1,109 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.db import transaction
+from jobqueuemanagement.jobs import enqueue
+from InkSightMVP.blob_storage import get_blob_storage
+from .content_blobs import add_references, store_content_bytes
+from .models import LectureSlides, LectureSlidePage
+from .pdf_pages import THUMBNAIL_CONTENT_TYPE, count_pages, load_document, render_page
+
+"""
+Slide Processing
+After a deck is uploaded, process_slides splits it into LectureSlidePage rows (text and a thumbnail per page)
+so the frontend can show one slide without downloading the whole PDF:
+1. Pages already processed for the same content (another LectureSlides with the same ContentBlob,
+   e.g. last week's upload of the same deck) are copied instead of rendered again.
+2. The remaining pages are rendered in parallel by a pool of SLIDE_PROCESSING_WORKERS processes,
+   each of which opens the PDF once.
+3. Each page is saved as soon as it is rendered, so a run that fails part-way keeps its finished pages
+   and a re-run only renders the rest.
+Thumbnails are content-addressed blobs in the "artifacts" store, shared by identical pages.
+"""
+
+PAGE_FIELDS = ["page_number", "text", "width", "height", "thumbnail_id", "thumbnail_url"]
+
+
+def queue_slide_processing(slides):
+    """Mark the slides as queued and queue a job to process them, in the caller's transaction."""
+    LectureSlides.objects.filter(pk=slides.pk).update(processing_status="queued")
+    slides.processing_status = "queued"
+    enqueue("slides.process", slides_id=slides.pk)
+
+
+def is_pdf(blob):
+    # Browsers do not always send a content type, so check the file's magic number with a range read
+    return get_blob_storage(blob.storage).read(blob.key, 0, 5) == b"%PDF-"
+
+
+def process_slides(slides_id):
+    """
+    Split a deck into LectureSlidePage rows. Safe to re-run: finished pages are kept, and a job that
+    fails is retried by the job queue.
+    Args:
+        slides_id (int): The ID of the LectureSlides to process.
+    """
+    slides = LectureSlides.objects.select_related("blob").filter(pk=slides_id).first()
+    if slides is None:
+        return
+    if slides.blob is None or not is_pdf(slides.blob):
+        LectureSlides.objects.filter(pk=slides_id).update(processing_status="skipped")
+        return
+
+    LectureSlides.objects.filter(pk=slides_id).update(processing_status="processing")
+    try:
+        pdf_bytes = get_blob_storage(slides.blob.storage).read(slides.blob.key)
+        page_count = count_pages(pdf_bytes)
+        done = copy_processed_pages(slides, page_count)
+        missing = [number for number in range(1, page_count + 1) if number not in done]
+        if missing:
+            render_pages(slides, pdf_bytes, missing)
+    except Exception:
+        LectureSlides.objects.filter(pk=slides_id).update(processing_status="failed")
+        raise
+
+    LectureSlides.objects.filter(pk=slides_id).update(processing_status="complete", page_count=page_count)
+
+
+def copy_processed_pages(slides, page_count):
+    """
+    Copy pages already processed for the same content onto these slides.
+    Returns:
+        set: Page numbers these slides now have.
+    """
+    done = set(slides.pages.values_list("page_number", flat=True))
+    cached = {}
+    for page in (LectureSlidePage.objects
+                 .filter(slides__blob_id=slides.blob_id, page_number__lte=page_count)
+                 .exclude(slides=slides).exclude(page_number__in=done)
+                 .values(*PAGE_FIELDS)):
+        cached.setdefault(page["page_number"], page)
+
+    if cached:
+        with transaction.atomic():
+            LectureSlidePage.objects.bulk_create([LectureSlidePage(slides=slides, **page) for page in cached.values()])
+            # bulk_create sends no post_save signals, so count the thumbnail references here
+            add_references(page["thumbnail_id"] for page in cached.values())
+    return done | set(cached)
+
+
+def render_pages(slides, pdf_bytes, page_numbers):
+    """Render pages in a process pool and save each one as it finishes."""
+    workers = max(1, min(settings.SLIDE_PROCESSING_WORKERS, len(page_numbers)))
+    # Workers are spawned, not forked, so they do not inherit this process's threads or database connections
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=load_document, initargs=(pdf_bytes,)) as pool:
+        for future in as_completed([pool.submit(render_page, number) for number in page_numbers]):
+            page = future.result()
+            with transaction.atomic():
+                thumbnail = store_content_bytes("artifacts", page["thumbnail"], THUMBNAIL_CONTENT_TYPE)
+                LectureSlidePage.objects.create(
+                    slides=slides,
+                    page_number=page["page_number"],
+                    text=page["text"],
+                    width=page["width"],
+                    height=page["height"],
+                    thumbnail=thumbnail,
+                    thumbnail_url=get_blob_storage(thumbnail.storage).url(thumbnail.key),
+                )
@@ -0,0 +1,11 @@
+from jobqueuemanagement.jobs import task
+from .slide_processing import process_slides
+
+"""
+Background tasks of this app, run by the job queue (see jobqueuemanagement/jobs.py).
+"""
+
+
+@task("slides.process")
+def process_slides_task(slides_id):
+    process_slides(slides_id)
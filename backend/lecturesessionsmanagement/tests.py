@@ -1,3 +1,708 @@
-from django.test import TestCase
+import hashlib
+import importlib.util
+import os
+import tempfile
+import threading
+from io import BytesIO, StringIO
+import unittest
+from datetime import datetime, time, timedelta, timezone
+from unittest import mock
 
-# Create your tests here.
+from urllib.parse import urlencode
+
+import requests
+from botocore.exceptions import ClientError
+from PIL import Image
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from InkSightMVP import aws_auth, uploads
+from InkSightMVP.blob_storage import BlobNotFound, BlobStorageError, LocalBlobStorage, get_blob_storage
+from InkSightMVP.uploads import UPLOAD_PART_SIZE, StoredUploadedFile, get_upload_progress
+from InkSightMVP.values_serializer_assertions import ValuesSerializerAssertionsMixin
+from coursemanagement.models import Course
+from schoolmanagement.models import School
+from usermanagement.models import User, SDSCoordinator
+from django.core.management import call_command
+from jobqueuemanagement.models import Job
+from .content_blobs import content_key, store_content_blob
+from .models import ContentBlob, LectureSession, LectureSlides, LectureSlidePage, RecordingSession, RecordingUpload
+from .serializers import (
+    LectureSessionSerializer, RecordingSessionSerializer,
+    LectureSessionValuesSerializer, RecordingSessionValuesSerializer,
+)
+from .slide_processing import process_slides
+
+FAKE_AWS_ENVIRONMENT = {
+    "AWS_ACCESS_KEY_ID": "testing",
+    "AWS_SECRET_ACCESS_KEY": "testing",
+    "AWS_SESSION_TOKEN": "testing",
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "AWS_COGNITO_REGION": "us-east-1",
+}
+
+
+class MotoAWSMixin:
+    """Runs each test against moto's in-memory Cognito and S3, with the slides bucket created"""
+
+    def setUp(self):
+        super().setUp()
+        from moto import mock_aws
+
+        environment = mock.patch.dict(os.environ, FAKE_AWS_ENVIRONMENT)
+        environment.start()
+        self.addCleanup(environment.stop)
+
+        aws = mock_aws()
+        aws.start()
+        self.addCleanup(aws.stop)
+
+        import boto3
+        pool = boto3.client("cognito-identity").create_identity_pool(
+            IdentityPoolName="inksight", AllowUnauthenticatedIdentities=True
+        )
+        os.environ["AWS_COGNITO_IDENTITY_POOL_ARN"] = pool["IdentityPoolId"]
+        boto3.client("s3").create_bucket(Bucket="inksightslidestorage")
+
+        aws_auth.reset_aws_clients()
+        self.addCleanup(aws_auth.reset_aws_clients)
+
+    def fetch_with_expiry(self, *lifetimes):
+        """
+        Patch the credential fetch so successive calls expire after the given lifetimes, the last one repeating
+        (moto's credentials expire after 90 seconds, well inside botocore's refresh window).
+        """
+        real_fetch = aws_auth.CognitoCredentialProvider._fetch_metadata
+        lifetimes = list(lifetimes)
+
+        def fetch(provider):
+            metadata = real_fetch(provider)
+            lifetime = lifetimes.pop(0) if len(lifetimes) > 1 else lifetimes[0]
+            metadata["expiry_time"] = (datetime.now(timezone.utc) + lifetime).isoformat()
+            return metadata
+
+        return mock.patch.object(aws_auth.CognitoCredentialProvider, "_fetch_metadata", autospec=True, side_effect=fetch)
+
+
+@unittest.skipUnless(importlib.util.find_spec("moto"), "moto is not installed")
+class S3ClientTests(MotoAWSMixin, SimpleTestCase):
+    """Uploads reuse one S3 client and one set of Cognito credentials per process"""
+
+    def test_client_and_credentials_are_reused(self):
+        with self.fetch_with_expiry(timedelta(hours=1)) as fetch:
+            first = settings.GETS3CLIENT()
+            second = settings.GETS3CLIENT()
+            for index in range(3):
+                first.put_object(Bucket="inksightslidestorage", Key=f"uploads/1/slides-{index}.pdf", Body=b"%PDF")
+            listed = second.list_objects_v2(Bucket="inksightslidestorage", Prefix="uploads/1/")
+
+        self.assertIs(first, second)
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(listed["KeyCount"], 3)
+
+    def test_credentials_refresh_shortly_before_expiry(self):
+        # The first credentials expire inside botocore's refresh window, so the next request refreshes them
+        with self.fetch_with_expiry(timedelta(minutes=5), timedelta(hours=1)) as fetch:
+            client = settings.GETS3CLIENT()
+            identity_id = aws_auth.credential_provider._identity_id
+            client.list_objects_v2(Bucket="inksightslidestorage")
+            client.list_objects_v2(Bucket="inksightslidestorage")
+
+        self.assertEqual(fetch.call_count, 2)
+        self.assertEqual(aws_auth.credential_provider._identity_id, identity_id)
+
+
+# The tests run in one process, so a local memory cache stands in for the shared one
+@unittest.skipUnless(importlib.util.find_spec("moto"), "moto is not installed")
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+                   CACHE_IS_SHARED=True)
+class StreamingSlideUploadTests(MotoAWSMixin, TestCase):
+    """Slide uploads are streamed to S3 in parts without a local temporary file"""
+
+    def setUp(self):
+        super().setUp()
+        credentials = self.fetch_with_expiry(timedelta(hours=1))
+        credentials.start()
+        self.addCleanup(credentials.stop)
+
+        cache.clear()
+        self.user = User.objects.create(email="prof@test.edu", name="Prof")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.s3 = settings.GETS3CLIENT()
+        # Slightly more than two parts, so the upload has two full parts and a short last one
+        self.content = os.urandom(2 * UPLOAD_PART_SIZE + 1024)
+
+    def upload(self, name="deck.pdf", **params):
+        query = f"?{urlencode(params)}" if params else ""
+        return self.client.post(f"/lecturesessionsmanagement/lecture-sessions/7/upload_slides{query}",
+                                {"file": SimpleUploadedFile(name, self.content, content_type="application/pdf")},
+                                format="multipart")
+
+    def test_file_is_streamed_in_parts(self):
+        with mock.patch("django.core.files.storage.default_storage.save") as save:
+            response = self.upload(upload_id="abc123")
+
+        self.assertEqual(response.status_code, 200)
+        save.assert_not_called()
+        self.assertEqual(response.json()["upload"]["parts_uploaded"], 3)
+        key = content_key(hashlib.sha256(self.content).hexdigest())
+        stored = self.s3.get_object(Bucket="inksightslidestorage", Key=key)
+        self.assertEqual(stored["Body"].read(), self.content)
+        self.assertEqual(stored["ContentType"], "application/pdf")
+        self.assertTrue(LectureSlides.objects.filter(file_slides__endswith=key, file_name="deck.pdf").exists())
+        self.assertEqual(self.s3.list_objects_v2(Bucket="inksightslidestorage", Prefix="staging/")["KeyCount"], 0)
+
+        progress = self.client.get("/lecturesessionsmanagement/slides/uploads/abc123/progress").json()
+        self.assertEqual((progress["status"], progress["bytes_received"]), ("complete", len(self.content)))
+
+        # Progress is kept per user: another user polling the same upload ID finds nothing
+        other = APIClient()
+        other.force_authenticate(User.objects.create(email="other@test.edu", name="Other"))
+        self.assertEqual(other.get("/lecturesessionsmanagement/slides/uploads/abc123/progress").status_code, 404)
+
+    @override_settings(CACHE_IS_SHARED=False)
+    def test_progress_needs_a_shared_cache(self):
+        self.assertEqual(self.upload(upload_id="abc123").status_code, 200)
+
+        # The poll would be served by another worker, whose local cache never saw the upload
+        response = self.client.get("/lecturesessionsmanagement/slides/uploads/abc123/progress")
+        self.assertEqual(response.status_code, 501)
+        self.assertIn("shared", response.json()["error"])
+        self.assertIsNone(get_upload_progress(self.user.pk, "abc123"))
+
+    def test_failed_part_aborts_the_upload(self):
+        real_upload_part = self.s3.upload_part
+
+        def fail_second_part(**kwargs):
+            if kwargs["PartNumber"] == 2:
+                raise ClientError({"Error": {"Code": "SlowDown", "Message": "Reduce your request rate."}}, "UploadPart")
+            return real_upload_part(**kwargs)
+
+        with mock.patch.object(self.s3, "upload_part", side_effect=fail_second_part):
+            response = self.upload(upload_id="failed")
+
+        self.assertEqual(response.status_code, 502)
+        details = response.json()["upload"]
+        self.assertEqual((details["error_code"], details["parts_uploaded"]), ("SlowDown", 1))
+        self.assertNotIn("Uploads", self.s3.list_multipart_uploads(Bucket="inksightslidestorage"))
+        self.assertFalse(LectureSlides.objects.exists())
+        self.assertEqual(get_upload_progress(self.user.pk, "failed")["status"], "failed")
+
+
+class BlobStorageContract:
+    """Behaviour every blob storage backend must share; subclasses set self.storage"""
+
+    def test_write_read_and_range_reads(self):
+        self.storage.write("frames/1/0001.jpg", b"0123456789", content_type="image/jpeg")
+
+        info = self.storage.stat("frames/1/0001.jpg")
+        self.assertEqual((info.size, info.content_type), (10, "image/jpeg"))
+        self.assertEqual(self.storage.read("frames/1/0001.jpg"), b"0123456789")
+        self.assertEqual(self.storage.read("frames/1/0001.jpg", 2, 5), b"234")
+        self.assertEqual(b"".join(self.storage.open("frames/1/0001.jpg", 7, chunk_size=1)), b"789")
+        self.assertEqual(self.storage.key_from_url(self.storage.url("frames/1/0001.jpg")), "frames/1/0001.jpg")
+
+    def test_batched_delete_and_missing_blobs(self):
+        keys = [f"transcripts/{index}.json" for index in range(3)]
+        for key in keys:
+            self.storage.write(key, b"{}", content_type="application/json")
+
+        self.assertEqual(self.storage.delete_many(keys + ["transcripts/missing.json"]), 4)
+        self.assertFalse(any(self.storage.exists(key) for key in keys))
+        with self.assertRaises(BlobNotFound):
+            self.storage.open("transcripts/0.json")
+
+    def test_multipart_upload(self):
+        upload_id = self.storage.create_multipart("recordings/lecture.webm", "video/webm")
+        first = os.urandom(UPLOAD_PART_SIZE)
+        parts = [(2, self.storage.upload_part("recordings/lecture.webm", upload_id, 2, b"tail")),
+                 (1, self.storage.upload_part("recordings/lecture.webm", upload_id, 1, first))]
+        self.assertEqual([number for number, etag in self.storage.list_parts("recordings/lecture.webm", upload_id)],
+                         [1, 2])
+
+        self.storage.complete_multipart("recordings/lecture.webm", upload_id, sorted(parts))
+        self.assertEqual(self.storage.read("recordings/lecture.webm"), first + b"tail")
+        self.assertEqual(self.storage.stat("recordings/lecture.webm").content_type, "video/webm")
+
+
+class LocalBlobStorageTests(BlobStorageContract, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.storage = LocalBlobStorage(root.name)
+
+    def test_keys_cannot_escape_the_root(self):
+        with self.assertRaises(BlobStorageError):
+            self.storage.write("../outside.txt", b"x")
+
+
+@unittest.skipUnless(importlib.util.find_spec("moto"), "moto is not installed")
+class S3BlobStorageTests(BlobStorageContract, MotoAWSMixin, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        credentials = self.fetch_with_expiry(timedelta(hours=1))
+        credentials.start()
+        self.addCleanup(credentials.stop)
+        self.storage = get_blob_storage("artifacts", backend="s3")
+
+
+@unittest.skipUnless(importlib.util.find_spec("moto"), "moto is not installed")
+class PresignedUploadTests(MotoAWSMixin, TestCase):
+    """Presigned uploads go straight to the bucket; the row is only created once the object is there"""
+
+    def setUp(self):
+        super().setUp()
+        credentials = self.fetch_with_expiry(timedelta(hours=1))
+        credentials.start()
+        self.addCleanup(credentials.stop)
+
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(email="prof@test.edu", name="Prof"))
+        self.s3 = settings.GETS3CLIENT()
+
+        school = School.objects.create(name="Test University")
+        coordinator = SDSCoordinator.objects.create(email="sds@test.edu", name="SDS", school=school, position="Lead")
+        course = Course.objects.create(name="Course", school=school, sds_coordinator=coordinator, term="Fall",
+                                       course_uid=1000, meeting_time=time(9, 30), campus="Main")
+        self.lecture = LectureSession.objects.create(date=datetime.now(timezone.utc), course=course)
+
+    def complete(self, upload):
+        return self.client.post("/lecturesessionsmanagement/uploads/complete",
+                                {"upload_token": upload["upload_token"]}, format="json")
+
+    def test_slides_are_created_after_a_single_put(self):
+        content = b"%PDF-1.7 slides"
+        upload = self.client.post("/lecturesessionsmanagement/lecture-sessions/7/slides/presign",
+                                  {"file_name": "../week 1.pdf", "content_type": "application/pdf",
+                                   "size": len(content)}, format="json").json()
+        self.assertRegex(upload["key"], r"^uploads/7/[0-9a-f-]{36}/week_1\.pdf$")
+
+        # Nothing has been uploaded yet
+        self.assertEqual(self.complete(upload).status_code, 409)
+        self.assertFalse(LectureSlides.objects.exists())
+
+        self.assertEqual(requests.put(upload["url"], data=content, headers=upload["headers"]).status_code, 200)
+        response = self.complete(upload)
+
+        self.assertEqual(response.status_code, 201)
+        # Stored by content hash and queued for processing, like uploaded slides
+        sha256 = hashlib.sha256(content).hexdigest()
+        slides = LectureSlides.objects.get()
+        self.assertEqual((slides.blob_id, slides.file_name, slides.processing_status), (sha256, "week_1.pdf", "queued"))
+        self.assertTrue(response.json()["slides"]["file_slides"].endswith(content_key(sha256)))
+        self.assertEqual(Job.objects.get().kwargs, {"slides_id": slides.pk})
+        self.assertFalse(get_blob_storage("slides").exists(upload["key"]))
+        # Completing again returns the same row
+        self.assertEqual(self.complete(upload).status_code, 200)
+        self.assertEqual(LectureSlides.objects.count(), 1)
+
+        # The same deck uploaded again reuses the stored blob
+        again = self.client.post("/lecturesessionsmanagement/lecture-sessions/7/slides/presign",
+                                 {"file_name": "week 1.pdf", "content_type": "application/pdf"}, format="json").json()
+        requests.put(again["url"], data=content, headers=again["headers"])
+        self.assertTrue(self.complete(again).json()["deduplicated"])
+        self.assertEqual(ContentBlob.objects.get().ref_count, 2)
+        self.assertFalse(get_blob_storage("slides").exists(again["key"]))
+
+    def test_large_recording_uses_multipart(self):
+        content = os.urandom(2 * UPLOAD_PART_SIZE + 1024)
+        with mock.patch.object(uploads, "PRESIGNED_MULTIPART_THRESHOLD", UPLOAD_PART_SIZE):
+            upload = self.client.post(f"/lecturesessionsmanagement/recording-sessions/{self.lecture.pk}/presign",
+                                      {"file_name": "lecture.webm", "content_type": "video/webm",
+                                       "recording_type": "video", "size": len(content)}, format="json").json()
+
+        self.assertEqual(len(upload["parts"]), 3)
+        for part in upload["parts"]:
+            offset = (part["part_number"] - 1) * upload["part_size"]
+            chunk = content[offset:offset + upload["part_size"]]
+            self.assertEqual(requests.put(part["url"], data=chunk).status_code, 200)
+        response = self.complete(upload)
+
+        self.assertEqual(response.status_code, 201)
+        recording = RecordingSession.objects.get()
+        self.assertEqual((recording.lecture_session_id, recording.recording_type), (self.lecture.pk, "video"))
+        self.assertTrue(upload["key"].startswith(f"recordings/{self.lecture.pk}/"))
+        stored = self.s3.get_object(Bucket="inksightslidestorage", Key=upload["key"])
+        self.assertEqual(stored["Body"].read(), content)
+        self.assertEqual(stored["ContentType"], "video/webm")
+
+    def test_uploads_with_the_same_name_get_their_own_keys(self):
+        keys = {
+            self.client.post("/lecturesessionsmanagement/lecture-sessions/7/slides/presign",
+                             {"file_name": "lecture.pdf"}, format="json").json()["key"]
+            for _ in range(2)
+        }
+        self.assertEqual(len(keys), 2)
+
+    def test_tampered_token_and_missing_lecture_session_are_rejected(self):
+        upload = self.client.post("/lecturesessionsmanagement/lecture-sessions/7/slides/presign",
+                                  {"file_name": "deck.pdf"}, format="json").json()
+        upload["upload_token"] += "x"
+        self.assertEqual(self.complete(upload).status_code, 400)
+
+        response = self.client.post("/lecturesessionsmanagement/recording-sessions/999/presign",
+                                    {"file_name": "lecture.webm", "recording_type": "video"}, format="json")
+        self.assertEqual(response.status_code, 404)
+
+
+class RecordingUploadMixin:
+    """A lecture session to attach recordings to, and helpers for the chunked upload protocol"""
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(email="prof@test.edu", name="Prof"))
+        school = School.objects.create(name="Test University")
+        coordinator = SDSCoordinator.objects.create(email="sds@test.edu", name="SDS", school=school, position="Lead")
+        course = Course.objects.create(name="Course", school=school, sds_coordinator=coordinator, term="Fall",
+                                       course_uid=1000, meeting_time=time(9, 30), campus="Main")
+        self.lecture = LectureSession.objects.create(date=datetime.now(timezone.utc), course=course)
+
+    def start(self, content):
+        return self.client.post("/lecturesessionsmanagement/recording-uploads/", {
+            "lecture_session_id": self.lecture.pk, "recording_type": "video", "file_name": "lecture.webm",
+            "content_type": "video/webm", "total_size": len(content),
+        }, format="json").json()
+
+    def send_chunk(self, upload, index, content, checksum=None):
+        chunk = content[index * upload["chunk_size"]:(index + 1) * upload["chunk_size"]]
+        return self.client.put(f"/lecturesessionsmanagement/recording-uploads/{upload['id']}/chunks/{index}",
+                               chunk, content_type="application/octet-stream",
+                               HTTP_X_CHUNK_SHA256=checksum or hashlib.sha256(chunk).hexdigest())
+
+    def complete(self, upload):
+        return self.client.post(f"/lecturesessionsmanagement/recording-uploads/{upload['id']}/complete")
+
+
+class ResumableRecordingUploadTests(RecordingUploadMixin, TestCase):
+    """Chunks survive a dropped connection; the recording is assembled once every chunk has arrived"""
+
+    def setUp(self):
+        super().setUp()
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.root = root.name
+        storage = override_settings(BLOB_STORAGE="local", BLOB_STORAGE_ROOT=self.root)
+        storage.enable()
+        self.addCleanup(storage.disable)
+        # Small chunks keep the test fast; the local store has no minimum part size
+        chunk_size = mock.patch("lecturesessionsmanagement.api.chunk_size_for", return_value=1000)
+        chunk_size.start()
+        self.addCleanup(chunk_size.stop)
+
+    def test_upload_resumes_after_a_disconnect(self):
+        content = os.urandom(3500)
+        upload = self.start(content)
+        self.assertEqual((upload["chunk_count"], upload["missing_chunks"]), (4, [0, 1, 2, 3]))
+
+        # The connection drops after chunks 0, 1 and 3 arrived, and chunk 2 was corrupted on the way
+        for index in (0, 1, 3):
+            self.assertEqual(self.send_chunk(upload, index, content).status_code, 200)
+        self.assertEqual(self.send_chunk(upload, 2, content, checksum="0" * 64).status_code, 400)
+        self.assertEqual(self.complete(upload).json()["missing_chunks"], [2])
+
+        progress = self.client.get(f"/lecturesessionsmanagement/recording-uploads/{upload['id']}").json()
+        self.assertEqual(progress["missing_chunks"], [2])
+        self.assertEqual(progress["received_ranges"], [[0, 2000], [3000, 3500]])
+        self.assertEqual(progress["bytes_received"], 2500)
+
+        # Resume: only the missing chunk is sent again
+        self.assertEqual(self.send_chunk(upload, 2, content).status_code, 200)
+        response = self.complete(upload)
+
+        self.assertEqual(response.status_code, 201)
+        recording = RecordingSession.objects.get()
+        self.assertEqual(response.json()["id"], recording.pk)
+        self.assertEqual((recording.lecture_session_id, recording.recording_type), (self.lecture.pk, "video"))
+        path = os.path.join(self.root, settings.RECORDINGS_BUCKET, RecordingUpload.objects.get().key)
+        with open(path, "rb") as assembled:
+            self.assertEqual(assembled.read(), content)
+        self.assertTrue(recording.file_path.endswith("/lecture.webm"))
+
+        # The assembled file can be streamed back, whole or by range
+        download = self.client.get(f"/lecturesessionsmanagement/recording-sessions/{recording.pk}/file",
+                                   HTTP_RANGE="bytes=1000-1999")
+        self.assertEqual((download.status_code, download["Content-Range"]), (206, "bytes 1000-1999/3500"))
+        self.assertEqual(b"".join(download.streaming_content), content[1000:2000])
+        self.assertEqual(download["Content-Type"], "video/webm")
+
+        # Completing again returns the same recording session; the upload no longer accepts chunks
+        repeat = self.complete(upload)
+        self.assertEqual((repeat.status_code, repeat.json()["id"]), (200, recording.pk))
+        self.assertEqual(RecordingSession.objects.count(), 1)
+        self.assertEqual(self.send_chunk(upload, 0, content).status_code, 409)
+
+    def test_only_the_first_completion_creates_the_session(self):
+        content = os.urandom(1500)
+        upload = self.start(content)
+        for index in range(2):
+            self.assertEqual(self.send_chunk(upload, index, content).status_code, 200)
+
+        first, second = self.complete(upload), self.complete(upload)
+        self.assertEqual((first.status_code, second.status_code), (201, 200))
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(RecordingSession.objects.count(), 1)
+
+    def test_chunks_with_the_wrong_size_are_rejected(self):
+        content = os.urandom(1500)
+        upload = self.start(content)
+        self.assertEqual(self.send_chunk(upload, 0, content[:999]).status_code, 400)
+        self.assertEqual(self.send_chunk(upload, 2, content).status_code, 400)
+
+        self.assertEqual(self.client.delete(f"/lecturesessionsmanagement/recording-uploads/{upload['id']}").status_code, 204)
+        self.assertFalse(RecordingUpload.objects.exists())
+
+
+@unittest.skipUnless(importlib.util.find_spec("moto"), "moto is not installed")
+class S3RecordingUploadTests(RecordingUploadMixin, MotoAWSMixin, TestCase):
+    """With S3 storage the chunks are the parts of a multipart upload"""
+
+    def setUp(self):
+        super().setUp()
+        credentials = self.fetch_with_expiry(timedelta(hours=1))
+        credentials.start()
+        self.addCleanup(credentials.stop)
+
+    def test_chunks_are_assembled_in_s3(self):
+        content = os.urandom(UPLOAD_PART_SIZE + 1024)
+        upload = self.start(content)
+        for index in (1, 0):
+            self.assertEqual(self.send_chunk(upload, index, content).status_code, 200)
+        self.assertEqual(self.complete(upload).status_code, 201)
+
+        key = RecordingUpload.objects.get().key
+        stored = settings.GETS3CLIENT().get_object(Bucket="inksightslidestorage", Key=key)
+        self.assertEqual(stored["Body"].read(), content)
+        self.assertEqual(stored["ContentType"], "video/webm")
+
+
+class SlideDeduplicationTests(TestCase):
+    """Slides are stored once per distinct content and collected when nothing references them"""
+
+    def setUp(self):
+        super().setUp()
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.root = root.name
+        storage = override_settings(BLOB_STORAGE="local", BLOB_STORAGE_ROOT=self.root)
+        storage.enable()
+        self.addCleanup(storage.disable)
+
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(email="prof@test.edu", name="Prof"))
+        self.storage = get_blob_storage("slides")
+
+    def upload(self, name, content):
+        response = self.client.post("/lecturesessionsmanagement/lecture-sessions/7/upload_slides",
+                                    {"file": SimpleUploadedFile(name, content, content_type="application/pdf")},
+                                    format="multipart")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_reuploaded_deck_is_stored_once(self):
+        first = self.upload("week1.pdf", b"%PDF deck")
+        second = self.upload("week2.pdf", b"%PDF deck")
+        renamed = self.upload("week1.pdf", b"%PDF another deck")
+
+        self.assertEqual((first["deduplicated"], second["deduplicated"], renamed["deduplicated"]),
+                         (False, True, False))
+        self.assertEqual(first["slides"]["file_slides"], second["slides"]["file_slides"])
+        self.assertNotEqual(first["slides"]["file_slides"], renamed["slides"]["file_slides"])
+        self.assertEqual(ContentBlob.objects.get(pk=first["slides"]["blob"]).ref_count, 2)
+        # Same file name, different content: the first deck is not overwritten
+        self.assertEqual(self.storage.read(content_key(first["upload"]["sha256"])), b"%PDF deck")
+        # Staging copies are moved or deleted
+        staging = os.path.join(self.root, "inksightslidestorage", "staging")
+        self.assertEqual([files for directory, subdirectories, files in os.walk(staging) if files], [])
+
+    def test_known_hash_skips_the_upload(self):
+        sha256 = self.upload("week1.pdf", b"%PDF deck")["upload"]["sha256"]
+
+        response = self.client.post("/lecturesessionsmanagement/lecture-sessions/7/slides/existing",
+                                    {"sha256": sha256, "file_name": "week2.pdf"}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(ContentBlob.objects.get(pk=sha256).ref_count, 2)
+        response = self.client.post("/lecturesessionsmanagement/lecture-sessions/7/slides/existing",
+                                    {"sha256": "0" * 64}, format="json")
+        self.assertEqual(response.status_code, 404)
+
+    def test_unreferenced_blobs_are_collected(self):
+        shared = self.upload("week1.pdf", b"%PDF deck")
+        self.upload("week2.pdf", b"%PDF deck")
+        unused = self.upload("draft.pdf", b"%PDF draft")
+
+        LectureSlides.objects.filter(pk__in=[shared["slides"]["id"], unused["slides"]["id"]]).delete()
+        self.assertEqual(ContentBlob.objects.get(pk=shared["slides"]["blob"]).ref_count, 1)
+
+        # Within the grace period nothing is deleted
+        call_command("collect_content_blobs", stdout=StringIO())
+        self.assertEqual(ContentBlob.objects.count(), 2)
+
+        call_command("collect_content_blobs", grace_hours=0, stdout=StringIO())
+        self.assertEqual(list(ContentBlob.objects.values_list("pk", flat=True)), [shared["slides"]["blob"]])
+        self.assertTrue(self.storage.exists(content_key(shared["upload"]["sha256"])))
+        self.assertFalse(self.storage.exists(content_key(unused["upload"]["sha256"])))
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "needs concurrent transactions")
+class ConcurrentBlobStorageTests(TransactionTestCase):
+    """Concurrent first uploads of the same content share one blob instead of failing"""
+
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.storage = LocalBlobStorage(root.name)
+
+    def stage(self, key, content):
+        self.storage.write(key, content)
+        return StoredUploadedFile(name="deck.pdf", content_type="application/pdf", size=len(content), charset=None,
+                                  storage=self.storage, key=key, parts=None,
+                                  sha256=hashlib.sha256(content).hexdigest())
+
+    def test_second_upload_waits_and_reuses_the_blob(self):
+        first, second = self.stage("staging/a", b"%PDF deck"), self.stage("staging/b", b"%PDF deck")
+        inserted, commit = threading.Event(), threading.Event()
+        results = {}
+
+        def store(name, staged, hold=False):
+            try:
+                with transaction.atomic():
+                    results[name] = store_content_blob("slides", staged)
+                    if hold:
+                        inserted.set()
+                        commit.wait(5)
+            finally:
+                connection.close()
+
+        winner = threading.Thread(target=store, args=("winner", first, True))
+        winner.start()
+        inserted.wait(5)
+        loser = threading.Thread(target=store, args=("loser", second))
+        loser.start()
+        # The loser's insert waits for the winner's transaction
+        loser.join(0.5)
+        self.assertTrue(loser.is_alive())
+        commit.set()
+        winner.join(5)
+        loser.join(5)
+
+        self.assertEqual([created for blob, created in (results["winner"], results["loser"])], [True, False])
+        self.assertEqual(results["loser"][0].pk, results["winner"][0].pk)
+        self.assertEqual(ContentBlob.objects.count(), 1)
+        self.assertEqual(self.storage.read(content_key(first.sha256)), b"%PDF deck")
+        self.assertFalse(self.storage.exists("staging/a") or self.storage.exists("staging/b"))
+
+
+def make_pdf(*page_texts):
+    """A minimal PDF with one line of Helvetica text per page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        stream = f"BT /F1 24 Tf 72 300 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 640 360] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    pdf, offsets = b"%PDF-1.4\n", []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return pdf
+
+
+@override_settings(SLIDE_PROCESSING_WORKERS=2)
+class SlideProcessingTests(TestCase):
+    """Uploaded decks are split into pages with text and thumbnails; processed pages are reused"""
+
+    def setUp(self):
+        super().setUp()
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        storage = override_settings(BLOB_STORAGE="local", BLOB_STORAGE_ROOT=root.name)
+        storage.enable()
+        self.addCleanup(storage.disable)
+
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(email="prof@test.edu", name="Prof"))
+        self.deck = make_pdf("Welcome", "Agenda", "Questions")
+
+    def upload(self, name, content):
+        response = self.client.post("/lecturesessionsmanagement/lecture-sessions/7/upload_slides",
+                                    {"file": SimpleUploadedFile(name, content)}, format="multipart")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["slides"]["processing_status"], "queued")
+        call_command("run_job_worker", burst=True, concurrency=1, stdout=StringIO())
+        return LectureSlides.objects.get(pk=response.json()["slides"]["id"])
+
+    def test_pages_are_extracted(self):
+        slides = self.upload("week1.pdf", self.deck)
+
+        self.assertEqual((slides.processing_status, slides.page_count), ("complete", 3))
+        response = self.client.get(f"/lecturesessionsmanagement/slides/{slides.pk}/pages")
+        pages = response.json()
+        self.assertEqual(response["X-Processing-Status"], "complete")
+        self.assertEqual([(page["page_number"], page["text"]) for page in pages],
+                         [(1, "Welcome"), (2, "Agenda"), (3, "Questions")])
+        self.assertEqual((pages[0]["width"], pages[0]["height"]), (640, 360))
+
+        thumbnail = LectureSlidePage.objects.get(slides=slides, page_number=1).thumbnail
+        image = Image.open(BytesIO(get_blob_storage("artifacts").read(thumbnail.key)))
+        self.assertEqual((image.format, image.size), ("JPEG", (320, 180)))
+        self.assertEqual(thumbnail.ref_count, 1)
+
+    def test_reuploaded_deck_reuses_processed_pages(self):
+        first = self.upload("week1.pdf", self.deck)
+        # A previous run that stopped after the first page: the finished page is kept, the others rendered
+        LectureSlidePage.objects.filter(slides=first, page_number__gt=1).delete()
+        finished = LectureSlidePage.objects.get(slides=first, page_number=1).pk
+        process_slides(first.pk)
+        self.assertEqual(first.pages.count(), 3)
+        self.assertTrue(first.pages.filter(pk=finished).exists())
+
+        with mock.patch("lecturesessionsmanagement.slide_processing.render_pages") as render:
+            second = self.upload("week2.pdf", self.deck)
+        render.assert_not_called()
+        self.assertEqual(second.pages.count(), 3)
+        self.assertEqual(LectureSlidePage.objects.get(slides=first, page_number=2).thumbnail.ref_count, 2)
+
+    def test_other_files_are_skipped(self):
+        slides = self.upload("notes.txt", b"not a deck")
+        self.assertEqual((slides.processing_status, slides.pages.count()), ("skipped", 0))
+
+
+class ValuesSerializerEquivalenceTests(ValuesSerializerAssertionsMixin, TestCase):
+    """The .values() serializers must produce exactly the same JSON as the ModelSerializers"""
+
+    @classmethod
+    def setUpTestData(cls):
+        school = School.objects.create(name="Test University")
+        coordinator = SDSCoordinator.objects.create(email="sds@test.edu", name="SDS", school=school, position="Lead")
+        course = Course.objects.create(name="Course", school=school, sds_coordinator=coordinator, term="Fall",
+                                       course_uid=1000, meeting_time=time(9, 30), campus="Main")
+        # One timestamp with microseconds and one without, to cover both ISO 8601 forms
+        for moment in (datetime(2024, 9, 3, 10, 0, tzinfo=timezone.utc),
+                       datetime(2024, 9, 5, 10, 15, 30, 123456, tzinfo=timezone.utc)):
+            lecture = LectureSession.objects.create(title="Lecture", date=moment, course=course)
+            RecordingSession.objects.create(lecture_session=lecture, recording_type="audio",
+                                            file_path="recordings/lecture.mp3", created_at=moment)
+
+    def test_lecture_session_serializers_match(self):
+        self.assertSameOutput(LectureSessionSerializer, LectureSessionValuesSerializer, LectureSession.objects.all())
+
+    def test_recording_session_serializers_match(self):
+        self.assertSameOutput(RecordingSessionSerializer, RecordingSessionValuesSerializer, RecordingSession.objects.all())
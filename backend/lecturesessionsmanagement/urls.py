@@ -6,10 +6,21 @@ urlpatterns = [
     path("lecture-sessions/<int:lecture_session_id>/", get_lecture_session, name="get_lecture_session"),
     path("recording-sessions/", get_recording_sessions, name="get_recording_sessions"),
     path("recording-sessions/<int:recording_session_id>/", get_recording_session, name="get_recording_session"),
+    path("recording-sessions/<int:recording_session_id>/file", get_recording_session_file, name="get_recording_session_file"),
     path("lecture-sessions/add/", add_lecture_session, name="add_lecture_session"),
     path("lecture-sessions/<int:lecture_session_id>/update", update_lecture_session_status, name="update_lecture_session_status"),
     path("recording-sessions/add/", add_recording_session, name="add_recording_session"),
     path("<int:course_id>/current-lecture-session", get_current_lecture_session_for_course, name="get_current_lecture_session_for_course"),
     path("lecture-sessions/<int:course_id>/upload_slides", upload_lecture_session_slides, name="upload_lecture_session_slides"),
+    path("lecture-sessions/<int:course_id>/slides/existing", reuse_lecture_session_slides, name="reuse_lecture_session_slides"),
+    path("lecture-sessions/<int:course_id>/slides/presign", presign_slides_upload, name="presign_slides_upload"),
+    path("recording-sessions/<int:lecture_session_id>/presign", presign_recording_upload, name="presign_recording_upload"),
+    path("uploads/complete", complete_upload, name="complete_upload"),
+    path("recording-uploads/", create_recording_upload, name="create_recording_upload"),
+    path("recording-uploads/<uuid:upload_id>", recording_upload, name="recording_upload"),
+    path("recording-uploads/<uuid:upload_id>/chunks/<int:index>", upload_recording_chunk, name="upload_recording_chunk"),
+    path("recording-uploads/<uuid:upload_id>/complete", complete_recording_upload, name="complete_recording_upload"),
+    path("slides/<int:slides_id>/pages", get_slide_pages, name="get_slide_pages"),
+    path("slides/uploads/<str:upload_id>/progress", get_upload_progress_for_slides, name="get_upload_progress_for_slides"),
     path("lecture-sessions/<int:lecture_session_id>/<int:slides_id>", set_lecture_session_for_slides, name="set_lecture_session_for_slides")
 ]
@@ -4,9 +4,11 @@ from rest_framework import status
 from .models import NotesPacket, StudentNotePacket
 from lecturesessionsmanagement.models import LectureSession
 from .serializers import NotesPacketSerializer, StudentNotePacketSerializer
+from .serializers import NotesPacketValuesSerializer, StudentNotePacketValuesSerializer
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.decorators import api_view
+from InkSightMVP.pagination import list_response
 
 """
 GET (Notes Packet Management) Methods
@@ -22,12 +24,12 @@ def get_notes_packets(request):
     """
     Retrieve all notes packets.
     Fetches all notes packets available in the database and returns them in JSON format.
+    Pass ?limit= (and the returned ?cursor=) to page through the results.
     Returns:
         JSON response containing all notes packets.
     """
     notes_packets = NotesPacket.objects.all()
-    serializer = NotesPacketSerializer(notes_packets, many=True)
-    return Response(serializer.data)
+    return list_response(request, notes_packets, NotesPacketValuesSerializer)
 
 @api_view(['GET'])
 def get_note_packet(request, note_packet_id):
@@ -51,12 +53,12 @@ def get_student_notes_packets(request):
     """
     Retrieve all notes packets.
     Fetches all notes packets available in the database and returns them in JSON format.
+    Pass ?limit= (and the returned ?cursor=) to page through the results.
     Returns:
         JSON response containing all notes packets.
     """
     notes_packets = StudentNotePacket.objects.all()
-    serializer = StudentNotePacketSerializer(notes_packets, many=True)
-    return Response(serializer.data)
+    return list_response(request, notes_packets, StudentNotePacketValuesSerializer, ordering=("-time", "-id"))
 
 @api_view(['GET'])
 def get_student_note_packet(request, student_note_packet_id):
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-18 11:57
+
+from django.db import migrations, models
+
+from InkSightMVP.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without blocking writes to the table
+    atomic = False
+
+    dependencies = [
+        ('coursemanagement', '0004_professorcourse_professorcourse_prof_crs_idx_and_more'),
+        ('lecturesessionsmanagement', '0008_lecturesession_lecture_course_status_date_idx'),
+        ('notepacketsmanagement', '0007_alter_notespacket_edit_history'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='notespacket',
+            index=models.Index(fields=['course', 'status'], name='notespacket_course_status_idx'),
+        ),
+    ]
@@ -11,6 +11,11 @@ class NotesPacket(models.Model):
     lecture_session = models.ForeignKey(LectureSession, on_delete=models.CASCADE, default=1)
     status = models.TextField(default="draft") # states can be draft, edits, approved
     edit_history = models.JSONField(default=dict)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["course", "status"], name="notespacket_course_status_idx"),
+        ]
  
 class StudentNotePacket(models.Model):
     """Model for creating Student Notes packet"""
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from InkSightMVP.values_serializers import ValuesSerializer
 from .models import NotesPacket, StudentNotePacket
 
 class NotesPacketSerializer(serializers.ModelSerializer):
@@ -11,4 +12,16 @@ class StudentNotePacketSerializer(serializers.ModelSerializer):
     """Serializer got StudentNotePacket"""
     class Meta:
         model = StudentNotePacket
-        fields = ['id', 'student_id', 'lecture_session_id', 'title', 'time']
\ No newline at end of file
+        fields = ['id', 'student_id', 'lecture_session_id', 'title', 'time']
+
+class NotesPacketValuesSerializer(ValuesSerializer):
+    """Read-only NotesPacketSerializer for list endpoints, built from .values() rows"""
+    class Meta:
+        model = NotesPacket
+        fields = NotesPacketSerializer.Meta.fields
+
+class StudentNotePacketValuesSerializer(ValuesSerializer):
+    """Read-only StudentNotePacketSerializer for list endpoints, built from .values() rows"""
+    class Meta:
+        model = StudentNotePacket
+        fields = StudentNotePacketSerializer.Meta.fields
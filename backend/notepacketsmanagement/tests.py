@@ -1,3 +1,42 @@
+from datetime import datetime, time, timezone
+
 from django.test import TestCase
 
-# Create your tests here.
+from InkSightMVP.values_serializer_assertions import ValuesSerializerAssertionsMixin
+from schoolmanagement.models import School
+from usermanagement.models import Student, SDSCoordinator
+from coursemanagement.models import Course
+from lecturesessionsmanagement.models import LectureSession, RecordingSession
+from .models import NotesPacket, StudentNotePacket
+from .serializers import (
+    NotesPacketSerializer, StudentNotePacketSerializer,
+    NotesPacketValuesSerializer, StudentNotePacketValuesSerializer,
+)
+
+
+class ValuesSerializerEquivalenceTests(ValuesSerializerAssertionsMixin, TestCase):
+    """The .values() serializers must produce exactly the same JSON as the ModelSerializers"""
+
+    @classmethod
+    def setUpTestData(cls):
+        school = School.objects.create(name="Test University")
+        coordinator = SDSCoordinator.objects.create(email="sds@test.edu", name="SDS", school=school, position="Lead")
+        student = Student.objects.create(email="student@test.edu", name="Student", school=school, year=2,
+                                         disability="ADHD", sds_coordinator=coordinator)
+        course = Course.objects.create(name="Course", school=school, sds_coordinator=coordinator, term="Fall",
+                                       course_uid=1000, meeting_time=time(9, 30), campus="Main")
+        # One timestamp with microseconds and one without, to cover both ISO 8601 forms
+        for moment in (datetime(2024, 9, 3, 10, 0, tzinfo=timezone.utc),
+                       datetime(2024, 9, 5, 10, 15, 30, 123456, tzinfo=timezone.utc)):
+            lecture = LectureSession.objects.create(title="Lecture", date=moment, course=course)
+            RecordingSession.objects.create(lecture_session=lecture, recording_type="audio",
+                                            file_path="recordings/lecture.mp3", created_at=moment)
+            NotesPacket.objects.create(notes={"sections": [{"heading": "Intro", "body": "Text"}]},
+                                       course=course, lecture_session=lecture)
+            StudentNotePacket.objects.create(student=student, lecture_session=lecture, title="Notes", time=moment)
+
+    def test_notes_packet_serializers_match(self):
+        self.assertSameOutput(NotesPacketSerializer, NotesPacketValuesSerializer, NotesPacket.objects.all())
+
+    def test_student_note_packet_serializers_match(self):
+        self.assertSameOutput(StudentNotePacketSerializer, StudentNotePacketValuesSerializer, StudentNotePacket.objects.all())
@@ -5,7 +5,8 @@ from .models import NoteTakingRequest
 from coursemanagement.models import StudentCourse
 from usermanagement.models import Student
 from usermanagement.serializers import StudentSerializer
-from .serializers import NoteTakingRequestSerializer
+from .serializers import NoteTakingRequestSerializer, NoteTakingRequestValuesSerializer
+from InkSightMVP.pagination import list_response
 
 """
 GET (Note Taking Request Management) Methods
@@ -21,12 +22,12 @@ def get_note_taking_requests(request):
     """
     Retrieve all note-taking requests.
     Fetches all note-taking requests available in the database and returns them in JSON format.
+    Pass ?limit= (and the returned ?cursor=) to page through the results.
     Returns:
         JSON response containing all note-taking requests.
     """
     notes_packets = NoteTakingRequest.objects.all()
-    serializer = NoteTakingRequestSerializer(notes_packets, many=True)
-    return Response(serializer.data)
+    return list_response(request, notes_packets, NoteTakingRequestValuesSerializer)
 
 @api_view(['GET'])
 def get_note_taking_request(request, note_taking_request_id):
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-18 11:57
+
+from django.db import migrations, models
+
+from InkSightMVP.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without blocking writes to the table
+    atomic = False
+
+    dependencies = [
+        ('coursemanagement', '0004_professorcourse_professorcourse_prof_crs_idx_and_more'),
+        ('notetakingrequestmanagement', '0001_initial'),
+        ('usermanagement', '0004_rename_assigned_professor_teacherassistant_assigned_professor_course_and_more'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='notetakingrequest',
+            index=models.Index(fields=['student_course', 'approved'], name='request_course_approved_idx'),
+        ),
+    ]
@@ -10,6 +10,11 @@ class NoteTakingRequest(models.Model):
     sdscoordinator = models.ForeignKey(SDSCoordinator, on_delete=models.CASCADE)
     approved = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["student_course", "approved"], name="request_course_approved_idx"),
+        ]
+
     def __str__(self):
         return f"Request {self.id} for Course {self.course.name}"
      
\ No newline at end of file
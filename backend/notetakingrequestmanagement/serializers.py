@@ -1,8 +1,15 @@
 from rest_framework import serializers
+from InkSightMVP.values_serializers import ValuesSerializer
 from .models import NoteTakingRequest
 
 class NoteTakingRequestSerializer(serializers.ModelSerializer):
     """Serializer For NoteTakingRequest"""
     class Meta:
         model = NoteTakingRequest
-        fields = ['id', 'request', 'student_course_id', 'sdscoordinator_id', 'approved']
\ No newline at end of file
+        fields = ['id', 'request', 'student_course_id', 'sdscoordinator_id', 'approved']
+
+class NoteTakingRequestValuesSerializer(ValuesSerializer):
+    """Read-only NoteTakingRequestSerializer for list endpoints, built from .values() rows"""
+    class Meta:
+        model = NoteTakingRequest
+        fields = NoteTakingRequestSerializer.Meta.fields
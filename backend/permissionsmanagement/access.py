@@ -0,0 +1,130 @@
+import functools
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import NotAuthenticated, PermissionDenied
+from InkSightMVP.cache_stats import register_cache_stats
+from .models import Permissions
+
+"""
+Permission Checks
+A user's Permissions flags are compiled into one integer (bit i = PERMISSION_FLAGS[i]) and cached:
+1. get_permission_mask loads the user's Permissions row once (an indexed lookup on Permissions.user)
+   and caches the mask for PERMISSION_CACHE_TIMEOUT seconds; users without a row are cached as 0.
+2. has_permissions and @requires test bits of the cached mask, so a cache hit costs no query.
+3. Saving or deleting a Permissions row drops its user's mask (signals.py); assign_default_permissions
+   drops the masks of the users it bulk inserted. Changes made with queryset.update() send no signals,
+   so they can take up to PERMISSION_CACHE_TIMEOUT seconds (1 hour by default) to be seen; call
+   invalidate_permissions() after such an update.
+The masks are only cached when the cache is shared by every worker (settings.CACHE_IS_SHARED, e.g.
+Redis): with a per-process cache a revoked or newly granted permission would only be seen by the
+worker that made the change. Without one every check loads the user's row.
+Hits and misses are counted under the "permissions" cache stats.
+"""
+
+# Bit order of the compiled mask; append new flags at the end, cached masks depend on the order
+PERMISSION_FLAGS = (
+    "can_view",
+    "can_edit",
+    "can_approve",
+    "submit_request",
+    "grant_recording_access",
+    "record_content",
+    "convert_content",
+    "edit_notes",
+    "proofread_notes",
+    "access_digital_twin",
+    "access_prof_portal",
+    "access_sds_portal",
+    "download_notes",
+)
+
+PERMISSION_BITS = {flag: 1 << bit for bit, flag in enumerate(PERMISSION_FLAGS)}
+
+permission_cache_stats = register_cache_stats("permissions")
+
+
+def permission_cache_key(user_id):
+    return f"permissions:{user_id}"
+
+
+def invalidate_permissions(*user_ids):
+    """Drop the cached masks of these users (e.g. after their Permissions rows change)."""
+    cache.delete_many([permission_cache_key(user_id) for user_id in user_ids])
+
+
+def compile_mask(flags):
+    """
+    Compile permission flags into a bitmask.
+    Args:
+        flags (iterable): Flag names, e.g. ["can_view", "edit_notes"].
+    Returns:
+        int: The mask with those flags set.
+    Raises:
+        KeyError: If a name is not a permission flag.
+    """
+    mask = 0
+    for flag in flags:
+        mask |= PERMISSION_BITS[flag]
+    return mask
+
+
+def get_permission_mask(user):
+    """
+    Retrieve the compiled permissions of a user, from the cache when it is shared.
+    Args:
+        user (User): The user; anonymous users have no permissions.
+    Returns:
+        int: The user's permission mask.
+    """
+    if not user.is_authenticated:
+        return 0
+    if not settings.CACHE_IS_SHARED:
+        return _load_permission_mask(user.pk)
+
+    key = permission_cache_key(user.pk)
+    mask = cache.get(key)
+    if mask is not None:
+        permission_cache_stats.hit()
+        return mask
+
+    permission_cache_stats.miss()
+    mask = _load_permission_mask(user.pk)
+    cache.set(key, mask, settings.PERMISSION_CACHE_TIMEOUT)
+    return mask
+
+
+def _load_permission_mask(user_id):
+    row = Permissions.objects.filter(user_id=user_id).values_list(*PERMISSION_FLAGS).first()
+    return compile_mask(flag for flag, granted in zip(PERMISSION_FLAGS, row or ()) if granted)
+
+
+def has_permissions(user, *flags):
+    """Return True if the user has every one of the given permission flags."""
+    required = compile_mask(flags)
+    return get_permission_mask(user) & required == required
+
+
+def requires(*flags):
+    """
+    Only let users with all of the given permission flags call a DRF view, e.g.
+
+        @api_view(["PUT"])
+        @requires("edit_notes")
+        def update_notes_packet(request, notes_packet_id): ...
+
+    Place it below @api_view, so it runs after authentication. Other users get a 403
+    (401 if not logged in).
+    """
+    required = compile_mask(flags)
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not request.user.is_authenticated:
+                raise NotAuthenticated()
+            if get_permission_mask(request.user) & required != required:
+                raise PermissionDenied(f"Requires the {', '.join(flags)} permission.")
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
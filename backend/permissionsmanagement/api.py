@@ -1,9 +1,11 @@
 from rest_framework.response import Response
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
 from .models import Permissions
-from .serializers import PermissionsSerializer
-from django.contrib.contenttypes.models import ContentType
-from usermanagement.models import Student, Professor, TeacherAssistant, SDSCoordinator
+from .serializers import PermissionsSerializer, PermissionsValuesSerializer
+from .defaults import assign_permissions
+from InkSightMVP.pagination import list_response
+from jobqueuemanagement.jobs import enqueue
 
 """
 GET (Permissions) Methods
@@ -18,12 +20,12 @@ def get_permissions(request):
     """
     Retrieve all permissions.
     Fetches all permission entries available in the database and returns them in JSON format.
+    Pass ?limit= (and the returned ?cursor=) to page through the results.
     Returns:
         JSON response containing all permissions.
     """
     permissions = Permissions.objects.all()
-    serializer = PermissionsSerializer(permissions, many=True)
-    return Response(serializer.data)
+    return list_response(request, permissions, PermissionsValuesSerializer)
 
 def get_note_packet(request, permission_id):
     """
@@ -76,106 +78,54 @@ def add_permissions(request):
 
 """
 POST (Permissions) Methods specialized
+The role defaults and bulk assignment live in defaults.py
 """
 def assign_student_permissions(student_instance, **kwargs):
     """
-    Assign permissions to a Student instance.
+    Assign permissions to a Student instance, unless it already has them.
     Args:
         student_instance (Student): The student instance to which permissions are assigned.
         kwargs: Additional permission attributes as keyword arguments.
     """
-
-    student_content_type = ContentType.objects.get_for_model(Student)
-    Permissions.objects.create(
-        user_content_type=student_content_type,
-        user_object_id=student_instance.id,
-        can_view=kwargs.get("can_view", True),
-        submit_request=kwargs.get("submit_request", True),
-        record_content=kwargs.get("record_content", True),
-        convert_content=kwargs.get("convert_content", True),
-        download_notes=kwargs.get("download_notes", True),
-        can_edit=kwargs.get("can_edit", False),
-        can_approve=kwargs.get("can_approve", False)
-    )
+    assign_permissions(student_instance, **kwargs)
 
 def assign_professor_permissions(professor_instance, **kwargs):
     """
-    Assign permissions to a Professor instance.
+    Assign permissions to a Professor instance, unless it already has them.
     Args:
         professor_instance (Professor): The professor instance to which permissions are assigned.
         kwargs: Additional permission attributes as keyword arguments.
     """
-
-    professor_content_type = ContentType.objects.get_for_model(Professor)
-    Permissions.objects.create(
-        user_content_type=professor_content_type,
-        user_object_id=professor_instance.id,
-        can_view=kwargs.get("can_view", True),
-        can_edit=kwargs.get("can_edit", True),
-        can_approve=kwargs.get("can_approve", True),
-        grant_recording_access=kwargs.get("grant_recording_access", True),
-        record_content=kwargs.get("record_content", True),
-        edit_notes=kwargs.get("edit_notes", True),
-        proofread_notes=kwargs.get("proofread_notes", True),
-        access_prof_portal=kwargs.get("access_prof_portal", True),
-        access_digital_twin=kwargs.get("access_digital_twin", True)
-    )
+    assign_permissions(professor_instance, **kwargs)
 
 def assign_teacher_assistant_permissions(ta_instance, **kwargs):
     """
-    Assign permissions to a Teacher Assistant instance.
+    Assign permissions to a Teacher Assistant instance, unless it already has them.
     Args:
         ta_instance (TeacherAssistant): The teacher assistant instance to which permissions are assigned.
         kwargs: Additional permission attributes as keyword arguments.
     """
-
-    ta_content_type = ContentType.objects.get_for_model(TeacherAssistant)
-    Permissions.objects.create(
-        user_content_type=ta_content_type,
-        user_object_id=ta_instance.id,
-        can_view=kwargs.get("can_view", True),
-        can_edit=kwargs.get("can_edit", True),
-        can_approve=kwargs.get("can_approve", False),
-        proofread_notes=kwargs.get("proofread_notes", True),
-        access_prof_portal=kwargs.get("access_prof_portal", True)
-    )
+    assign_permissions(ta_instance, **kwargs)
 
 def assign_sds_coordinator_permissions(sdscoordinator_instance, **kwargs):
     """
-    Assign permissions to an SDS Coordinator instance.
+    Assign permissions to an SDS Coordinator instance, unless it already has them.
     Args:
         sdscoordinator_instance (SDSCoordinator): The SDS Coordinator instance to which permissions are assigned.
         kwargs: Additional permission attributes as keyword arguments.
     """
-
-    sds_content_type = ContentType.objects.get_for_model(SDSCoordinator)
-    Permissions.objects.create(
-        user_content_type=sds_content_type,
-        user_object_id=sdscoordinator_instance.id,
-        can_view=kwargs.get("can_view", True),
-        can_edit=kwargs.get("can_edit", True),
-        can_approve=kwargs.get("can_approve", True),
-        grant_recording_access=kwargs.get("grant_recording_access", True),
-        access_sds_portal=kwargs.get("access_sds_portal", True)
-    )
+    assign_permissions(sdscoordinator_instance, **kwargs)
 
 
-def assign_all_permissions():
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def assign_all_permissions(request):
     """
-    Assigns default permissions for every user in the database.
-    Loops through all instances of Student, Professor, Teacher Assistant, and SDS Coordinator models,
-    assigning the default permissions to each based on their role.
+    Queue a job that assigns default permissions to every user without them.
+    Only available to staff users. For a one-off run with progress output, use
+    `manage.py assign_default_permissions` instead.
+    Returns:
+        JSON response containing the ID of the queued job (202).
     """
-
-    for student in Student.objects.all():
-        assign_student_permissions(student)
-
-    for professor in Professor.objects.all():
-        assign_professor_permissions(professor)
-
-    for ta in TeacherAssistant.objects.all():
-        assign_teacher_assistant_permissions(ta)
-
-    for sdscoordinator in SDSCoordinator.objects.all():
-        assign_sds_coordinator_permissions(sdscoordinator)
-
+    job = enqueue("permissions.assign_defaults")
+    return Response({"job_id": job.pk, "status": job.status}, status=202)
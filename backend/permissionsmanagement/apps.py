@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PermissionsmanagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'permissionsmanagement'
+
+    def ready(self):
+        import permissionsmanagement.signals
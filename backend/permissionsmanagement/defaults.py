@@ -0,0 +1,186 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from usermanagement.models import User, Student, Professor, TeacherAssistant, SDSCoordinator
+from .access import PERMISSION_FLAGS, invalidate_permissions
+from .models import Permissions
+
+"""
+Default Permissions
+Every user gets one Permissions row, with the defaults of their role below:
+1. The content types of the roles are fetched once, in a single query.
+2. Users that already have a row are skipped (NOT EXISTS subqueries), so re-running is safe.
+3. The missing rows are written with one bulk_create per BATCH_SIZE users, walking each role table
+   by primary key so memory stays flat.
+The unique constraints on user and on (user_content_type, user_object_id) make concurrent runs safe
+too: conflicting inserts are ignored.
+Rows created before Permissions.user existed are linked to their user by link_permission_users.
+"""
+
+BATCH_SIZE = 2000
+
+DEFAULT_PERMISSIONS = {
+    Student: {
+        "can_view": True,
+        "submit_request": True,
+        "record_content": True,
+        "convert_content": True,
+        "download_notes": True,
+        "can_edit": False,
+        "can_approve": False,
+    },
+    Professor: {
+        "can_view": True,
+        "can_edit": True,
+        "can_approve": True,
+        "grant_recording_access": True,
+        "record_content": True,
+        "edit_notes": True,
+        "proofread_notes": True,
+        "access_prof_portal": True,
+        "access_digital_twin": True,
+    },
+    TeacherAssistant: {
+        "can_view": True,
+        "can_edit": True,
+        "can_approve": False,
+        "proofread_notes": True,
+        "access_prof_portal": True,
+    },
+    SDSCoordinator: {
+        "can_view": True,
+        "can_edit": True,
+        "can_approve": True,
+        "grant_recording_access": True,
+        "access_sds_portal": True,
+    },
+}
+
+
+def assign_permissions(instance, **kwargs):
+    """
+    Give one user the default permissions of their role, unless they already have a row.
+    Args:
+        instance: A Student, Professor, TeacherAssistant or SDSCoordinator.
+        kwargs: Permission fields that override the role's defaults.
+    Returns:
+        tuple: (Permissions, created)
+    """
+    model = type(instance)
+    return Permissions.objects.get_or_create(
+        user_id=instance.pk,
+        defaults={
+            "user_content_type": ContentType.objects.get_for_model(model),
+            "user_object_id": instance.pk,
+            **DEFAULT_PERMISSIONS[model],
+            **kwargs,
+        },
+    )
+
+
+def assign_default_permissions(roles=None, batch_size=BATCH_SIZE, progress=None):
+    """
+    Create the default Permissions row for every user that does not have one.
+    Args:
+        roles (list): Role models to assign (default: all of DEFAULT_PERMISSIONS).
+        batch_size (int): Users per bulk insert.
+        progress (callable): Called as progress(role, assigned, total) after each batch, where total is
+            the number of users of the role that were missing a row.
+    Returns:
+        dict: Number of Permissions rows created per role model name (rows another process created
+            in the meantime are not counted).
+    """
+    roles = roles or list(DEFAULT_PERMISSIONS)
+    content_types = ContentType.objects.get_for_models(*roles)
+    created = {}
+
+    for role in roles:
+        content_type = content_types[role]
+        missing = (role.objects
+                   .exclude(Exists(Permissions.objects.filter(user_id=OuterRef("pk"))))
+                   # Rows not yet linked by link_permission_users
+                   .exclude(pk__in=Permissions.objects.filter(user_content_type=content_type)
+                            .values("user_object_id"))
+                   .order_by("pk")
+                   .values_list("pk", flat=True))
+        total = missing.count()
+        defaults = DEFAULT_PERMISSIONS[role]
+        assigned = last_id = 0
+
+        while True:
+            user_ids = list(missing.filter(pk__gt=last_id)[:batch_size])
+            if not user_ids:
+                break
+            # ignore_conflicts skips rows created since the select, so count what the insert added
+            batch_rows = Permissions.objects.filter(user_id__in=user_ids)
+            existing = batch_rows.count()
+            Permissions.objects.bulk_create(
+                [Permissions(user_id=user_id, user_content_type=content_type, user_object_id=user_id, **defaults)
+                 for user_id in user_ids],
+                ignore_conflicts=True,
+            )
+            # bulk_create sends no post_save signals, and users without a row are cached as having no permissions
+            invalidate_permissions(*user_ids)
+            assigned += batch_rows.count() - existing
+            last_id = user_ids[-1]
+            if progress is not None:
+                progress(role, assigned, total)
+            if len(user_ids) < batch_size:
+                break
+
+        created[role._meta.model_name] = assigned
+    return created
+
+
+def link_permission_users(batch_size=BATCH_SIZE, progress=None):
+    """
+    Set Permissions.user on rows created before it existed, from their role (generic) foreign key.
+    A user with rows for several roles keeps one row, with the flags of all of them; rows whose user no
+    longer exists are left unlinked. Safe to re-run, and to run while the app is serving requests.
+    Args:
+        batch_size (int): Rows per batch; each batch is one transaction.
+        progress (callable): Called as progress(linked, total) after each batch.
+    Returns:
+        dict: Numbers of rows linked, merged into another row of the same user, and orphaned.
+    """
+    role_types = ContentType.objects.get_for_models(*DEFAULT_PERMISSIONS).values()
+    unlinked = Permissions.objects.filter(user__isnull=True, user_content_type__in=role_types).order_by("pk")
+    total = unlinked.count()
+    counts = {"linked": 0, "merged": 0, "orphaned": 0}
+    last_id = 0
+
+    while True:
+        with transaction.atomic():
+            rows = list(unlinked.select_for_update().filter(pk__gt=last_id)[:batch_size])
+            if not rows:
+                break
+            user_ids = {row.user_object_id for row in rows}
+            existing = set(User.objects.filter(pk__in=user_ids).values_list("pk", flat=True))
+            linked = {row.user_id: row for row in Permissions.objects.select_for_update().filter(user_id__in=user_ids)}
+            changed, merged = {}, []
+
+            for row in rows:
+                if row.user_object_id not in existing:
+                    counts["orphaned"] += 1
+                    continue
+                target = linked.get(row.user_object_id)
+                if target is None:
+                    row.user_id = row.user_object_id
+                    linked[row.user_id] = changed[row.pk] = row
+                    counts["linked"] += 1
+                else:
+                    for flag in PERMISSION_FLAGS:
+                        setattr(target, flag, getattr(target, flag) or getattr(row, flag))
+                    changed[target.pk] = target
+                    merged.append(row.pk)
+                    counts["merged"] += 1
+
+            Permissions.objects.filter(pk__in=merged).delete()
+            Permissions.objects.bulk_update(changed.values(), ["user", *PERMISSION_FLAGS])
+            invalidate_permissions(*user_ids)
+        last_id = rows[-1].pk
+        if progress is not None:
+            progress(counts["linked"] + counts["merged"] + counts["orphaned"], total)
+        if len(rows) < batch_size:
+            break
+    return counts
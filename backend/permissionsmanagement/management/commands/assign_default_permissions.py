@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from permissionsmanagement.defaults import BATCH_SIZE, DEFAULT_PERMISSIONS, assign_default_permissions
+
+ROLES = {role._meta.model_name: role for role in DEFAULT_PERMISSIONS}
+
+
+class Command(BaseCommand):
+    help = (
+        "Give every user without a Permissions row the default permissions of their role. "
+        "Rows are bulk inserted in batches and existing rows are left alone, so it is safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--role", action="append", choices=sorted(ROLES), dest="roles",
+                            help="Only assign this role; repeat for several (default: all roles).")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Users per bulk insert.")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        started = time.monotonic()
+
+        def progress(role, assigned, total):
+            self.stdout.write(f"  {role._meta.verbose_name_plural}: {assigned}/{total}")
+            self.stdout.flush()
+
+        roles = [ROLES[name] for name in options["roles"]] if options["roles"] else None
+        created = assign_default_permissions(roles, batch_size=options["batch_size"], progress=progress)
+
+        summary = ", ".join(f"{count} {role}" for role, count in created.items())
+        self.stdout.write(self.style.SUCCESS(
+            f"Assigned default permissions to {sum(created.values())} users ({summary}) "
+            f"in {time.monotonic() - started:.1f}s."
+        ))
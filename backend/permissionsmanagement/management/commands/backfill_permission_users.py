@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from permissionsmanagement.defaults import BATCH_SIZE, link_permission_users
+
+
+class Command(BaseCommand):
+    help = (
+        "Link Permissions rows created before Permissions.user existed to their user, in batches. "
+        "A user with rows for several roles keeps one row with the flags of all of them. Safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows per batch.")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        started = time.monotonic()
+
+        def progress(done, total):
+            self.stdout.write(f"  permissions: {done}/{total}")
+            self.stdout.flush()
+
+        counts = link_permission_users(batch_size=options["batch_size"], progress=progress)
+        self.stdout.write(self.style.SUCCESS(
+            f"Linked {counts['linked']} rows, merged {counts['merged']} duplicate role rows and skipped "
+            f"{counts['orphaned']} rows of deleted users in {time.monotonic() - started:.1f}s."
+        ))
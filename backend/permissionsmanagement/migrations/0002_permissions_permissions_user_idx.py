@@ -0,0 +1,22 @@
+# Generated by Django 5.1.3 on 2026-10-18 11:57
+
+from django.db import migrations, models
+
+from InkSightMVP.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without blocking writes to the table
+    atomic = False
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('permissionsmanagement', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='permissions',
+            index=models.Index(fields=['user_content_type', 'user_object_id'], name='permissions_user_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.3 on 2026-10-18 11:57
+
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def remove_duplicate_permissions(apps, schema_editor):
+    """Keep the oldest row per user (re-running assign_all_permissions created copies) before adding the constraint."""
+    Permissions = apps.get_model('permissionsmanagement', 'Permissions')
+
+    duplicates = (
+        Permissions.objects.values('user_content_type_id', 'user_object_id')
+        .annotate(keep_id=Min('id'), rows=Count('id'))
+        .filter(rows__gt=1)
+    )
+    for duplicate in duplicates.iterator():
+        Permissions.objects.filter(
+            user_content_type_id=duplicate['user_content_type_id'], user_object_id=duplicate['user_object_id']
+        ).exclude(id=duplicate['keep_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('permissionsmanagement', '0002_permissions_permissions_user_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_permissions, migrations.RunPython.noop),
+    ]
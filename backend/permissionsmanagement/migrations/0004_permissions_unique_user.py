@@ -0,0 +1,26 @@
+# Generated by Django 5.1.3 on 2026-10-18 12:22
+
+from django.db import migrations, models
+
+from InkSightMVP.migration_operations import AddUniqueConstraintConcurrently, RemoveIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # Build the unique index, and drop the index it replaces, without blocking writes to the table
+    atomic = False
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('permissionsmanagement', '0003_remove_duplicate_permissions'),
+    ]
+
+    operations = [
+        AddUniqueConstraintConcurrently(
+            model_name='permissions',
+            constraint=models.UniqueConstraint(fields=('user_content_type', 'user_object_id'), name='unique_permissions_user'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='permissions',
+            name='permissions_user_idx',
+        ),
+    ]
@@ -7,10 +7,14 @@ class Permissions(models.Model):
     """Model for assigning permissions to user types"""
     id = models.AutoField(primary_key=True)
 
-    # Defining Generic Foreign Key (e.g., (Student, 5) or (SDSCoordinator, 13))
+    # The user the permissions belong to; permission checks look rows up by this indexed column
+    user = models.OneToOneField(User, on_delete=models.CASCADE, blank=True, null=True, related_name="permissions")
+
+    # Role the row was created for (e.g., (Student, 5) or (SDSCoordinator, 13)); superseded by `user`,
+    # kept until every row has been linked with `manage.py backfill_permission_users`
     user_content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     user_object_id = models.PositiveIntegerField()
-    user = GenericForeignKey('user_content_type', 'user_object_id')
+    role_user = GenericForeignKey('user_content_type', 'user_object_id')
 
     # Permissions
     can_view = models.BooleanField(default=False)
@@ -27,5 +31,11 @@ class Permissions(models.Model):
     access_sds_portal = models.BooleanField(default=False)
     download_notes = models.BooleanField(default=False)
 
+    class Meta:
+        constraints = [
+            # One row per user; also the index permission lookups use
+            models.UniqueConstraint(fields=["user_content_type", "user_object_id"], name="unique_permissions_user"),
+        ]
+
     def __str__(self):
         return f"Permissions for {self.user_content_type} (ID: {self.user_object_id})"
@@ -1,9 +1,19 @@
 from rest_framework import serializers
 from .models import Permissions
 from django.contrib.contenttypes.models import ContentType
+from InkSightMVP.values_serializers import ValuesSerializer
+
+class ContentTypeModelField(serializers.SlugRelatedField):
+    """Content type as its model name, read from ContentType's in-process cache instead of a query per row"""
+
+    def use_pk_only_optimization(self):
+        return True
+
+    def to_representation(self, obj):
+        return ContentType.objects.get_for_id(obj.pk).model
 
 class PermissionsSerializer(serializers.ModelSerializer):
-    user_content_type = serializers.SlugRelatedField(
+    user_content_type = ContentTypeModelField(
         queryset=ContentType.objects.all(),
         slug_field='model'
     )
@@ -12,8 +22,15 @@ class PermissionsSerializer(serializers.ModelSerializer):
     class Meta:
         model = Permissions
         fields = [
-            'id', 'user_content_type', 'user_object_id', 'can_view', 'can_edit',
+            'id', 'user', 'user_content_type', 'user_object_id', 'can_view', 'can_edit',
             'can_approve', 'submit_request', 'grant_recording_access', 'record_content',
             'convert_content', 'edit_notes', 'proofread_notes', 'access_digital_twin',
             'access_prof_portal', 'access_sds_portal', 'download_notes'
         ]
+
+class PermissionsValuesSerializer(ValuesSerializer):
+    """Read-only PermissionsSerializer for list endpoints, built from .values() rows"""
+    class Meta:
+        model = Permissions
+        fields = PermissionsSerializer.Meta.fields
+        lookups = {"user_content_type": "user_content_type__model"}
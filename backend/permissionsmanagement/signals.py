@@ -0,0 +1,8 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .access import invalidate_permissions
+from .models import Permissions
+
+@receiver([post_save, post_delete], sender=Permissions)
+def uncache_permissions(sender, instance=None, **kwargs):
+    invalidate_permissions(instance.user_id or instance.user_object_id)
@@ -0,0 +1,11 @@
+from jobqueuemanagement.jobs import task
+from .defaults import assign_default_permissions
+
+"""
+Background tasks of this app, run by the job queue (see jobqueuemanagement/jobs.py).
+"""
+
+
+@task("permissions.assign_defaults")
+def assign_default_permissions_task():
+    assign_default_permissions()
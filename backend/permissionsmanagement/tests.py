@@ -1,3 +1,177 @@
-from django.test import TestCase
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from jobqueuemanagement.models import Job
+from schoolmanagement.models import School
+from usermanagement.models import User, Student, Professor, SDSCoordinator, TeacherAssistant
+from .access import get_permission_mask, has_permissions, permission_cache_stats, requires
+from .api import assign_student_permissions
+from .defaults import assign_default_permissions, link_permission_users
+from .models import Permissions
+from .serializers import PermissionsSerializer
+
+
+class DefaultPermissionsTests(TestCase):
+    """Default permissions are bulk assigned once per user, however often the assignment runs"""
+
+    @classmethod
+    def setUpTestData(cls):
+        school = School.objects.create(name="Test University")
+        cls.coordinator = SDSCoordinator.objects.create(email="sds@test.edu", name="SDS", school=school,
+                                                        position="Lead")
+        cls.professor = Professor.objects.create(email="prof@test.edu", name="Prof", school=school, title="Dr.")
+        cls.students = [
+            Student.objects.create(email=f"student{number}@test.edu", name="Student", school=school, year=2,
+                                   disability="ADHD")
+            for number in range(5)
+        ]
+
+    def test_assignment_is_batched_and_idempotent(self):
+        assign_student_permissions(self.students[0], download_notes=False)
+
+        # Content types once, then per role: count, batches, and the insert (between two counts) for each batch
+        ContentType.objects.clear_cache()
+        with self.assertNumQueries(23):
+            created = assign_default_permissions(batch_size=2)
+        self.assertEqual(created, {"student": 4, "professor": 1, "teacherassistant": 0, "sdscoordinator": 1})
+
+        self.assertEqual(assign_default_permissions(), {"student": 0, "professor": 0, "teacherassistant": 0,
+                                                        "sdscoordinator": 0})
+        self.assertEqual(Permissions.objects.count(), 7)
+        student_type = ContentType.objects.get_for_model(Student)
+        self.assertFalse(Permissions.objects.get(user_content_type=student_type,
+                                                 user_object_id=self.students[0].pk).download_notes)
+        professor = Permissions.objects.get(user_content_type=ContentType.objects.get_for_model(Professor))
+        self.assertTrue(professor.edit_notes and professor.access_prof_portal)
+
+    def test_rows_created_meanwhile_are_not_counted(self):
+        real_filter = Permissions.objects.filter
+
+        def assign_first_student_meanwhile(*args, **kwargs):
+            if "user_id__in" in kwargs:
+                # Another process assigns a user after the batch was selected
+                assign_student_permissions(self.students[0])
+            return real_filter(*args, **kwargs)
+
+        with mock.patch.object(Permissions.objects, "filter", side_effect=assign_first_student_meanwhile):
+            self.assertEqual(assign_default_permissions(roles=[Student]), {"student": 4})
+        self.assertEqual(Permissions.objects.count(), 5)
+
+    def test_command_reports_progress(self):
+        out = StringIO()
+        call_command("assign_default_permissions", "--role", "student", "--batch-size", "2", stdout=out)
+        self.assertIn("students: 4/5", out.getvalue())
+        self.assertIn("Assigned default permissions to 5 users", out.getvalue())
+
+    def test_endpoint_queues_a_job(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create(email="admin@test.edu", name="Admin", is_staff=True))
+        response = client.post("/permissionsmanagement/permissions/assign_all/")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(Job.objects.get(pk=response.json()["job_id"]).task, "permissions.assign_defaults")
+
+        call_command("run_job_worker", burst=True, concurrency=1, stdout=StringIO())
+        self.assertEqual(Permissions.objects.count(), 7)
+
+
+@api_view(["POST"])
+@requires("edit_notes", "proofread_notes")
+def edit_notes_view(request):
+    return Response({"edited": True})
+
+
+# The tests run in one process, so a local memory cache stands in for the shared one
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+                   CACHE_IS_SHARED=True)
+class PermissionCheckTests(TestCase):
+    """Permission checks read a cached bitmask, dropped when the user's Permissions change"""
+
+    @classmethod
+    def setUpTestData(cls):
+        school = School.objects.create(name="Test University")
+        cls.professor = Professor.objects.create(email="prof@test.edu", name="Prof", school=school, title="Dr.")
+        cls.student = Student.objects.create(email="student@test.edu", name="Student", school=school, year=2,
+                                             disability="ADHD")
+        assign_default_permissions()
+
+    def setUp(self):
+        cache.clear()
+        permission_cache_stats.clear()
+
+    def call(self, user):
+        request = APIRequestFactory().post("/edit")
+        force_authenticate(request, user=user)
+        return edit_notes_view(request)
+
+    def test_cache_hit_needs_no_queries(self):
+        self.assertEqual(self.call(self.professor).status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.call(self.professor).status_code, 200)
+        self.assertEqual(self.call(self.student).status_code, 403)
+        self.assertEqual((permission_cache_stats.hits, permission_cache_stats.misses), (1, 2))
+
+    def test_saving_permissions_drops_the_cached_mask(self):
+        self.assertTrue(has_permissions(self.student, "download_notes", "can_view"))
+        self.assertFalse(has_permissions(self.student, "edit_notes"))
+
+        permissions = Permissions.objects.get(user_object_id=self.student.pk)
+        permissions.edit_notes = permissions.proofread_notes = True
+        permissions.save()
+        self.assertEqual(self.call(self.student).status_code, 200)
+
+        permissions.delete()
+        self.assertEqual(get_permission_mask(self.student), 0)
+        self.assertEqual(self.call(User.objects.create(email="new@test.edu", name="New")).status_code, 403)
+
+    @override_settings(CACHE_IS_SHARED=False)
+    def test_per_process_cache_is_not_used(self):
+        self.assertEqual(self.call(self.professor).status_code, 200)
+        # Revoked without signals, e.g. in another worker: seen by the next check
+        Permissions.objects.filter(user=self.professor).update(edit_notes=False)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.call(self.professor).status_code, 403)
+        self.assertEqual((permission_cache_stats.hits, permission_cache_stats.misses), (0, 0))
+
+
+class PermissionUserBackfillTests(TestCase):
+    """Rows created through the role generic foreign key are linked to their user in batches"""
+
+    def test_rows_are_linked_and_merged(self):
+        school = School.objects.create(name="Test University")
+        students = [
+            Student.objects.create(email=f"student{number}@test.edu", name="Student", school=school, year=2,
+                                   disability="ADHD")
+            for number in range(3)
+        ]
+        student_type = ContentType.objects.get_for_model(Student)
+        ta_type = ContentType.objects.get_for_model(TeacherAssistant)
+        for student in students:
+            Permissions.objects.create(user_content_type=student_type, user_object_id=student.pk, can_view=True)
+        # The first student also had a TA row, and one row belongs to a deleted user
+        Permissions.objects.create(user_content_type=ta_type, user_object_id=students[0].pk, proofread_notes=True)
+        Permissions.objects.create(user_content_type=student_type, user_object_id=999999, can_view=True)
+
+        out = StringIO()
+        call_command("backfill_permission_users", "--batch-size", "2", stdout=out)
+        self.assertIn("permissions: 5/5", out.getvalue())
+        self.assertEqual(link_permission_users(), {"linked": 0, "merged": 0, "orphaned": 1})
+
+        self.assertEqual(Permissions.objects.filter(user__isnull=False).count(), 3)
+        merged = students[0].permissions
+        self.assertTrue(merged.can_view and merged.proofread_notes)
+
+        client = APIClient()
+        client.force_authenticate(User.objects.create(email="admin@test.edu", name="Admin"))
+        with self.assertNumQueries(1):
+            data = client.get("/permissionsmanagement/permissions/").json()
+        self.assertEqual({row["user"] for row in data} - {None}, {student.pk for student in students})
+        with self.assertNumQueries(0):
+            self.assertEqual(PermissionsSerializer(merged).data["user_content_type"], "student")
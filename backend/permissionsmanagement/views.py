@@ -1,11 +1,11 @@
-from rest_framework.authentication import TokenAuthentication
+from usermanagement.authentication import CachedTokenAuthentication
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from usermanagement.models import Student
 
 class ProtectedStudentView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [AllowAny]
 
     def get(self, request, *args, **kwargs):
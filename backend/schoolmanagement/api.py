@@ -5,7 +5,8 @@ from usermanagement.models import Professor
 from coursemanagement.models import Course
 from coursemanagement.serializers import CourseSerializer
 from usermanagement.serializers import ProfessorSerializer
-from .serializers import SchoolSerializer
+from .serializers import SchoolSerializer, SchoolValuesSerializer
+from InkSightMVP.pagination import list_response
 
 
 """
@@ -21,12 +22,12 @@ def get_schools(request):
     """
     Retrieve all schools.
     Fetches all school entries available in the database and returns them in JSON format.
+    Pass ?limit= (and the returned ?cursor=) to page through the results.
     Returns:
         JSON response containing all school entries.
     """
     schools = School.objects.all()
-    serializer = SchoolSerializer(schools, many=True)
-    return Response(serializer.data)
+    return list_response(request, schools, SchoolValuesSerializer)
 
 @api_view(['GET'])
 def get_school(request, school_id):
@@ -1,8 +1,15 @@
 from rest_framework import serializers
+from InkSightMVP.values_serializers import ValuesSerializer
 from .models import School
 
 class SchoolSerializer(serializers.ModelSerializer):
     """Serializer For School"""
     class Meta:
         model = School
-        fields = ['id', 'name']
\ No newline at end of file
+        fields = ['id', 'name']
+
+class SchoolValuesSerializer(ValuesSerializer):
+    """Read-only SchoolSerializer for list endpoints, built from .values() rows"""
+    class Meta:
+        model = School
+        fields = SchoolSerializer.Meta.fields
@@ -1,3 +1,81 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
 
-# Create your tests here.
+from InkSightMVP.middleware import endpoint_stats
+from InkSightMVP.pagination import KeysetPagination
+from usermanagement.models import User
+from .models import School
+
+
+class QueryInstrumentationTests(TestCase):
+    """Every request reports its query count and timings, and is added to its endpoint's rolling window"""
+
+    def setUp(self):
+        endpoint_stats.clear()
+        School.objects.bulk_create([School(name=f"School {number}") for number in range(3)])
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(email="admin@test.edu", name="Admin", is_staff=True))
+
+    def test_headers_and_endpoint_summary(self):
+        counts = []
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get("/schoolmanagement/schools/")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["X-DB-Query-Count"], str(len(queries)))
+            counts.append(len(queries))
+            for header in ("X-DB-Time-Ms", "X-Serialize-Time-Ms", "X-Total-Time-Ms"):
+                self.assertGreaterEqual(float(response[header]), 0)
+            self.assertLessEqual(float(response["X-DB-Time-Ms"]), float(response["X-Total-Time-Ms"]))
+
+        summary = self.client.get("/instrumentation/summary/").json()
+        self.assertEqual(set(summary), {"get_schools"})
+        schools = summary["get_schools"]
+        self.assertEqual(schools["requests"], 2)
+        self.assertEqual(schools["max_queries"], max(counts))
+        self.assertEqual(schools["avg_queries"], sum(counts) / 2)
+        self.assertGreaterEqual(schools["p95_total_ms"], schools["avg_db_ms"])
+
+
+class KeysetPaginationTests(TestCase):
+    """List endpoints page with ?limit= and the returned cursor, without duplicates or gaps"""
+
+    @classmethod
+    def setUpTestData(cls):
+        School.objects.bulk_create([School(name=f"School {number}") for number in range(5)])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(email="user@test.edu", name="User"))
+
+    def test_pages_follow_the_cursor(self):
+        pages = []
+        url = "/schoolmanagement/schools/?limit=2"
+        while url:
+            page = self.client.get(url).json()
+            pages.append([school["id"] for school in page["results"]])
+            if len(pages) == 1:
+                # Rows added while paging appear at the end, not on a page already read
+                School.objects.create(name="Late school")
+            url = page["next"]
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 2])
+        ids = [school_id for page in pages for school_id in page]
+        self.assertEqual(ids, sorted(School.objects.values_list("id", flat=True)))
+
+        cursor = self.client.get("/schoolmanagement/schools/?limit=2").json()["next_cursor"]
+        self.assertEqual([school["id"] for school in self.client.get(
+            f"/schoolmanagement/schools/?limit=2&cursor={cursor}").json()["results"]], pages[1])
+
+    def test_limit_is_validated_and_capped(self):
+        self.assertIsInstance(self.client.get("/schoolmanagement/schools/").json(), list)
+        for limit in ("abc", "0", "-1", ""):
+            response = self.client.get("/schoolmanagement/schools/", {"limit": limit})
+            self.assertEqual(response.status_code, 400, limit)
+
+        paginator = KeysetPagination()
+        request = Request(APIRequestFactory().get("/", {"limit": 5000}))
+        self.assertEqual(paginator.get_page_size(request), paginator.max_page_size)
@@ -7,8 +7,31 @@ fi
 # Run Django migrations
 python manage.py migrate --noinput
 
+# Link permissions created before Permissions.user existed (a no-op once every row is linked)
+python manage.py backfill_permission_users
+
 # Collect static files
 python manage.py collectstatic --noinput
 
-# Start the Gunicorn server
-gunicorn InkSightMVP.wsgi:application --bind 0.0.0.0:8000
\ No newline at end of file
+# Start the background job worker (slide processing, permission assignment, ...) next to the web server.
+# Set RUN_JOB_WORKER=false where a separate worker service runs it (e.g. docker-compose).
+PIDS=()
+if [ "${RUN_JOB_WORKER:-true}" = "true" ]; then
+    python manage.py run_job_worker &
+    PIDS+=($!)
+fi
+
+# Start the Gunicorn server (set WEB_CONCURRENCY for more workers). A sync worker is busy for a whole
+# upload, so polling upload progress needs more than one worker, plus a shared cache (see uploads.py).
+gunicorn InkSightMVP.wsgi:application --bind "0.0.0.0:${PORT:-8000}" &
+PIDS+=($!)
+
+# Forward shutdown signals, so the worker finishes its current jobs before the container stops
+trap 'kill -TERM "${PIDS[@]}" 2>/dev/null' TERM INT
+
+# If either process exits, stop the other too, so the platform restarts the whole container
+wait -n
+STATUS=$?
+kill -TERM "${PIDS[@]}" 2>/dev/null
+wait
+exit $STATUS
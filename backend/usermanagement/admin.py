@@ -1,8 +1,43 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from .models import User, Student, Professor, TeacherAssistant, SDSCoordinator
+from .roles import load_role_users
+
+
+class RoleUserChangeList(ChangeList):
+    """Change list whose rows are the users' role subclass instances (Student, Professor, ...)"""
+
+    def get_results(self, request):
+        super().get_results(request)
+        # One query per role on the page, instead of one per row for the role details column
+        self.result_list = load_role_users(self.result_list)
+
+
+@admin.register(User)
+class UserAdmin(admin.ModelAdmin):
+    # The role column lists and filters users by role without probing the four role tables per row
+    list_display = ("email", "name", "role", "role_details", "school", "is_active", "is_staff")
+    list_filter = ("role", "is_active", "is_staff")
+    list_select_related = ("school",)
+    search_fields = ("email", "name")
+
+    def get_changelist(self, request, **kwargs):
+        return RoleUserChangeList
+
+    @admin.display(description="Role details")
+    def role_details(self, user):
+        if isinstance(user, Student):
+            return f"Year {user.year}, {user.disability}"
+        if isinstance(user, Professor):
+            return user.title
+        if isinstance(user, TeacherAssistant):
+            return f"Course {user.assigned_professor_course_id}" if user.assigned_professor_course_id else ""
+        if isinstance(user, SDSCoordinator):
+            return user.position
+        return ""
+
 
-admin.site.register(User)
 admin.site.register(Professor)
 admin.site.register(TeacherAssistant)
 admin.site.register(Student)
-admin.site.register(SDSCoordinator) 
\ No newline at end of file
+admin.site.register(SDSCoordinator)
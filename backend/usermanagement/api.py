@@ -3,11 +3,14 @@ from rest_framework.decorators import api_view, permission_classes, authenticati
 from rest_framework import status
 from .models import User, Student, SDSCoordinator, Professor, TeacherAssistant
 from .serializers import StudentSerializer, SDSCoordinatorSerializer, ProfessorSerializer, TeacherAssistantSerializer
+from .serializers import StudentValuesSerializer, SDSCoordinatorValuesSerializer, ProfessorValuesSerializer, TeacherAssistantValuesSerializer
 from django.shortcuts import render
 from rest_framework.exceptions import NotAuthenticated
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.authentication import TokenAuthentication
+from .authentication import CachedTokenAuthentication
+from .roles import resolve_role, ROLE_SERIALIZERS
 from rest_framework.authtoken.models import Token
+from InkSightMVP.pagination import list_response
 
 def index(request):
     return render(request, 'index.html')
@@ -21,7 +24,7 @@ GET (User) Methods
 """
 
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def get_current_user(request):
     """
@@ -36,20 +39,12 @@ def get_current_user(request):
 
     if not user.is_authenticated:
         raise NotAuthenticated(detail="User is not authenticated.")
-    try:
-        if hasattr(user, 'student'):
-            serializer = StudentSerializer(user.student)
-        elif hasattr(user, 'professor'):
-            serializer = ProfessorSerializer(user.professor)
-        elif hasattr(user, 'teacherassistant'):
-            serializer = TeacherAssistantSerializer(user.teacherassistant)
-        elif hasattr(user, 'sdscoordinator'):
-            serializer = SDSCoordinatorSerializer(user.sdscoordinator)
-        else:
-            return Response({"error": "Unknown user type."}, status=400)
-    except AttributeError as e:
-        return Response({"error": str(e)}, status=500)
 
+    role, role_user = resolve_role(user.pk)
+    if role is None:
+        return Response({"error": "Unknown user type."}, status=400)
+
+    serializer = ROLE_SERIALIZERS[role](role_user)
     return Response(serializer.data)
 
 
@@ -72,13 +67,13 @@ def get_students(request):
     """
     Retrieve all student records.
     Fetches all student entries available in the database and returns them in JSON format.
+    Pass ?limit= (and the returned ?cursor=) to page through the results.
     Returns:
         JSON response containing all student entries.
     """
 
     students = Student.objects.all()
-    serializer = StudentSerializer(students, many=True)
-    return Response(serializer.data)
+    return list_response(request, students, StudentValuesSerializer)
 
 @api_view(['GET'])
 def get_student(request, user_id):
@@ -102,13 +97,13 @@ def get_sdscoordinators(request):
     """
     Retrieve all SDS Coordinator records.
     Fetches all SDS Coordinator entries available in the database and returns them in JSON format.
+    Pass ?limit= (and the returned ?cursor=) to page through the results.
     Returns:
         JSON response containing all SDS Coordinator entries.
     """
 
     sdscoordinators = SDSCoordinator.objects.all()
-    serializer = SDSCoordinatorSerializer(sdscoordinators, many=True)
-    return Response(serializer.data)
+    return list_response(request, sdscoordinators, SDSCoordinatorValuesSerializer)
 
 @api_view(['GET'])
 def get_sdscoordinator(request, user_id):
@@ -132,13 +127,13 @@ def get_professors(request):
     """
     Retrieve all professor records.
     Fetches all professor entries available in the database and returns them in JSON format.
+    Pass ?limit= (and the returned ?cursor=) to page through the results.
     Returns:
         JSON response containing all professor entries.
     """
 
     professors = Professor.objects.all()
-    serializer = ProfessorSerializer(professors, many=True)
-    return Response(serializer.data)
+    return list_response(request, professors, ProfessorValuesSerializer)
 
 @api_view(['GET'])
 def get_professor(request, user_id):
@@ -162,13 +157,13 @@ def get_tas(request):
     """
     Retrieve all teaching assistant records.
     Fetches all teaching assistant entries available in the database and returns them in JSON format.
+    Pass ?limit= (and the returned ?cursor=) to page through the results.
     Returns:
         JSON response containing all teaching assistant entries.
     """
 
     teacherassistants = TeacherAssistant.objects.all()
-    serializer = TeacherAssistantSerializer(teacherassistants, many=True)
-    return Response(serializer.data)
+    return list_response(request, teacherassistants, TeacherAssistantValuesSerializer)
 
 @api_view(['GET'])
 def get_ta(request, user_id):
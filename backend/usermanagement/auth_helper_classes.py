@@ -3,7 +3,8 @@ from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
 from attrs import define
-import jwt
+from django.conf import settings
+from .google_oauth import verify_id_token
 from typing import Dict, Any
 
 class PublicApi(APIView):
@@ -15,9 +16,8 @@ class GoogleAccessTokens:
     id_token: str
     access_token: str
     def decode_id_token(self) -> Dict[str, Any]:
-        id_token = self.id_token
-        decoded_token = jwt.decode(jwt=id_token, options={"verify_signature": False})
-        return decoded_token
+        """Verify the ID token against Google's cached signing keys and return its claims."""
+        return verify_id_token(self.id_token, audience=settings.GOOGLE_OAUTH2_CLIENT_ID)
 
 class CustomAuthToken(ObtainAuthToken):
     """
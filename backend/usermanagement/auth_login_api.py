@@ -1,6 +1,5 @@
 from rest_framework.views import APIView
 from django.shortcuts import redirect
-import requests
 from random import SystemRandom
 from urllib.parse import urlencode
 from django.conf import settings
@@ -12,7 +11,10 @@ from attrs import define
 import jwt
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
-import google_auth_oauthlib.flow
+from . import google_oauth
+from .google_oauth import GoogleOAuthError
+from .oauth_state import (OAUTH_NONCE_COOKIE, InvalidOAuthState, delete_nonce_cookie, load_state, set_nonce_cookie,
+                          sign_state)
 from typing import Dict, Any
 from usermanagement.models import *
 from django.contrib.auth import login
@@ -21,6 +23,8 @@ from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
 from .auth_helper_classes import PublicApi, CustomAuthToken, GoogleAccessTokens
+from .roles import ROLE_MODELS
+from .authentication import get_user_and_token
 from django.http import HttpResponseRedirect
 
 class GoogleLoginRedirectApi(PublicApi):
@@ -29,9 +33,9 @@ class GoogleLoginRedirectApi(PublicApi):
         Handles Google OAuth2 signup redirection.
 
         This function validates the user's role and associated query parameters 
-        (such as school_id, year, disability, etc.), stores relevant data in the 
-        session for callback processing, generates an authorization URL for Google OAuth2, 
-        and redirects the user to the consent screen.
+        (such as school_id, year, disability, etc.), signs them into the OAuth state 
+        for callback processing (see oauth_state.py), generates an authorization URL for 
+        Google OAuth2, and redirects the user to the consent screen.
 
         Parameters:
             request (Request): The HTTP request object containing query parameters.
@@ -50,22 +54,19 @@ class GoogleLoginRedirectApi(PublicApi):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if role not in ["student", "professor", "teacher_assistant", "sds_coordinator"]:
+        if role not in ROLE_MODELS:
             return Response(
                 {"error": "Invalid role provided."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Store role in session for later validation during callback
-        request.session["form_data"] = {"role": role}
+        # The role travels in the signed state, bound to this browser by the nonce cookie
+        state, nonce = sign_state({"role": role})
 
         google_login_flow = GoogleSdkLoginFlowService()
-        authorization_url, state = google_login_flow.get_authorization_url()
+        authorization_url, state = google_login_flow.get_authorization_url(state=state)
 
-        # Store the OAuth state in session
-        request.session["google_oauth2_state"] = state
-
-        return redirect(authorization_url)
+        return set_nonce_cookie(redirect(authorization_url), request, nonce)
     
 class GoogleLoginApi(PublicApi):
     """Serializer For The Input --> data is validated"""
@@ -94,12 +95,11 @@ class GoogleLoginApi(PublicApi):
                       and role in the query string.
             HTTP 400 Response: If validation fails.
         """
-        # Retrieve and merge form data
-        form_data = request.session.get("form_data")
-        if not form_data:
-            return Response(
-                {"error": "Form data is missing. Please complete the login process again."},
-            )
+        # Retrieve the form data from the signed state (this is also the CSRF check)
+        try:
+            form_data = load_state(request.GET.get("state", ""), request.COOKIES.get(OAUTH_NONCE_COOKIE))
+        except InvalidOAuthState as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         merged_form_data = {
             **request.GET.dict(),
@@ -121,38 +121,25 @@ class GoogleLoginApi(PublicApi):
         if not code or not state:
             return Response({"error": "Code and state are required."}, status=status.HTTP_400_BAD_REQUEST)
 
-        # CSRF Check
-        session_state = request.session.get("google_oauth2_state")
-        if not session_state or state != session_state:
-            return Response({"error": "CSRF check failed."}, status=status.HTTP_400_BAD_REQUEST)
-
-        del request.session["google_oauth2_state"]
-
         # Handle Google OAuth2 tokens
         google_login_flow = GoogleSdkLoginFlowService()
-        google_tokens = google_login_flow.get_tokens(code=code, state=state)
-        id_token_decoded = google_tokens.decode_id_token()
+        try:
+            google_tokens = google_login_flow.get_tokens(code=code, state=state)
+            id_token_decoded = google_tokens.decode_id_token()
+        except GoogleOAuthError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         user_email = id_token_decoded.get("email")
 
         if not user_email:
             return Response({"error": "Email not found in Google response."}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Role-based logic for finding the user
-        user_model = None
-        if role == "student":
-            user_model = Student
-        elif role == "professor":
-            user_model = Professor
-        elif role == "teacher_assistant":
-            user_model = TeacherAssistant
-        elif role == "sds_coordinator":
-            user_model = SDSCoordinator
-        else:
+        # Role-based logic for finding the user: the role column avoids joining the role table
+        if role not in ROLE_MODELS:
             return Response({"error": "Invalid role specified."}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            user = user_model.objects.get(email=user_email)
-        except user_model.DoesNotExist:
+        # One query for the user and their token (created if missing)
+        user, token_key = get_user_and_token(user_email, role)
+        if user is None:
             base_url = f"{settings.FRONTEND_URL}/signin"
             error_message = f"No {role} account found for this email."
             query_string = urlencode({"error": error_message})
@@ -164,33 +151,25 @@ class GoogleLoginApi(PublicApi):
         login(request, user)
 
         # Construct a query string for the redirect
-        url_id = user.user_ptr_id
-        user_base = User.objects.get(pk=user.pk)
-        token, _ = Token.objects.get_or_create(user_id=user_base.id)
+        url_id = user.pk
 
-        redirect_url = f"{settings.FRONTEND_URL}/auth/callback?token={token.key}&user_id={url_id}&role={role}"
+        redirect_url = f"{settings.FRONTEND_URL}/auth/callback?token={token_key}&user_id={url_id}&role={role}"
 
         return redirect(redirect_url)
 
+    def finalize_response(self, request, response, *args, **kwargs):
+        """The nonce cookie is single use: drop it whatever the outcome"""
+        return delete_nonce_cookie(super().finalize_response(request, response, *args, **kwargs))
+
 class GoogleSdkLoginFlowService:
     """
     Defined Variables
     API_URI is the name of the API route in the usermanagement app that is called for callback, it invokes /callback
-    The Google AUTH URLS are used for basic setup for th eGOogle Auth
+    The Google endpoint URLs come from the cached discovery document (see google_oauth.py)
     The Scopes are used to grab the google profiles and emails
     """
     API_URI = reverse_lazy("usermanagement:login/callback")
 
-    # Two options are available: 'web', 'installed'
-    GOOGLE_CLIENT_TYPE = "web"
-
-    GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/auth"
-    GOOGLE_ACCESS_TOKEN_OBTAIN_URL = "https://oauth2.googleapis.com/token"
-    GOOGLE_USER_INFO_URL = "https://www.googleapis.com/oauth2/v3/userinfo"
-
-    # Add auth_provider_x509_cert_url if you want verification on JWTS such as ID tokens
-    GOOGLE_AUTH_PROVIDER_CERT_URL = ""
-
     SCOPES = [
         "https://www.googleapis.com/auth/userinfo.email",
         "https://www.googleapis.com/auth/userinfo.profile",
@@ -209,32 +188,9 @@ class GoogleSdkLoginFlowService:
         redirect_uri = f"{domain}{api_uri}"
         return redirect_uri
 
-    def _generate_client_config(self):
-        """
-        Gets the Client JSON string using details from scopes and credentials
-        Follow same format as client_secrets.json
-
-        Returns:
-            client_config: 
-                Dict containing all necessary info for Google Auth0 Client
-        """
-        client_config = {
-            self.GOOGLE_CLIENT_TYPE: {
-                "client_id": self._credentials.client_id,
-                "project_id": self._credentials.project_id,
-                "auth_uri": self.GOOGLE_AUTH_URL,
-                "token_uri": self.GOOGLE_ACCESS_TOKEN_OBTAIN_URL,
-                "auth_provider_x509_cert_url": self.GOOGLE_AUTH_PROVIDER_CERT_URL,
-                "client_secret": self._credentials.client_secret,
-                "redirect_uris": [self._get_redirect_uri()],
-                "javascript_origins": [],
-            }
-        }
-        return client_config
-
     # Reference:
     # https://developers.google.com/identity/protocols/oauth2/web-server#creatingclient
-    def get_authorization_url(self):
+    def get_authorization_url(self, *, state: str):
         """
         Generates the Google OAuth2 authorization URL.
 
@@ -242,20 +198,19 @@ class GoogleSdkLoginFlowService:
         redirect URI, and requested scopes, allowing the user to authenticate 
         and grant access to their account.
 
+        Parameters:
+            state (str): The signed state from oauth_state.sign_state, returned to the callback.
+
         Returns:
             tuple: A tuple containing:
                 - authorization_url (str): The URL to redirect the user to Google.
-                - state (str): A unique state token for CSRF protection.
+                - state (str): The state, unchanged.
         """
-        redirect_uri = self._get_redirect_uri()
-        client_config = self._generate_client_config()
-
-        google_oauth_flow = google_auth_oauthlib.flow.Flow.from_client_config(
-            client_config=client_config, scopes=self.SCOPES
-        )
-        google_oauth_flow.redirect_uri = redirect_uri
-
-        authorization_url, state = google_oauth_flow.authorization_url(
+        authorization_url = google_oauth.authorization_url(
+            client_id=self._credentials.client_id,
+            redirect_uri=self._get_redirect_uri(),
+            scopes=self.SCOPES,
+            state=state,
             access_type="offline",
             include_granted_scopes="true",
             prompt="select_account",
@@ -267,7 +222,7 @@ class GoogleSdkLoginFlowService:
         Fetches Google OAuth2 tokens using an authorization code.
 
         This function exchanges the authorization code for an ID token and an 
-        access token by making a POST request to Google's token endpoint.
+        access token over the shared keep-alive session (see google_oauth.py).
 
         Parameters:
             code (str): The authorization code received from Google.
@@ -276,19 +231,17 @@ class GoogleSdkLoginFlowService:
             GoogleAccessTokens: An object containing the ID token and access token.
 
         Raises:
-            ApplicationError: If the token exchange fails.
+            GoogleOAuthError: If the token exchange fails.
         """
-        redirect_uri = self._get_redirect_uri()
-        client_config = self._generate_client_config()
-
-        flow = google_auth_oauthlib.flow.Flow.from_client_config(
-            client_config=client_config, scopes=self.SCOPES, state=state
+        access_credentials_payload = google_oauth.exchange_code(
+            code=code,
+            client_id=self._credentials.client_id,
+            client_secret=self._credentials.client_secret,
+            redirect_uri=self._get_redirect_uri(),
         )
-        flow.redirect_uri = redirect_uri
-        access_credentials_payload = flow.fetch_token(code=code)
 
-        if not access_credentials_payload:
-            raise ApplicationError("Failed to obtain tokens from Google.")
+        if "id_token" not in access_credentials_payload:
+            raise GoogleOAuthError("Failed to obtain tokens from Google.")
 
         google_tokens = GoogleAccessTokens(
             id_token=access_credentials_payload["id_token"], 
@@ -301,8 +254,8 @@ class GoogleSdkLoginFlowService:
         """
         Retrieves user information from Google using an access token.
 
-        This function makes an API call to Google's UserInfo endpoint to obtain 
-        user details such as email and name.
+        The verified ID token (GoogleAccessTokens.decode_id_token) already has the email
+        and name, so this extra round trip is only needed for other profile fields.
 
         Parameters:
             google_tokens (GoogleAccessTokens): The access tokens obtained from Google.
@@ -311,19 +264,9 @@ class GoogleSdkLoginFlowService:
             dict: A dictionary containing user information.
 
         Raises:
-            ApplicationError: If the request to fetch user info fails.
+            GoogleOAuthError: If the request to fetch user info fails.
         """
-        access_token = google_tokens.access_token
-
-        response = requests.get(
-            self.GOOGLE_USER_INFO_URL,
-            params={"access_token": access_token}
-        )
-
-        if not response.ok:
-            raise ApplicationError("Failed to obtain user info from Google.")
-
-        return response.json()    
+        return google_oauth.get_user_info(google_tokens.access_token)
 
 @define
 class GoogleSdkLoginCredentials:
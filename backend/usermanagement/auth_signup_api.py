@@ -1,11 +1,13 @@
 from django.shortcuts import redirect
-import requests
 from django.conf import settings
 from django.urls import reverse_lazy
 from rest_framework import serializers, status
 from rest_framework.response import Response
 from django.conf import settings
-import google_auth_oauthlib.flow
+from . import google_oauth
+from .google_oauth import GoogleOAuthError
+from .oauth_state import (OAUTH_NONCE_COOKIE, InvalidOAuthState, delete_nonce_cookie, load_state, set_nonce_cookie,
+                          sign_state)
 from attrs import define
 from typing import Dict, Any
 from usermanagement.models import *
@@ -13,6 +15,7 @@ from django.contrib.auth import login
 from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
 from .auth_helper_classes import PublicApi, CustomAuthToken, GoogleAccessTokens
+from .roles import get_role_model
 from django.core.exceptions import ImproperlyConfigured
 
 class GoogleSignUpRedirectApi(PublicApi):
@@ -21,9 +24,9 @@ class GoogleSignUpRedirectApi(PublicApi):
         Handles Google OAuth2 signup redirection.
 
         This function validates the user's role and associated query parameters 
-        (such as school_id, year, disability, etc.), stores relevant data in the 
-        session for callback processing, generates an authorization URL for Google OAuth2, 
-        and redirects the user to the consent screen.
+        (such as school_id, year, disability, etc.), signs them into the OAuth state 
+        for callback processing (see oauth_state.py), generates an authorization URL for 
+        Google OAuth2, and redirects the user to the consent screen.
 
         Parameters:
             request (Request): The HTTP request object containing query parameters.
@@ -56,7 +59,7 @@ class GoogleSignUpRedirectApi(PublicApi):
                     {"error": "All fields are required for students (school_id, year, disability, sds_coordinator_access_code)."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            request.session["form_data"] = {
+            form_data = {
                 "role": role,
                 "school_id": school_id,
                 "year": year,
@@ -69,7 +72,7 @@ class GoogleSignUpRedirectApi(PublicApi):
                     {"error": "All fields are required for professors (school_id, title)."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            request.session["form_data"] = {
+            form_data = {
                 "role": role,
                 "school_id": school_id,
                 "title": title,
@@ -80,7 +83,7 @@ class GoogleSignUpRedirectApi(PublicApi):
                     {"error": "All fields are required for teacher assistants (school_id, professor_id)."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            request.session["form_data"] = {
+            form_data = {
                 "role": role,
                 "school_id": school_id,
                 "professor_id": professor_id,
@@ -91,7 +94,7 @@ class GoogleSignUpRedirectApi(PublicApi):
                     {"error": "All fields are required for SDS Coordinators (school_id, position)."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            request.session["form_data"] = {
+            form_data = {
                 "role": role,
                 "school_id": school_id,
                 "position": position,
@@ -103,13 +106,13 @@ class GoogleSignUpRedirectApi(PublicApi):
             )
 
 
-        google_sign_in_flow = GoogleSdkSignupFlowService()
-        authorization_url, state = google_sign_in_flow.get_authorization_url()
+        # The form data travels in the signed state, bound to this browser by the nonce cookie
+        state, nonce = sign_state(form_data)
 
-        # Store the OAuth state in session
-        request.session["google_oauth2_state"] = state
+        google_sign_in_flow = GoogleSdkSignupFlowService()
+        authorization_url, state = google_sign_in_flow.get_authorization_url(state=state)
 
-        return redirect(authorization_url)
+        return set_nonce_cookie(redirect(authorization_url), request, nonce)
 
 
 class GoogleSignupAPI(PublicApi):
@@ -146,12 +149,11 @@ class GoogleSignupAPI(PublicApi):
                       and role in the query string.
             HTTP 400 Response: If validation fails.
         """
-        form_data = request.session.get("form_data")
-        if not form_data:
-            return Response(
-                {"error": "Form data is missing. Please complete the login process again."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        # Retrieve the form data from the signed state (this is also the CSRF check)
+        try:
+            form_data = load_state(request.GET.get("state", ""), request.COOKIES.get(OAUTH_NONCE_COOKIE))
+        except InvalidOAuthState as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         # Merge the Form Data (which is drawn from the HTML) and GET data which is the google auth
         merged_form_data = {
@@ -183,16 +185,13 @@ class GoogleSignupAPI(PublicApi):
         if not code or not state:
             return Response({"error": "Code and state are required."}, status=status.HTTP_400_BAD_REQUEST)
 
-        session_state = request.session.get("google_oauth2_state")
-        if not session_state or state != session_state:
-            return Response({"error": "CSRF check failed."}, status=status.HTTP_400_BAD_REQUEST)
-
-        del request.session["google_oauth2_state"]
-
         # Handle Google OAuth2 tokens
         google_login_flow = GoogleSdkSignupFlowService()
-        google_tokens = google_login_flow.get_tokens(code=code, state=state)
-        id_token_decoded = google_tokens.decode_id_token()
+        try:
+            google_tokens = google_login_flow.get_tokens(code=code, state=state)
+            id_token_decoded = google_tokens.decode_id_token()
+        except GoogleOAuthError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         user_email = id_token_decoded.get("email")
         first_name = id_token_decoded.get("given_name", "")
         last_name = id_token_decoded.get("family_name", "")
@@ -212,7 +211,6 @@ class GoogleSignupAPI(PublicApi):
                 return redirect(f"{settings.FRONTEND_URL}/signin?error={str(e)}")
 
 
-            user_model = Student
             user_defaults = {
                 "name": f"{first_name} {last_name}",
                 "school": school,
@@ -222,7 +220,6 @@ class GoogleSignupAPI(PublicApi):
             }
 
         elif role == "professor":
-            user_model = Professor
             user_defaults = {
                 "name": f"{first_name} {last_name}",
                 "school": school,
@@ -238,7 +235,6 @@ class GoogleSignupAPI(PublicApi):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            user_model = TeacherAssistant
             user_defaults = {
                 "name": f"{first_name} {last_name}",
                 "school": school,
@@ -246,7 +242,6 @@ class GoogleSignupAPI(PublicApi):
             }
 
         elif role == "sds_coordinator":
-            user_model = SDSCoordinator
             user_defaults = {
                 "name": f"{first_name} {last_name}",
                 "school": school,
@@ -256,14 +251,15 @@ class GoogleSignupAPI(PublicApi):
         else:
             return Response({"error": "Invalid role specified."}, status=status.HTTP_400_BAD_REQUEST)
 
+        user_model = get_role_model(role)
+
         try:
             # Get or create user
             user, created = user_model.objects.get_or_create(
                 email=user_email,
                 defaults=user_defaults
             )
-            user_base = User.objects.get(pk=user.pk)
-            token, _ = Token.objects.get_or_create(user_id=user_base.id)
+            token, _ = Token.objects.get_or_create(user_id=user.pk)
 
             if created:
                 print(f"Created new {role}: {user.name}")
@@ -282,25 +278,19 @@ class GoogleSignupAPI(PublicApi):
         except Exception as e:
             return redirect(f"{settings.FRONTEND_URL}/signin?error={str(e)}")
 
+    def finalize_response(self, request, response, *args, **kwargs):
+        """The nonce cookie is single use: drop it whatever the outcome"""
+        return delete_nonce_cookie(super().finalize_response(request, response, *args, **kwargs))
+
 class GoogleSdkSignupFlowService:
     """
     Defined Variables
     API_URI is the name of the API route in the usermanagement app that is called for callback, it invokes /callback
-    The Google AUTH URLS are used for basic setup for th eGOogle Auth
+    The Google endpoint URLs come from the cached discovery document (see google_oauth.py)
     The Scopes are used to grab the google profiles and emails
     """
     API_URI = reverse_lazy("usermanagement:signup/callback")
 
-    # Two options are available: 'web', 'installed'
-    GOOGLE_CLIENT_TYPE = "web"
-
-    GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/auth"
-    GOOGLE_ACCESS_TOKEN_OBTAIN_URL = "https://oauth2.googleapis.com/token"
-    GOOGLE_USER_INFO_URL = "https://www.googleapis.com/oauth2/v3/userinfo"
-
-    # Add auth_provider_x509_cert_url if you want verification on JWTS such as ID tokens
-    GOOGLE_AUTH_PROVIDER_CERT_URL = ""
-
     SCOPES = [
         "https://www.googleapis.com/auth/userinfo.email",
         "https://www.googleapis.com/auth/userinfo.profile",
@@ -319,32 +309,9 @@ class GoogleSdkSignupFlowService:
         redirect_uri = f"{domain}{api_uri}"
         return redirect_uri
 
-    def _generate_client_config(self):
-        """
-        Gets the Client JSON string using details from scopes and credentials
-        Follow same format as client_secrets.json
-
-        Returns:
-            client_config: 
-                Dict containing all necessary info for Google Auth0 Client
-        """
-        client_config = {
-            self.GOOGLE_CLIENT_TYPE: {
-                "client_id": self._credentials.client_id,
-                "project_id": self._credentials.project_id,
-                "auth_uri": self.GOOGLE_AUTH_URL,
-                "token_uri": self.GOOGLE_ACCESS_TOKEN_OBTAIN_URL,
-                "auth_provider_x509_cert_url": self.GOOGLE_AUTH_PROVIDER_CERT_URL,
-                "client_secret": self._credentials.client_secret,
-                "redirect_uris": [self._get_redirect_uri()],
-                "javascript_origins": [],
-            }
-        }
-        return client_config
-
     # Reference:
     # https://developers.google.com/identity/protocols/oauth2/web-server#creatingclient
-    def get_authorization_url(self):
+    def get_authorization_url(self, *, state: str):
         """
         Generates the Google OAuth2 authorization URL.
 
@@ -352,27 +319,23 @@ class GoogleSdkSignupFlowService:
         redirect URI, and requested scopes, allowing the user to authenticate 
         and grant access to their account.
 
+        Parameters:
+            state (str): The signed state from oauth_state.sign_state, returned to the callback.
+
         Returns:
             tuple: A tuple containing:
                 - authorization_url (str): The URL to redirect the user to Google.
-                - state (str): A unique state token for CSRF protection.
+                - state (str): The state, unchanged.
         """
-        redirect_uri = self._get_redirect_uri()
-        client_config = self._generate_client_config()
-
-        google_oauth_flow = google_auth_oauthlib.flow.Flow.from_client_config(
-            client_config=client_config, scopes=self.SCOPES
-        )
-        google_oauth_flow.redirect_uri = redirect_uri
-
-        authorization_url, state = google_oauth_flow.authorization_url(
+        authorization_url = google_oauth.authorization_url(
+            client_id=self._credentials.client_id,
+            redirect_uri=self._get_redirect_uri(),
+            scopes=self.SCOPES,
+            state=state,
             access_type="offline",
             include_granted_scopes="true",
             prompt="select_account",
         )
-        print("Authorization URL:", authorization_url)
-        print("State:", state)
-
         return authorization_url, state
     
     def get_tokens(self, *, code: str, state: str) -> GoogleAccessTokens:
@@ -380,7 +343,7 @@ class GoogleSdkSignupFlowService:
         Fetches Google OAuth2 tokens using an authorization code.
 
         This function exchanges the authorization code for an ID token and an 
-        access token by making a POST request to Google's token endpoint.
+        access token over the shared keep-alive session (see google_oauth.py).
 
         Parameters:
             code (str): The authorization code received from Google.
@@ -389,19 +352,17 @@ class GoogleSdkSignupFlowService:
             GoogleAccessTokens: An object containing the ID token and access token.
 
         Raises:
-            ApplicationError: If the token exchange fails.
+            GoogleOAuthError: If the token exchange fails.
         """
-        redirect_uri = self._get_redirect_uri()
-        client_config = self._generate_client_config()
-
-        flow = google_auth_oauthlib.flow.Flow.from_client_config(
-            client_config=client_config, scopes=self.SCOPES, state=state
+        access_credentials_payload = google_oauth.exchange_code(
+            code=code,
+            client_id=self._credentials.client_id,
+            client_secret=self._credentials.client_secret,
+            redirect_uri=self._get_redirect_uri(),
         )
-        flow.redirect_uri = redirect_uri
-        access_credentials_payload = flow.fetch_token(code=code)
 
-        if not access_credentials_payload:
-            raise ApplicationError("Failed to obtain tokens from Google.")
+        if "id_token" not in access_credentials_payload:
+            raise GoogleOAuthError("Failed to obtain tokens from Google.")
 
         google_tokens = GoogleAccessTokens(
             id_token=access_credentials_payload["id_token"], 
@@ -414,8 +375,8 @@ class GoogleSdkSignupFlowService:
         """
         Retrieves user information from Google using an access token.
 
-        This function makes an API call to Google's UserInfo endpoint to obtain 
-        user details such as email and name.
+        The verified ID token (GoogleAccessTokens.decode_id_token) already has the email
+        and name, so this extra round trip is only needed for other profile fields.
 
         Parameters:
             google_tokens (GoogleAccessTokens): The access tokens obtained from Google.
@@ -424,20 +385,9 @@ class GoogleSdkSignupFlowService:
             dict: A dictionary containing user information.
 
         Raises:
-            ApplicationError: If the request to fetch user info fails.
+            GoogleOAuthError: If the request to fetch user info fails.
         """
-        access_token = google_tokens.access_token
-
-        response = requests.get(
-            self.GOOGLE_USER_INFO_URL,
-            params={"access_token": access_token}
-        )
-
-        if not response.ok:
-            raise ApplicationError("Failed to obtain user info from Google.")
-
-        return response.json()
-
+        return google_oauth.get_user_info(google_tokens.access_token)
 
 @define
 class GoogleSdkLoginCredentials:
@@ -0,0 +1,116 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from InkSightMVP.cache_stats import register_cache_stats
+from .models import User
+
+"""
+Cached Token Authentication
+Every authenticated request used to look its token up in `authtoken_token` joined to the user.
+CachedTokenAuthentication keeps the token (with its user) in the Django cache instead:
+1. Entries expire after TOKEN_AUTH_CACHE_TIMEOUT seconds.
+2. The signal handlers in usermanagement.signals drop an entry as soon as its token is deleted
+   or its user is saved, which covers deactivation.
+3. Changes made with queryset.update() skip those signals and are only seen once the entry expires.
+The cache is only used when it is shared by every worker (settings.CACHE_IS_SHARED, e.g. Redis):
+with a per-process cache a logout or deactivation would only reach the worker that handled it, and
+the others would keep accepting the token. Without one every lookup goes to the database.
+Hits and misses are counted under the "auth_token" cache stats.
+
+get_user_and_token serves the login callback, which needs the user and their token in one round trip.
+"""
+
+token_cache_stats = register_cache_stats("auth_token")
+
+
+def token_cache_key(key):
+    return f"auth-token:{key}"
+
+
+def token_user_cache_key(user_id):
+    return f"auth-token-user:{user_id}"
+
+
+def invalidate_cached_token(key):
+    """Drop a token from the authentication cache (e.g. after it is deleted)."""
+    cache.delete(token_cache_key(key))
+
+
+def invalidate_cached_user_token(user_id):
+    """Drop the cached token of a user (e.g. after the user is changed or deactivated)."""
+    user_cache_key = token_user_cache_key(user_id)
+    key = cache.get(user_cache_key)
+    if key is not None:
+        cache.delete_many([token_cache_key(key), user_cache_key])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that serves repeated lookups of the same token from the cache"""
+
+    def authenticate_credentials(self, key):
+        if not settings.CACHE_IS_SHARED:
+            return super().authenticate_credentials(key)
+
+        token = cache.get(token_cache_key(key))
+        if token is None:
+            token_cache_stats.miss()
+            user, token = super().authenticate_credentials(key)
+            cache.set_many({token_cache_key(key): token, token_user_cache_key(user.pk): key},
+                           settings.TOKEN_AUTH_CACHE_TIMEOUT)
+            return (user, token)
+
+        token_cache_stats.hit()
+        if not token.user.is_active:
+            raise AuthenticationFailed("User inactive or deleted.")
+        return (token.user, token)
+
+
+def get_user_and_token(email, role):
+    """
+    Find the user with this email and role and their auth token in one query, creating the token
+    (INSERT ... ON CONFLICT DO NOTHING) if the user has none.
+    Args:
+        email (str): The user's email.
+        role (str): The user's role name (User.role).
+    Returns:
+        tuple: (User, token key), or (None, None) if there is no such user.
+    """
+    if connection.vendor != "postgresql":
+        return _get_user_and_token_orm(email, role)
+
+    users, tokens = User._meta.db_table, Token._meta.db_table
+    # The outer SELECT cannot see rows inserted by the CTE (same snapshot), so a new key comes from its RETURNING
+    query = f"""
+        WITH account AS (
+            SELECT * FROM {users} WHERE email = %s AND role = %s
+        ), new_token AS (
+            INSERT INTO {tokens} (key, user_id, created)
+            SELECT %s, id, %s FROM account
+            WHERE NOT EXISTS (SELECT 1 FROM {tokens} WHERE user_id = account.id)
+            ON CONFLICT DO NOTHING
+            RETURNING key, user_id
+        )
+        SELECT account.*, COALESCE(token.key, new_token.key) AS token_key
+        FROM account
+        LEFT JOIN {tokens} token ON token.user_id = account.id
+        LEFT JOIN new_token ON new_token.user_id = account.id
+    """
+    user = next(iter(User.objects.raw(query, [email, role, Token.generate_key(), timezone.now()])), None)
+    if user is None:
+        return None, None
+    if user.token_key is None:
+        # Lost a race with a concurrent login that created the token first
+        return user, Token.objects.get(user_id=user.pk).key
+    return user, user.token_key
+
+
+def _get_user_and_token_orm(email, role):
+    """get_user_and_token for databases without data-modifying CTEs (two or three queries)."""
+    user = User.objects.filter(email=email, role=role).first()
+    if user is None:
+        return None, None
+    return user, Token.objects.get_or_create(user=user)[0].key
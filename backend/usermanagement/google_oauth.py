@@ -0,0 +1,204 @@
+import json
+import threading
+import time
+from urllib.parse import urlencode
+
+import jwt
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+"""
+Google OAuth / OpenID Connect Client
+Shared by the login and signup flows (auth_login_api.py, auth_signup_api.py):
+1. All calls to Google go through one keep-alive requests.Session per process, so a login reuses
+   pooled TLS connections instead of opening new ones.
+2. Google's discovery document (endpoint URLs) and JWKS (ID token signing keys) are cached in process
+   memory for their Cache-Control max-age, or GOOGLE_OIDC_CACHE_TIMEOUT seconds. An ID token signed
+   with a key the cached JWKS does not have triggers one refresh, since Google rotates its keys.
+3. ID tokens are verified locally (signature, issuer, audience, expiry), so the verified claims replace
+   the round trip to the userinfo endpoint.
+GOOGLE_OIDC_DISCOVERY_URL can point at another OpenID provider (e.g. a local stub in tests).
+"""
+
+HTTP_TIMEOUT = 10
+# Clock skew tolerated when checking ID token timestamps
+ID_TOKEN_LEEWAY = 60
+# Minimum seconds between JWKS refreshes caused by unknown key IDs
+JWKS_REFRESH_INTERVAL = 60
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class GoogleOAuthError(Exception):
+    pass
+
+
+def http_session():
+    """Return the process-wide keep-alive session used for every request to Google."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=settings.GOOGLE_OAUTH_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def _max_age(response):
+    """Seconds the response may be cached for, from Cache-Control, or the configured default."""
+    for directive in response.headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name.lower() == "max-age" and value.isdigit():
+            return int(value)
+    return settings.GOOGLE_OIDC_CACHE_TIMEOUT
+
+
+class CachedDocument:
+    """A JSON document fetched over HTTP and kept until it expires"""
+
+    def __init__(self, url):
+        self.url = url
+        self.value = None
+        self.expires_at = 0
+        self.fetched_at = 0
+        self.lock = threading.Lock()
+
+    def get(self, refresh=False):
+        """
+        Return the document, fetching it if it is missing, expired, or `refresh` is set.
+        Raises:
+            GoogleOAuthError: If the document cannot be fetched.
+        """
+        url = self.url() if callable(self.url) else self.url
+        with self.lock:
+            now = time.monotonic()
+            if self.value is None or now >= self.expires_at or refresh:
+                try:
+                    response = http_session().get(url, timeout=HTTP_TIMEOUT)
+                    response.raise_for_status()
+                    self.value = response.json()
+                except (requests.RequestException, ValueError) as error:
+                    raise GoogleOAuthError(f"Failed to fetch {url}: {error}") from error
+                self.fetched_at = now
+                self.expires_at = now + _max_age(response)
+            return self.value
+
+    def clear(self):
+        with self.lock:
+            self.value = None
+            self.expires_at = self.fetched_at = 0
+
+
+discovery_document = CachedDocument(lambda: settings.GOOGLE_OIDC_DISCOVERY_URL)
+jwks_document = CachedDocument(lambda: discovery_document.get()["jwks_uri"])
+
+
+def clear_caches():
+    """Forget the cached discovery document and keys (e.g. between tests)."""
+    discovery_document.clear()
+    jwks_document.clear()
+
+
+def authorization_url(*, client_id, redirect_uri, scopes, state, **params):
+    """
+    Build the URL of Google's consent screen.
+    Args:
+        client_id (str): The OAuth client ID.
+        redirect_uri (str): Where Google sends the user back to, with the code and state.
+        scopes (list): The requested scopes.
+        state (str): Opaque value returned to the callback, for CSRF protection.
+        **params: Extra query parameters (e.g. access_type, prompt).
+    Returns:
+        str: The authorization URL.
+    """
+    query = {
+        "response_type": "code",
+        "client_id": client_id,
+        "redirect_uri": redirect_uri,
+        "scope": " ".join(scopes),
+        "state": state,
+        **params,
+    }
+    return f"{discovery_document.get()['authorization_endpoint']}?{urlencode(query)}"
+
+
+def exchange_code(*, code, client_id, client_secret, redirect_uri):
+    """
+    Exchange an authorization code for tokens at Google's token endpoint.
+    Returns:
+        dict: The token response (id_token, access_token, expires_in, ...).
+    Raises:
+        GoogleOAuthError
+    """
+    try:
+        response = http_session().post(discovery_document.get()["token_endpoint"], timeout=HTTP_TIMEOUT, data={
+            "grant_type": "authorization_code",
+            "code": code,
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "redirect_uri": redirect_uri,
+        })
+    except requests.RequestException as error:
+        raise GoogleOAuthError(f"Failed to obtain tokens from Google: {error}") from error
+    if not response.ok:
+        raise GoogleOAuthError(f"Failed to obtain tokens from Google ({response.status_code}).")
+    return response.json()
+
+
+def _signing_key(kid):
+    keys = jwks_document.get().get("keys", [])
+    key = next((key for key in keys if key.get("kid") == kid), None)
+    if key is None and time.monotonic() - jwks_document.fetched_at >= JWKS_REFRESH_INTERVAL:
+        # Google rotated its keys since the JWKS was cached
+        keys = jwks_document.get(refresh=True).get("keys", [])
+        key = next((key for key in keys if key.get("kid") == kid), None)
+    if key is None:
+        raise GoogleOAuthError("ID token is signed with an unknown key.")
+    return jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(key))
+
+
+def verify_id_token(id_token, *, audience):
+    """
+    Verify an ID token's signature against the provider's keys, and its issuer, audience and expiry.
+    Args:
+        id_token (str): The ID token from the token response.
+        audience (str): The OAuth client ID the token must be issued to.
+    Returns:
+        dict: The token's claims (email, given_name, ...).
+    Raises:
+        GoogleOAuthError: If the token is invalid.
+    """
+    try:
+        header = jwt.get_unverified_header(id_token)
+        claims = jwt.decode(id_token, _signing_key(header.get("kid")), algorithms=["RS256"],
+                            audience=audience, leeway=ID_TOKEN_LEEWAY, options={"require": ["exp", "iat", "iss"]})
+    except jwt.PyJWTError as error:
+        raise GoogleOAuthError(f"Invalid ID token: {error}") from error
+
+    # Google issues tokens with and without the scheme
+    issuer = discovery_document.get()["issuer"]
+    if claims["iss"] not in (issuer, issuer.removeprefix("https://")):
+        raise GoogleOAuthError("Invalid ID token: wrong issuer.")
+    if "email" in claims and claims.get("email_verified") is False:
+        raise GoogleOAuthError("The Google account's email address is not verified.")
+    return claims
+
+
+def get_user_info(access_token):
+    """
+    Fetch the user's profile from the userinfo endpoint (only needed for claims not in the ID token).
+    Raises:
+        GoogleOAuthError
+    """
+    try:
+        response = http_session().get(discovery_document.get()["userinfo_endpoint"], timeout=HTTP_TIMEOUT,
+                                      headers={"Authorization": f"Bearer {access_token}"})
+    except requests.RequestException as error:
+        raise GoogleOAuthError(f"Failed to obtain user info from Google: {error}") from error
+    if not response.ok:
+        raise GoogleOAuthError("Failed to obtain user info from Google.")
+    return response.json()
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-18 12:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usermanagement', '0004_rename_assigned_professor_teacherassistant_assigned_professor_course_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='role',
+            field=models.CharField(blank=True, choices=[('student', 'Student'), ('professor', 'Professor'), ('teacher_assistant', 'Teacher Assistant'), ('sds_coordinator', 'SDS Coordinator')], db_index=True, default='', max_length=20),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.3 on 2026-10-18 12:30
+
+from django.db import migrations
+
+ROLE_MODELS = {
+    'student': 'Student',
+    'professor': 'Professor',
+    'teacher_assistant': 'TeacherAssistant',
+    'sds_coordinator': 'SDSCoordinator',
+}
+
+
+def backfill_user_role(apps, schema_editor):
+    """Set User.role from the role table each user has a row in, with one UPDATE per role."""
+    User = apps.get_model('usermanagement', 'User')
+    for role, model_name in ROLE_MODELS.items():
+        role_model = apps.get_model('usermanagement', model_name)
+        User.objects.filter(pk__in=role_model.objects.values('pk')).update(role=role)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usermanagement', '0005_user_role'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_user_role, migrations.RunPython.noop),
+    ]
@@ -27,11 +27,23 @@ class UserManager(BaseUserManager):
         return self.create_user(email, name, password, **extra_fields)
 
 
+ROLE_CHOICES = [
+    ("student", "Student"),
+    ("professor", "Professor"),
+    ("teacher_assistant", "Teacher Assistant"),
+    ("sds_coordinator", "SDS Coordinator"),
+]
+
 class User(AbstractBaseUser):
     """Generic User Model for Authentication"""
+    # Role name of the subclass row the user has (see usermanagement/roles.py); "" for plain users
+    ROLE = ""
+
     email = models.EmailField(unique=True)
     name = models.CharField(max_length=255)
     school = models.ForeignKey(School, on_delete=models.SET_NULL, null=True, blank=True)
+    # Copy of the subclass's ROLE, so a user's role is known without probing the four role tables
+    role = models.CharField(max_length=20, choices=ROLE_CHOICES, blank=True, default="", db_index=True)
 
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
@@ -44,6 +56,14 @@ class User(AbstractBaseUser):
 
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        """Keep the role column in sync with the subclass being saved."""
+        if self.ROLE and self.role != self.ROLE:
+            self.role = self.ROLE
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "role"}
+        super().save(*args, **kwargs)
     
     def has_perm(self, perm, obj=None):
         """Does the user have a specific permission?"""
@@ -57,6 +77,8 @@ class User(AbstractBaseUser):
 
 class Student(User):
     """Student User Model with Additional Fields"""
+    ROLE = "student"
+
     year = models.IntegerField()
     disability = models.CharField(max_length=666)
     sds_coordinator = models.ForeignKey(
@@ -77,11 +99,15 @@ class Student(User):
 
 class Professor(User):
     """Professor User Model with Additional Fields"""
+    ROLE = "professor"
+
     title = models.CharField(max_length=255) 
 
 
 class TeacherAssistant(User):
     """Teacher Assistant User Model with Additional Fields"""
+    ROLE = "teacher_assistant"
+
     assigned_professor_course = models.ForeignKey(
         'coursemanagement.ProfessorCourse', on_delete=models.SET_NULL, null=True, blank=True, related_name="teacher_assistants"
     )
@@ -89,6 +115,8 @@ class TeacherAssistant(User):
 
 class SDSCoordinator(User):
     """SDS Coordinator User Model with Additional Fields"""
+    ROLE = "sds_coordinator"
+
     position = models.CharField(max_length=255)
     access_code = models.CharField(max_length=8, unique=True)
 
@@ -98,10 +126,15 @@ class SDSCoordinator(User):
             self.access_code = self.generate_unique_access_code()
         super().save(*args, **kwargs)
 
+    @staticmethod
+    def generate_access_code():
+        """Function to generate a random alphanumeric access code (not checked for uniqueness)"""
+        return ''.join(random.choices(string.ascii_letters + string.digits, k=6))
+
     @staticmethod
     def generate_unique_access_code():
         """Function to generate a unique 8-character alphanumeric code"""
         while True:
-            code = ''.join(random.choices(string.ascii_letters + string.digits, k=6))
+            code = SDSCoordinator.generate_access_code()
             if not SDSCoordinator.objects.filter(access_code=code).exists():
                 return code
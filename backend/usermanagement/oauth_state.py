@@ -0,0 +1,76 @@
+from django.conf import settings
+from django.core import signing
+from django.utils.crypto import constant_time_compare, salted_hmac
+from oauthlib.common import generate_token
+
+"""
+Signed OAuth State
+The redirect views used to keep the sign up form and the OAuth state in the database-backed session,
+a write per attempt that was mostly left behind by abandoned logins. Instead:
+1. The form data travels inside the `state` parameter, signed with SECRET_KEY (django.core.signing)
+   and only accepted for OAUTH_STATE_MAX_AGE seconds.
+2. A random nonce is set in a short-lived HttpOnly cookie, and the state carries its HMAC, so a state
+   is only accepted from the browser that started the flow (the CSRF check the session used to do).
+Neither the redirect nor the callback's state check reads or writes the session table; only a
+successful callback writes a session row, when login() signs the user in (SessionAuthentication).
+"""
+
+OAUTH_STATE_SALT = "usermanagement.oauth_state"
+OAUTH_NONCE_COOKIE = "google_oauth2_nonce"
+
+
+class InvalidOAuthState(Exception):
+    pass
+
+
+def _nonce_digest(nonce):
+    return salted_hmac(OAUTH_STATE_SALT, nonce).hexdigest()
+
+
+def sign_state(form_data):
+    """
+    Create the state for an OAuth redirect.
+    Args:
+        form_data (dict): The role and sign up fields needed by the callback.
+    Returns:
+        tuple: (state, nonce); the nonce goes in the OAUTH_NONCE_COOKIE cookie (see set_nonce_cookie).
+    """
+    nonce = generate_token()
+    state = signing.dumps({"form": form_data, "nonce": _nonce_digest(nonce)}, salt=OAUTH_STATE_SALT,
+                          compress=True)
+    return state, nonce
+
+
+def load_state(state, nonce):
+    """
+    Retrieve the form data from a state returned by Google.
+    Args:
+        state (str): The state query parameter of the callback.
+        nonce (str): The OAUTH_NONCE_COOKIE cookie of the request.
+    Returns:
+        dict: The form data passed to sign_state.
+    Raises:
+        InvalidOAuthState: If the state is forged, expired, or was issued to another browser.
+    """
+    try:
+        data = signing.loads(state, salt=OAUTH_STATE_SALT, max_age=settings.OAUTH_STATE_MAX_AGE)
+    except signing.SignatureExpired as error:
+        raise InvalidOAuthState("The login attempt expired. Please try again.") from error
+    except signing.BadSignature as error:
+        raise InvalidOAuthState("CSRF check failed.") from error
+    if not nonce or not constant_time_compare(_nonce_digest(nonce), data["nonce"]):
+        raise InvalidOAuthState("CSRF check failed.")
+    return data["form"]
+
+
+def set_nonce_cookie(response, request, nonce):
+    """Set the nonce cookie on the redirect to Google; Lax, so it comes back on Google's redirect."""
+    response.set_cookie(OAUTH_NONCE_COOKIE, nonce, max_age=settings.OAUTH_STATE_MAX_AGE,
+                        secure=request.is_secure(), httponly=True, samesite="Lax")
+    return response
+
+
+def delete_nonce_cookie(response):
+    """Delete the nonce cookie once the callback has used it."""
+    response.delete_cookie(OAUTH_NONCE_COOKIE, samesite="Lax")
+    return response
@@ -0,0 +1,93 @@
+from django.core.exceptions import ObjectDoesNotExist
+from .models import User, Student, Professor, TeacherAssistant, SDSCoordinator
+from .serializers import StudentSerializer, ProfessorSerializer, TeacherAssistantSerializer, SDSCoordinatorSerializer
+
+"""
+User Roles
+Every user is stored as a User row plus one multi-table-inheritance child row
+(Student, Professor, TeacherAssistant or SDSCoordinator).
+Probing `hasattr(user, "student")`, `hasattr(user, "professor")`, ... costs one query per probe;
+resolve_role joins all four child tables onto the user in a single query instead.
+User.role stores the role name too (User.save sets it from the subclass), so load_role_users can
+fetch a mixed list of users with one query per role present instead of one per user
+(e.g. for the role details column of the user admin).
+Role names are the ones used by the login and signup flows.
+"""
+
+ROLE_MODELS = {
+    "student": Student,
+    "professor": Professor,
+    "teacher_assistant": TeacherAssistant,
+    "sds_coordinator": SDSCoordinator,
+}
+
+ROLE_SERIALIZERS = {
+    "student": StudentSerializer,
+    "professor": ProfessorSerializer,
+    "teacher_assistant": TeacherAssistantSerializer,
+    "sds_coordinator": SDSCoordinatorSerializer,
+}
+
+# Reverse one-to-one accessor from User to each role's child model (e.g. user.teacherassistant)
+ROLE_RELATIONS = {role: model._meta.model_name for role, model in ROLE_MODELS.items()}
+
+
+def get_role_model(role):
+    """Return the user model for a role name, or None if the role is unknown."""
+    return ROLE_MODELS.get(role)
+
+
+def resolve_role(user_id):
+    """
+    Find a user's role and concrete subclass instance with a single query.
+    Args:
+        user_id (int): The ID of the user.
+    Returns:
+        tuple: (role name, Student/Professor/TeacherAssistant/SDSCoordinator instance),
+            or (None, None) if the user does not exist or has no role.
+    """
+    user = User.objects.select_related(*ROLE_RELATIONS.values()).filter(pk=user_id).first()
+    if user is None:
+        return None, None
+
+    for role, relation in ROLE_RELATIONS.items():
+        try:
+            return role, getattr(user, relation)
+        except ObjectDoesNotExist:
+            continue
+    return None, None
+
+
+def load_role_users(users):
+    """
+    Load the role subclass instance of every user, with one query per role present.
+    Args:
+        users (iterable): User instances (e.g. a queryset of users), or user IDs.
+    Returns:
+        list: Student/Professor/TeacherAssistant/SDSCoordinator instances in the input order; users
+            without a role are returned as they are, and unknown IDs are skipped. Related objects loaded
+            on the users (e.g. with select_related) are kept on the subclass instances.
+    """
+    users = list(users)
+    if users and not isinstance(users[0], User):
+        loaded = User.objects.in_bulk(users)
+        users = [loaded[user_id] for user_id in users if user_id in loaded]
+
+    by_role = {}
+    for user in users:
+        if user.role in ROLE_MODELS and not isinstance(user, ROLE_MODELS[user.role]):
+            by_role.setdefault(user.role, []).append(user.pk)
+
+    role_users = {}
+    for role, user_ids in by_role.items():
+        for role_user in ROLE_MODELS[role].objects.filter(pk__in=user_ids):
+            role_users[role_user.pk] = role_user
+
+    loaded = []
+    for user in users:
+        role_user = role_users.get(user.pk, user)
+        if role_user is not user:
+            for name, value in user._state.fields_cache.items():
+                role_user._state.fields_cache.setdefault(name, value)
+        loaded.append(role_user)
+    return loaded
@@ -1,6 +1,7 @@
 """Serializer Functions To Transform Queried Data from DB into Python Readable Dictionaries"""
 
 from rest_framework import serializers
+from InkSightMVP.values_serializers import ValuesSerializer
 from .models import Student, SDSCoordinator, Professor, TeacherAssistant
 
 class StudentSerializer(serializers.ModelSerializer):
@@ -25,4 +26,28 @@ class TeacherAssistantSerializer(serializers.ModelSerializer):
     """Serializer For TA"""
     class Meta:
         model = TeacherAssistant
-        fields = ['user_ptr_id', 'email', 'name', 'school_id', 'assigned_professor_course_id']
\ No newline at end of file
+        fields = ['user_ptr_id', 'email', 'name', 'school_id', 'assigned_professor_course_id']
+
+class StudentValuesSerializer(ValuesSerializer):
+    """Read-only StudentSerializer for list endpoints, built from .values() rows"""
+    class Meta:
+        model = Student
+        fields = StudentSerializer.Meta.fields
+
+class SDSCoordinatorValuesSerializer(ValuesSerializer):
+    """Read-only SDSCoordinatorSerializer for list endpoints, built from .values() rows"""
+    class Meta:
+        model = SDSCoordinator
+        fields = SDSCoordinatorSerializer.Meta.fields
+
+class ProfessorValuesSerializer(ValuesSerializer):
+    """Read-only ProfessorSerializer for list endpoints, built from .values() rows"""
+    class Meta:
+        model = Professor
+        fields = ProfessorSerializer.Meta.fields
+
+class TeacherAssistantValuesSerializer(ValuesSerializer):
+    """Read-only TeacherAssistantSerializer for list endpoints, built from .values() rows"""
+    class Meta:
+        model = TeacherAssistant
+        fields = TeacherAssistantSerializer.Meta.fields
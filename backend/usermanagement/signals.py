@@ -1,9 +1,21 @@
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from rest_framework.authtoken.models import Token
+from .authentication import invalidate_cached_token, invalidate_cached_user_token
+from .models import User
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_auth_token(sender, instance=None, created=False, **kwargs):
     if created:
         Token.objects.create(user=instance)
+
+@receiver(post_delete, sender=Token)
+def uncache_deleted_token(sender, instance=None, **kwargs):
+    invalidate_cached_token(instance.key)
+
+@receiver(post_save)
+def uncache_saved_user_token(sender, instance=None, **kwargs):
+    # Student, Professor, etc. send post_save with their own class as sender, so match on the instance
+    if isinstance(instance, User):
+        invalidate_cached_user_token(instance.pk)
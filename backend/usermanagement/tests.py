@@ -1,3 +1,388 @@
-from django.test import TestCase
+import json
+import threading
+import time
+from unittest import skipUnless
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core import signing
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+from InkSightMVP.values_serializer_assertions import ValuesSerializerAssertionsMixin
+from schoolmanagement.models import School
+from . import google_oauth
+from .authentication import (CachedTokenAuthentication, _get_user_and_token_orm, get_user_and_token, token_cache_key,
+                             token_cache_stats)
+from .models import User, Student, Professor, TeacherAssistant, SDSCoordinator
+from .oauth_state import OAUTH_NONCE_COOKIE, InvalidOAuthState, load_state, sign_state
+from .roles import load_role_users, resolve_role, ROLE_SERIALIZERS
+from .serializers import (
+    StudentSerializer, ProfessorSerializer, TeacherAssistantSerializer, SDSCoordinatorSerializer,
+    StudentValuesSerializer, ProfessorValuesSerializer, TeacherAssistantValuesSerializer, SDSCoordinatorValuesSerializer,
+)
+
+
+class ValuesSerializerEquivalenceTests(ValuesSerializerAssertionsMixin, TestCase):
+    """The .values() serializers must produce exactly the same JSON as the ModelSerializers"""
+
+    @classmethod
+    def setUpTestData(cls):
+        school = School.objects.create(name="Test University")
+        coordinator = SDSCoordinator.objects.create(email="sds@test.edu", name="SDS", school=school, position="Lead")
+        Professor.objects.create(email="prof@test.edu", name="Prof", school=school, title="Dr.")
+        TeacherAssistant.objects.create(email="ta@test.edu", name="TA", school=school)
+        Student.objects.create(email="student1@test.edu", name="Student 1", school=school, year=2,
+                               disability="ADHD", sds_coordinator=coordinator)
+        Student.objects.create(email="student2@test.edu", name="Student 2", school=None, year=4,
+                               disability="Dyslexia", accodomation_request="Custom request")
+
+    def test_student_serializers_match(self):
+        self.assertSameOutput(StudentSerializer, StudentValuesSerializer, Student.objects.all())
+
+    def test_professor_serializers_match(self):
+        self.assertSameOutput(ProfessorSerializer, ProfessorValuesSerializer, Professor.objects.all())
+
+    def test_teacher_assistant_serializers_match(self):
+        self.assertSameOutput(TeacherAssistantSerializer, TeacherAssistantValuesSerializer, TeacherAssistant.objects.all())
+
+    def test_sds_coordinator_serializers_match(self):
+        self.assertSameOutput(SDSCoordinatorSerializer, SDSCoordinatorValuesSerializer, SDSCoordinator.objects.all())
+
+
+# The tests run in one process, so a local memory cache stands in for the shared one
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+                   CACHE_IS_SHARED=True)
+class CachedTokenAuthenticationTests(TestCase):
+    """Token lookups are served from the cache until the token or its user changes"""
+
+    def setUp(self):
+        cache.clear()
+        token_cache_stats.clear()
+        self.student = Student.objects.create(email="student@test.edu", name="Student", year=1, disability="ADHD")
+        self.token = Token.objects.create(user=self.student)
+        self.authentication = CachedTokenAuthentication()
+
+    def test_second_lookup_is_a_cache_hit(self):
+        self.authentication.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(0):
+            user, token = self.authentication.authenticate_credentials(self.token.key)
+        self.assertEqual((user.pk, token.key), (self.student.pk, self.token.key))
+        self.assertEqual((token_cache_stats.hits, token_cache_stats.misses), (1, 1))
+
+    def test_deleted_token_is_rejected(self):
+        self.authentication.authenticate_credentials(self.token.key)
+        self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.token.key)
+
+    def test_deactivated_user_is_rejected(self):
+        self.authentication.authenticate_credentials(self.token.key)
+        self.student.is_active = False
+        self.student.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.token.key)
+
+    def test_per_process_cache_is_not_used(self):
+        with override_settings(CACHE_IS_SHARED=False):
+            for _ in range(2):
+                with self.assertNumQueries(1):
+                    self.authentication.authenticate_credentials(self.token.key)
+            self.assertIsNone(cache.get(token_cache_key(self.token.key)))
+            # A revoked token is rejected at once, by every worker
+            self.token.delete()
+            with self.assertRaises(AuthenticationFailed):
+                self.authentication.authenticate_credentials(self.token.key)
+
+
+class CurrentUserRoleTests(TestCase):
+    """get_current_user resolves the user's role with one query"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = {
+            "student": Student.objects.create(email="student@test.edu", name="Student", year=1, disability="ADHD"),
+            "professor": Professor.objects.create(email="prof@test.edu", name="Prof", title="Dr."),
+            "teacher_assistant": TeacherAssistant.objects.create(email="ta@test.edu", name="TA"),
+            "sds_coordinator": SDSCoordinator.objects.create(email="sds@test.edu", name="SDS", position="Lead"),
+        }
+
+    def test_every_role_is_serialized_with_one_query(self):
+        for role, user in self.users.items():
+            client = APIClient()
+            client.force_authenticate(User.objects.get(pk=user.pk))
+            with self.assertNumQueries(1):
+                response = client.get("/usermanagement/get-current-user")
+            self.assertEqual(response.json(), ROLE_SERIALIZERS[role](type(user).objects.get(pk=user.pk)).data)
+
+    def test_user_without_role(self):
+        self.assertEqual(resolve_role(User.objects.create(email="plain@test.edu", name="Plain").pk), (None, None))
+
+class UserRoleTests(TestCase):
+    """The role column follows the subclass, and mixed users load with one query per role"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = Student.objects.create(email="student@test.edu", name="Student", year=1, disability="ADHD")
+        cls.professors = [Professor.objects.create(email=f"prof{number}@test.edu", name="Prof", title="Dr.")
+                          for number in range(2)]
+        cls.ta = TeacherAssistant.objects.create(email="ta@test.edu", name="TA")
+        cls.plain = User.objects.create(email="plain@test.edu", name="Plain")
+
+    def test_role_is_set_on_save(self):
+        roles = dict(User.objects.values_list("email", "role"))
+        self.assertEqual(roles, {"student@test.edu": "student", "prof0@test.edu": "professor",
+                                 "prof1@test.edu": "professor", "ta@test.edu": "teacher_assistant",
+                                 "plain@test.edu": ""})
+
+        # e.g. a row the backfill missed
+        User.objects.filter(pk=self.ta.pk).update(role="")
+        ta = TeacherAssistant.objects.get(pk=self.ta.pk)
+        ta.save(update_fields=["name"])
+        self.assertEqual(User.objects.get(pk=self.ta.pk).role, "teacher_assistant")
+
+    def test_mixed_users_load_with_one_query_per_role(self):
+        users = User.objects.order_by("-pk")
+        with self.assertNumQueries(4):
+            loaded = load_role_users(users)
+        self.assertEqual([type(user) for user in loaded], [User, TeacherAssistant, Professor, Professor, Student])
+        self.assertEqual(loaded[2].title, "Dr.")
+
+        with self.assertNumQueries(2):
+            loaded = load_role_users([self.student.pk, 999999, self.plain.pk])
+        self.assertEqual([type(user) for user in loaded], [Student, User])
+
+    # collectstatic has not run, so the admin templates cannot use the manifest storage
+    @override_settings(STORAGES={**settings.STORAGES, "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}})
+    def test_admin_list_loads_role_details_per_role(self):
+        self.client.force_login(User.objects.create(email="admin@test.edu", name="Admin", is_staff=True,
+                                                    is_superuser=True))
+        school = School.objects.create(name="Test University")
+        counts = []
+        for number in range(2):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get("/admin/usermanagement/user/")
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(queries))
+            # More users of every role (and with a school) must not add queries
+            Student.objects.create(email=f"student{number}@test.edu", name="Student", year=3, disability="Dyslexia",
+                                   school=school)
+            Professor.objects.create(email=f"prof{number}@more.edu", name="Prof", title="Prof.", school=school)
+            TeacherAssistant.objects.create(email=f"ta{number}@test.edu", name="TA", school=school)
+
+        self.assertEqual(counts[0], counts[1])
+        self.assertContains(response, "Year 1, ADHD")
+        self.assertContains(response, "Dr.")
+
+
+class LoginLookupTests(TestCase):
+    """The login callback finds the user, their role and their token with one query (on PostgreSQL)"""
+
+    # The single-query lookup on PostgreSQL, and the ORM fallback used elsewhere
+    lookups = (get_user_and_token, _get_user_and_token_orm)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = Student.objects.create(email="student@test.edu", name="Student", year=1, disability="ADHD")
+        cls.token = Token.objects.get_or_create(user_id=cls.student.pk)[0]
+
+    def test_existing_token(self):
+        for lookup in self.lookups:
+            with self.subTest(lookup=lookup.__name__):
+                user, token_key = lookup("student@test.edu", "student")
+                self.assertEqual((user.pk, user.role, token_key), (self.student.pk, "student", self.token.key))
+
+    def test_missing_token_is_created(self):
+        for lookup in self.lookups:
+            with self.subTest(lookup=lookup.__name__):
+                Token.objects.filter(user_id=self.student.pk).delete()
+                user, token_key = lookup("student@test.edu", "student")
+                self.assertEqual(user.pk, self.student.pk)
+                self.assertEqual(Token.objects.get(user_id=self.student.pk).key, token_key)
+                self.assertEqual(lookup("student@test.edu", "student")[1], token_key)
+
+    def test_unknown_account(self):
+        for lookup in self.lookups:
+            with self.subTest(lookup=lookup.__name__):
+                self.assertEqual(lookup("student@test.edu", "professor"), (None, None))
+                self.assertEqual(list(Token.objects.values_list("key", flat=True)), [self.token.key])
+
+    @skipUnless(connection.vendor == "postgresql", "the single-query lookup needs PostgreSQL")
+    def test_single_query(self):
+        with self.assertNumQueries(1):
+            get_user_and_token("student@test.edu", "student")
+        Token.objects.filter(user_id=self.student.pk).delete()
+        with self.assertNumQueries(1):
+            get_user_and_token("student@test.edu", "student")
+        with self.assertNumQueries(1):
+            get_user_and_token("student@test.edu", "professor")
+
+
+class StubOAuthServer(ThreadingHTTPServer):
+    """A local OpenID provider: discovery, JWKS and token endpoints, counting requests and connections"""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubOAuthHandler)
+        self.base_url = f"http://127.0.0.1:{self.server_port}"
+        self.keys = {}
+        self.id_token = None
+        self.requests = []
+        self.connections = set()
+        self.add_key("key-1")
+
+    def add_key(self, kid):
+        self.keys[kid] = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    def sign(self, kid="key-1", **claims):
+        now = int(time.time())
+        claims = {"iss": "https://accounts.google.com", "aud": "client-id", "sub": "1", "iat": now,
+                  "exp": now + 3600, "email": "student@test.edu", "email_verified": True, **claims}
+        return jwt.encode(claims, self.keys[kid], algorithm="RS256", headers={"kid": kid})
+
+
+class StubOAuthHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, data, max_age=None):
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if max_age is not None:
+            self.send_header("Cache-Control", f"public, max-age={max_age}")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle_one_request(self):
+        self.server.connections.add(self.client_address)
+        super().handle_one_request()
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        base = self.server.base_url
+        if self.path == "/.well-known/openid-configuration":
+            self.send_json({"issuer": "https://accounts.google.com", "authorization_endpoint": f"{base}/auth",
+                            "token_endpoint": f"{base}/token", "userinfo_endpoint": f"{base}/userinfo",
+                            "jwks_uri": f"{base}/certs"}, max_age=3600)
+        elif self.path == "/certs":
+            keys = []
+            for kid, key in self.server.keys.items():
+                jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(key.public_key()))
+                keys.append({**jwk, "kid": kid, "alg": "RS256", "use": "sig"})
+            self.send_json({"keys": keys}, max_age=3600)
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        self.server.requests.append(self.path)
+        form = parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode())
+        if self.path == "/token" and form["code"] == ["good-code"] and form["client_secret"] == ["secret"]:
+            self.send_json({"access_token": "access", "id_token": self.server.id_token, "expires_in": 3599})
+        else:
+            self.send_error(400)
+
+
+@override_settings(GOOGLE_OAUTH2_CLIENT_ID="client-id", GOOGLE_OAUTH2_CLIENT_SECRET="secret",
+                   GOOGLE_OAUTH2_PROJECT_ID="project", FRONTEND_URL="http://frontend.test")
+class GoogleOAuthTests(TestCase):
+    """Logins reuse one connection and the cached discovery document and keys, and verify ID tokens locally"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = StubOAuthServer()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.discovery = override_settings(
+            GOOGLE_OIDC_DISCOVERY_URL=f"{cls.server.base_url}/.well-known/openid-configuration")
+        cls.discovery.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.discovery.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        google_oauth.clear_caches()
+        self.server.requests.clear()
+        self.server.connections.clear()
+        self.student = Student.objects.create(email="student@test.edu", name="Student", year=1, disability="ADHD")
+
+    def login(self, state=None):
+        redirect = self.client.get("/usermanagement/google-login/redirect/", {"role": "student"})
+        query = parse_qs(urlparse(redirect["Location"]).query)
+        return self.client.get("/usermanagement/login/callback/",
+                               {"code": "good-code", "state": state or query["state"][0]})
+
+    def test_logins_reuse_the_connection_and_cached_keys(self):
+        self.server.id_token = self.server.sign()
+        for _ in range(3):
+            response = self.login()
+            self.assertEqual(response.status_code, 302)
+            self.assertIn(f"user_id={self.student.pk}", response["Location"])
+
+        self.assertEqual(self.server.requests, ["/.well-known/openid-configuration", "/token", "/certs",
+                                                "/token", "/token"])
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_invalid_id_tokens_are_rejected(self):
+        other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        forged = jwt.encode({"iss": "https://accounts.google.com", "aud": "client-id", "iat": int(time.time()),
+                             "exp": int(time.time()) + 60, "email": "student@test.edu"}, other_key,
+                            algorithm="RS256", headers={"kid": "key-1"})
+        for token in (forged, self.server.sign(aud="other-client"), self.server.sign(exp=int(time.time()) - 600),
+                      self.server.sign(iss="https://evil.example")):
+            with self.assertRaises(google_oauth.GoogleOAuthError):
+                google_oauth.verify_id_token(token, audience="client-id")
+
+        self.server.id_token = forged
+        self.assertEqual(self.login().status_code, 400)
+
+    def test_rotated_keys_are_fetched(self):
+        google_oauth.verify_id_token(self.server.sign(), audience="client-id")
+        self.server.add_key("key-2")
+        google_oauth.jwks_document.fetched_at -= google_oauth.JWKS_REFRESH_INTERVAL
+        claims = google_oauth.verify_id_token(self.server.sign(kid="key-2"), audience="client-id")
+        self.assertEqual(claims["email"], "student@test.edu")
+        self.assertEqual(self.server.requests.count("/certs"), 2)
+
+    def test_oauth_state_is_signed_instead_of_stored_in_the_session(self):
+        self.server.id_token = self.server.sign()
+        google_oauth.discovery_document.get()
+        with self.assertNumQueries(0):
+            redirect = self.client.get("/usermanagement/google-signup/redirect/", {
+                "role": "professor", "school_id": "1", "title": "Dr."})
+        self.assertEqual(redirect.status_code, 302)
+        self.assertFalse(Session.objects.exists())
+
+        state = parse_qs(urlparse(redirect["Location"]).query)["state"][0]
+        nonce = self.client.cookies[OAUTH_NONCE_COOKIE].value
+        self.assertEqual(load_state(state, nonce), {"role": "professor", "school_id": "1", "title": "Dr."})
+        with self.assertRaises(InvalidOAuthState):
+            load_state(state, "another-browser")
+        with self.assertRaises(InvalidOAuthState), override_settings(OAUTH_STATE_MAX_AGE=-1):
+            load_state(state, nonce)
+
+        # Forged states, and states started in another browser, fail the CSRF check
+        forged = signing.dumps({"form": {"role": "student"}, "nonce": "x"}, salt="other")
+        self.assertEqual(self.login(state=forged).status_code, 400)
+        other_state, _ = sign_state({"role": "student"})
+        self.assertEqual(self.login(state=other_state).status_code, 400)
+
+        response = self.login()
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.cookies[OAUTH_NONCE_COOKIE].value, "")